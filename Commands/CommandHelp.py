@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Awaitable, Callable, Iterable, Optional, cast
+from typing import TYPE_CHECKING, Optional, cast
 
 from nextcord import (
     Color,
     Embed,
     SelectOption,
-    SlashApplicationCommand,
     slash_command,
     ui,
     utils,
@@ -20,12 +19,21 @@ if TYPE_CHECKING:
 
 
 class BotCommandsCategory(ui.Select):
+    titles: dict[str, str] = {
+        "admin": "`⛔` Kategoria: Administracyjne",
+        "settings": "`🔧` Kategoria: Ustawienia",
+        "music": "`🔊` Kategoria: Muzyka",
+        "economy": "`💸` Kategoria: Ekonomia",
+        "additional": "`🍀` Kategoria: Dodatkowe",
+        "leveling": "`✨` Kategoria: Levelowanie",
+        "bot": "`🤖` Kategoria: Bot",
+        "forfun": "`😆` Kategoria: ForFun",
+    }
+
     def __init__(self, embed: Optional[Embed], embed_description: Optional[str]) -> None:
         self.default_description: Optional[str] = embed_description
         self.embed: Optional[Embed] = embed
 
-        self.cached_categories: dict[str, tuple[str, int]] = {}
-
         options = [
             SelectOption(
                 label="Administracyjne", description="Komendy administracyjne.", emoji="⛔", value="admin"
@@ -64,7 +72,7 @@ class BotCommandsCategory(ui.Select):
         assert interaction.message
 
         ping, shard = interaction.get_bot_latency()
-        commands: int = len(interaction.bot.get_all_application_commands())
+        commands: int = interaction.bot.help_index.get_commands_count()
 
         embed: Embed = interaction.message.embeds[0]
         embed_description = f"""{Emojis.REPLY.value} **Dzięki tej komendzie możesz sprawdzić wszystkie moje komendy.**
@@ -75,42 +83,6 @@ class BotCommandsCategory(ui.Select):
 
         return embed, embed_description
 
-    @staticmethod
-    def get_commands_by_category(bot: Smiffy, category: str) -> Iterable[SlashApplicationCommand]:
-        commands: dict[str, SlashApplicationCommand] = {}
-
-        for cmd in bot.get_all_application_commands():
-            if cmd.is_global:
-                module: str = cmd.parent_cog.__class__.__dict__["__module__"]
-                if category in module and isinstance(cmd, SlashApplicationCommand) and cmd.name:
-                    commands[cmd.name] = cmd
-
-        sorted_commands: dict[str, SlashApplicationCommand] = dict(sorted(commands.items()))
-        return sorted_commands.values()
-
-    @staticmethod
-    def format_commands(commands: list[SlashApplicationCommand]) -> tuple[str, int]:
-        description: str = ""
-        commands_amount: int = 0
-
-        for cmd in commands:
-            if cmd.children:
-                for sub_command in cmd.children.values():
-                    if sub_command.children:
-                        for sub_sub_command in sub_command.children.values():
-                            commands_amount += 1
-                            description += (
-                                f"- {sub_sub_command.get_mention()} - {sub_sub_command.description}\n"
-                            )
-                    else:
-                        commands_amount += 1
-                        description += f"- {sub_command.get_mention()} - {sub_command.description}\n"
-            else:
-                commands_amount += 1
-                description += f"- {cmd.get_mention()} - {cmd.description}\n"
-
-        return description, commands_amount
-
     async def callback(self, interaction: CustomInteraction):
         if not self.default_description or not self.embed:
             self.embed, self.default_description = self.restore_args(interaction)
@@ -118,163 +90,15 @@ class BotCommandsCategory(ui.Select):
         self.embed = cast(Embed, self.embed)
 
         category: str = self.values[0]
-
-        category_callback: Callable[[CustomInteraction], Awaitable] = getattr(self, category)
         await interaction.response.defer()
 
-        await category_callback(interaction)
-
-    async def admin(self, interaction: CustomInteraction):
-        self.embed = cast(Embed, self.embed)
-
-        if not self.cached_categories.get("admin"):
-            commands: list[SlashApplicationCommand] = list(
-                self.get_commands_by_category(interaction.bot, "administration")
-            )
-            description, amount_of_commands = self.format_commands(commands)
-            self.cached_categories["admin"] = (description, amount_of_commands)
-
-        else:
-            description, amount_of_commands = self.cached_categories["admin"]
-
-        self.embed.title = f"`⛔` Kategoria: Administracyjne ({amount_of_commands})"
-        self.embed.description = description
-
-        if interaction.message:
-            await interaction.followup.edit_message(embed=self.embed, message_id=interaction.message.id)
-
-    async def settings(self, interaction: CustomInteraction):
-        self.embed = cast(Embed, self.embed)
-
-        if not self.cached_categories.get("settings"):
-            commands: list[SlashApplicationCommand] = list(
-                self.get_commands_by_category(interaction.bot, "settings")
-            )
-            commands = [cmd for cmd in commands if cmd.name != "levelowanie"]
+        if category == "menu":
+            await self.menu(interaction)
+            return
 
-            description, amount_of_commands = self.format_commands(commands)
-            self.cached_categories["settings"] = (description, amount_of_commands)
-        else:
-            description, amount_of_commands = self.cached_categories["settings"]
-
-        self.embed.title = f"`🔧` Kategoria: Ustawienia ({amount_of_commands})"
-        self.embed.description = description
-
-        if interaction.message:
-            await interaction.followup.edit_message(embed=self.embed, message_id=interaction.message.id)
-
-    async def music(self, interaction: CustomInteraction):
-        self.embed = cast(Embed, self.embed)
-
-        if not self.cached_categories.get("music"):
-            commands: list[SlashApplicationCommand] = list(
-                self.get_commands_by_category(interaction.bot, "music")
-            )
-            description, amount_of_commands = self.format_commands(commands)
-
-            self.cached_categories["music"] = (description, amount_of_commands)
-        else:
-            description, amount_of_commands = self.cached_categories["music"]
-
-        self.embed.title = f"`🔊` Kategoria: Muzyka ({amount_of_commands})"
-        self.embed.description = description
-
-        if interaction.message:
-            await interaction.followup.edit_message(embed=self.embed, message_id=interaction.message.id)
-
-    async def economy(self, interaction: CustomInteraction):
-        self.embed = cast(Embed, self.embed)
-
-        if not self.cached_categories.get("economy"):
-            commands: list[SlashApplicationCommand] = list(
-                self.get_commands_by_category(interaction.bot, "economy")
-            )
-            description, amount_of_commands = self.format_commands(commands)
-
-            self.cached_categories["economy"] = (description, amount_of_commands)
-        else:
-            description, amount_of_commands = self.cached_categories["economy"]
+        description, amount_of_commands = interaction.bot.help_index.get(category)
 
-        self.embed.title = f"`💸` Kategoria: Ekonomia ({amount_of_commands})"
-        self.embed.description = description
-
-        if interaction.message:
-            await interaction.followup.edit_message(embed=self.embed, message_id=interaction.message.id)
-
-    async def additional(self, interaction: CustomInteraction):
-        self.embed = cast(Embed, self.embed)
-
-        if not self.cached_categories.get("additional"):
-            commands: list[SlashApplicationCommand] = list(
-                self.get_commands_by_category(interaction.bot, "additional")
-            )
-            description, amount_of_commands = self.format_commands(commands)
-
-            self.cached_categories["additional"] = (description, amount_of_commands)
-        else:
-            description, amount_of_commands = self.cached_categories["additional"]
-
-        self.embed.title = f"`🍀` Kategoria: Dodatkowe ({amount_of_commands})"
-        self.embed.description = description
-
-        if interaction.message:
-            await interaction.followup.edit_message(embed=self.embed, message_id=interaction.message.id)
-
-    async def leveling(self, interaction: CustomInteraction):
-        self.embed = cast(Embed, self.embed)
-
-        if not self.cached_categories.get("leveling"):
-            commands: list[SlashApplicationCommand] = list(
-                self.get_commands_by_category(interaction.bot, "settings")
-            )
-            commands = [cmd for cmd in commands if cmd.name == "levelowanie"]
-
-            description, amount_of_commands = self.format_commands(commands)
-            self.cached_categories["leveling"] = (description, amount_of_commands)
-        else:
-            description, amount_of_commands = self.cached_categories["leveling"]
-
-        self.embed.title = f"`✨` Kategoria: Levelowanie ({amount_of_commands})"
-        self.embed.description = description
-
-        if interaction.message:
-            await interaction.followup.edit_message(embed=self.embed, message_id=interaction.message.id)
-
-    async def bot(self, interaction: CustomInteraction):
-        self.embed = cast(Embed, self.embed)
-
-        if not self.cached_categories.get("bot"):
-            commands: list[SlashApplicationCommand] = list(
-                self.get_commands_by_category(interaction.bot, "client")
-            )
-            commands = [cmd for cmd in commands if cmd.name != "globalban"]
-
-            description, amount_of_commands = self.format_commands(commands)
-
-            self.cached_categories["bot"] = (description, amount_of_commands)
-        else:
-            description, amount_of_commands = self.cached_categories["bot"]
-
-        self.embed.title = f"`🤖` Kategoria: Bot ({amount_of_commands})"
-        self.embed.description = description
-
-        if interaction.message:
-            await interaction.followup.edit_message(embed=self.embed, message_id=interaction.message.id)
-
-    async def forfun(self, interaction: CustomInteraction):
-        self.embed = cast(Embed, self.embed)
-
-        if not self.cached_categories.get("forfun"):
-            commands: list[SlashApplicationCommand] = list(
-                self.get_commands_by_category(interaction.bot, "forfun")
-            )
-            description, amount_of_commands = self.format_commands(commands)
-
-            self.cached_categories["forfun"] = (description, amount_of_commands)
-        else:
-            description, amount_of_commands = self.cached_categories["forfun"]
-
-        self.embed.title = f"`😆` Kategoria: ForFun ({amount_of_commands})"
+        self.embed.title = f"{self.titles[category]} ({amount_of_commands})"
         self.embed.description = description
 
         if interaction.message:
@@ -347,16 +171,20 @@ class CommandHelp(CustomCog):
         super().__init__(bot)
 
         self.bot.loop.create_task(self.add_views())
+        self.bot.add_startup_task(self.build_help_index)
 
     async def add_views(self):
         self.bot.add_view(CommandHelpView())
 
+    async def build_help_index(self):
+        self.bot.help_index.build()
+
     @slash_command(name="pomoc", description="Komenda pomocy", dm_permission=False)
     async def help(self, interaction: CustomInteraction):
         assert interaction.user
 
         ping, shard = interaction.get_bot_latency()
-        commands: int = len(self.bot.get_all_application_commands())
+        commands: int = self.bot.help_index.get_commands_count()
 
         embed = Embed(
             title="`✨` Smiffy - Pomoc",
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from asyncio import sleep
 from datetime import datetime, timedelta
+from functools import partial
 from random import choice
 from time import mktime
 from typing import TYPE_CHECKING, Iterable, List, Optional
@@ -143,7 +144,7 @@ class CommandGiveaway(CustomCog):
             "invites": "Konkurs - Wymagania (zaproszenia)",
         }
 
-        self.bot.loop.create_task(self.enable_running_giveaways())
+        self.bot.add_startup_task(self.enable_running_giveaways)
 
     async def enable_running_giveaways(self):
         # Method to restore all working giveaways after bot restart
@@ -185,6 +186,7 @@ class CommandGiveaway(CustomCog):
                             giveaway_data[2],
                         ),
                     )
+                    self.bot.autocomplete.invalidate("giveaways", guild.id)
 
                     continue
 
@@ -310,7 +312,7 @@ class CommandGiveaway(CustomCog):
 
             await message.edit(embed=embed, view=None)
 
-            return await self.bot.db.execute_fetchone(
+            await self.bot.db.execute_fetchone(
                 "DELETE FROM giveaways WHERE guild_id = ? AND channel_id = ? AND message_id = ?",
                 (
                     message.guild.id,
@@ -318,6 +320,8 @@ class CommandGiveaway(CustomCog):
                     message.id,
                 ),
             )
+            self.bot.autocomplete.invalidate("giveaways", message.guild.id)
+            return
 
         if len(enters) < winners:
             winners = len(enters)
@@ -346,6 +350,7 @@ class CommandGiveaway(CustomCog):
                 message.id,
             ),
         )
+        self.bot.autocomplete.invalidate("giveaways", message.guild.id)
 
     async def start_giveaway(
         self,
@@ -455,6 +460,7 @@ class CommandGiveaway(CustomCog):
                 requirement_data,
             ),
         )
+        self.bot.autocomplete.invalidate("giveaways", interaction.guild.id)
 
         await self.continue_the_giveaway(
             reward,
@@ -712,6 +718,7 @@ class CommandGiveaway(CustomCog):
                 message_id,
             ),
         )
+        self.bot.autocomplete.invalidate("giveaways", interaction.guild.id)
 
         return await interaction.send_success_message(
             title=f"Pomyślnie zakończono konkurs {Emojis.GREENBUTTON.value}",
@@ -726,43 +733,24 @@ class CommandGiveaway(CustomCog):
     ) -> Optional[dict[str, str]]:
         assert interaction.guild
 
+        giveaways_data: list[tuple[str, str]] = await self.bot.autocomplete.search(
+            "giveaways",
+            interaction.guild.id,
+            query,
+            partial(self.get_giveaways_labels, interaction.guild.id),
+        )
+        return dict(giveaways_data) or None
+
+    async def get_giveaways_labels(self, guild_id: int) -> list[tuple[str, str]]:
         response: Iterable[DB_RESPONSE] = await self.bot.db.execute_fetchall(
             "SELECT message_id, reward, end_time FROM giveaways WHERE guild_id = ?",
-            (interaction.guild.id,),
+            (guild_id,),
         )
 
-        if not response:
-            return
-
-        if not query:
-            giveaways_data: dict[str, str] = {}
-            index: int = 0
-            for (
-                message_id,
-                reward,
-                end_time,
-            ) in response:
-                reward = f"{reward} - ({datetime.fromtimestamp(int(end_time))})"
-                giveaways_data[reward] = str(message_id)
-                index += 1
-
-                if index == 25:
-                    break
-        else:
-            giveaways_data: dict[str, str] = {}
-            index: int = 0
-            for (
-                message_id,
-                reward,
-                end_time,
-            ) in response:
-                if reward.lower().startswith(query.lower()):
-                    giveaways_data[f"{reward} - ({datetime.fromtimestamp(int(end_time))})"] = str(message_id)
-
-                    if index == 25:
-                        break
-
-        return giveaways_data
+        return [
+            (f"{reward} - ({datetime.fromtimestamp(int(end_time))})", str(message_id))
+            for message_id, reward, end_time in response
+        ]
 
 
 def setup(bot: Smiffy):
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
+from time import monotonic
 from typing import TYPE_CHECKING
 
-from geopy.geocoders import Nominatim
 from nextcord import Color, Embed, SlashOption, slash_command, utils
 
 from enums import Emojis
@@ -10,16 +10,110 @@ from utilities import CustomCog, CustomInteraction
 
 if TYPE_CHECKING:
     from bot import Smiffy
-    from utilities import ClientResponse, Optional
+    from utilities import DB_RESPONSE, ClientResponse, Optional
 
 
 class CommandWeather(CustomCog):
+    weather_cache_ttl: int = 600
+
     def __init__(self, bot: Smiffy) -> None:
         super().__init__(bot=bot)
 
         self._base_url: str = (
             "https://api.open-meteo.com/v1/forecast?latitude={}&longitude={}&current_weather=true"
         )
+        self._geocode_url: str = "https://nominatim.openstreetmap.org/search"
+
+        # (rounded latitude, rounded longitude) -> (expires at, current weather)
+        self.weather_cache: dict[tuple[float, float], tuple[float, dict]] = {}
+
+    @staticmethod
+    def normalize_place(place: str) -> str:
+        return " ".join(place.lower().split())
+
+    async def get_place_location(
+        self,
+        interaction: CustomInteraction,
+        place: str,
+    ) -> Optional[tuple[float, float]]:
+        """
+        The get_place_location function returns the coordinates of the place.
+        Coordinates never change, so every successful lookup is stored in the database.
+
+        :param interaction: Used to send an error message if the place was not found
+        :param place: Name of the place
+        :return: Latitude and longitude of the place or None if the place was not found
+        """
+
+        normalized_place: str = self.normalize_place(place)
+
+        response: Optional[DB_RESPONSE] = await self.bot.db.execute_fetchone(
+            "SELECT latitude, longitude FROM geocode_cache WHERE place = ?",
+            (normalized_place,),
+        )
+
+        if response:
+            return response[0], response[1]
+
+        api_response: Optional[ClientResponse] = await self.bot.session.send_api_request(
+            interaction=interaction,
+            url=self._geocode_url,
+            method="GET",
+            default_headers=False,
+            params={"q": normalized_place, "format": "json", "limit": 1},
+            headers={"User-Agent": f"SmiffyBot/v{self.bot.__version__}"},
+        )
+
+        if not api_response:
+            return None
+
+        data: list[dict] = await api_response.json()
+
+        if not data:
+            await interaction.send_error_message(description=f"Nie odnaleziono miejsca: `{place}`")
+            return None
+
+        latitude, longitude = float(data[0]["lat"]), float(data[0]["lon"])
+
+        await self.bot.db.execute_fetchone(
+            "INSERT OR IGNORE INTO geocode_cache(place, latitude, longitude) VALUES(?,?,?)",
+            (normalized_place, latitude, longitude),
+        )
+
+        return latitude, longitude
+
+    async def get_current_weather(
+        self,
+        interaction: CustomInteraction,
+        latitude: float,
+        longitude: float,
+    ) -> Optional[dict]:
+        cache_key: tuple[float, float] = (round(latitude, 2), round(longitude, 2))
+        cached_weather: Optional[tuple[float, dict]] = self.weather_cache.get(cache_key)
+
+        if cached_weather and cached_weather[0] > monotonic():
+            return cached_weather[1]
+
+        response: Optional[ClientResponse] = await self.bot.session.send_api_request(
+            interaction=interaction,
+            url=self._base_url.format(*cache_key),
+            method="GET",
+            default_headers=False,
+        )
+
+        if not response:
+            return None
+
+        data: dict = await response.json()
+        now: float = monotonic()
+
+        for key, (expires_at, _) in tuple(self.weather_cache.items()):
+            if expires_at <= now:
+                del self.weather_cache[key]
+
+        self.weather_cache[cache_key] = (now + self.weather_cache_ttl, data["current_weather"])
+
+        return data["current_weather"]
 
     @slash_command(
         name="pogoda",
@@ -36,30 +130,16 @@ class CommandWeather(CustomCog):
     ):
         await interaction.response.defer()
 
-        geolocator = Nominatim(user_agent=f"SmiffyBot/v{self.bot.__version__}")
-        location = geolocator.geocode(place)
+        location: Optional[tuple[float, float]] = await self.get_place_location(interaction, place)
 
         if not location:
-            return await interaction.send_error_message(description=f"Nie odnaleziono miejsca: `{place}`")
-
-        latitude, longitude = (
-            location.latitude,  # pyright: ignore
-            location.longitude,  # pyright: ignore
-        )
+            return
 
-        response: Optional[ClientResponse] = await self.bot.session.send_api_request(
-            interaction=interaction,
-            url=self._base_url.format(latitude, longitude),
-            method="GET",
-            default_headers=False,
-        )
+        weather_data: Optional[dict] = await self.get_current_weather(interaction, *location)
 
-        if not response:
+        if not weather_data:
             return
 
-        data: dict = await response.json()
-
-        weather_data: dict = data["current_weather"]
         temperature: float = weather_data["temperature"]
         windspeed: float = weather_data["windspeed"]
         observation_time: str = str(utils.utcnow())[0:19]
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from nextcord import Member, Role, SlashOption, errors, slash_command
+from nextcord import Member, Role, SlashOption, TextChannel, slash_command
 
 from enums import Emojis
 from utilities import CustomCog, CustomInteraction, PermissionHandler
@@ -44,42 +44,20 @@ class CommandAddMassRole(CustomCog):
         if role.is_default() or role.is_bot_managed() or role.is_premium_subscriber():
             return await interaction.send_error_message(description="Podana rola nie może zostać użyta.")
 
-        index: int = 0
-        if interaction.guild.members != interaction.guild.member_count:
-            async for member in interaction.guild.fetch_members(limit=interaction.guild.member_count):
-                interaction.guild._add_member(member)
+        if not isinstance(interaction.channel, TextChannel):
+            return await interaction.send_error_message(
+                description="Tej komendy można użyć tylko na kanale tekstowym."
+            )
 
-                try:
-                    if role not in member.roles:
-                        await member.add_roles(
-                            role,
-                            reason="Smiffy - AddMassRole",
-                        )
-                        index += 1
-                except (
-                        errors.Forbidden,
-                        errors.HTTPException,
-                ):
-                    pass
-        else:
-            for member in interaction.guild.members:
-                try:
-                    if role not in member.roles:
-                        await member.add_roles(
-                            role,
-                            reason="Smiffy - AddMassRole",
-                        )
-                        index += 1
-                except (
-                    errors.Forbidden,
-                    errors.HTTPException,
-                ):
-                    pass
+        if not await self.bot.bulk_actions.start(interaction.guild, "add_role", interaction.channel, role.id):
+            return await interaction.send_error_message(
+                description="Na serwerze trwa już inna masowa akcja. Poczekaj, aż się zakończy."
+            )
 
         return await interaction.send_success_message(
-            title=f"Pomyślnie nadano role {Emojis.GREENBUTTON.value}",
-            description=f"<:reply:1129168370642718833> Nadano role: {role.mention} "
-            f"dla `{index}` osób",
+            title=f"Rozpoczęto nadawanie roli {Emojis.GREENBUTTON.value}",
+            description=f"{Emojis.REPLY.value} Rola: {role.mention} jest nadawana w tle. "
+            f"Postęp będzie widoczny w osobnej wiadomości.",
         )
 
 
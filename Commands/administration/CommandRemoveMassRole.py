@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from nextcord import Member, Role, SlashOption, TextChannel, slash_command
+
+from enums import Emojis
+from utilities import CustomCog, CustomInteraction, PermissionHandler
+
+if TYPE_CHECKING:
+    from bot import Smiffy
+
+
+class CommandRemoveMassRole(CustomCog):
+    @slash_command(
+        name="zabierzmasoworole",
+        description="Zabiera każdemu wybraną role.",
+        dm_permission=False,
+    )  # pyright: ignore
+    @PermissionHandler(manage_roles=True)
+    async def removemassrole(
+        self,
+        interaction: CustomInteraction,
+        role: Role = SlashOption(
+            name="rola",
+            description="Podaj rolę, którą chcesz zabrać",
+        ),
+    ):
+        assert interaction.guild and interaction.user
+
+        await interaction.response.defer()
+
+        if interaction.guild.me.top_role.position <= role.position:
+            return await interaction.send_error_message(
+                description="Podana rola posiada większe uprawnienia ode mnie."
+            )
+
+        if isinstance(interaction.user, Member):
+            if interaction.user.top_role.position <= role.position:
+                return await interaction.send_error_message(
+                    description=f"Rola: {role.mention} posiada większe uprawnienia od ciebie.",
+                )
+
+        if role.is_default() or role.is_bot_managed() or role.is_premium_subscriber():
+            return await interaction.send_error_message(description="Podana rola nie może zostać użyta.")
+
+        if not isinstance(interaction.channel, TextChannel):
+            return await interaction.send_error_message(
+                description="Tej komendy można użyć tylko na kanale tekstowym."
+            )
+
+        if not await self.bot.bulk_actions.start(
+            interaction.guild, "remove_role", interaction.channel, role.id
+        ):
+            return await interaction.send_error_message(
+                description="Na serwerze trwa już inna masowa akcja. Poczekaj, aż się zakończy."
+            )
+
+        return await interaction.send_success_message(
+            title=f"Rozpoczęto zabieranie roli {Emojis.GREENBUTTON.value}",
+            description=f"{Emojis.REPLY.value} Rola: {role.mention} jest zabierana w tle. "
+            f"Postęp będzie widoczny w osobnej wiadomości.",
+        )
+
+
+def setup(bot: Smiffy):
+    bot.add_cog(CommandRemoveMassRole(bot))
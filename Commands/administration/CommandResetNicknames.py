@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from nextcord import TextChannel, slash_command
+
+from enums import Emojis
+from utilities import CustomCog, CustomInteraction, PermissionHandler
+
+if TYPE_CHECKING:
+    from bot import Smiffy
+
+
+class CommandResetNicknames(CustomCog):
+    @slash_command(
+        name="resetujnicki",
+        description="Resetuje pseudonimy wszystkich osób na serwerze.",
+        dm_permission=False,
+    )  # pyright: ignore
+    @PermissionHandler(manage_nicknames=True)
+    async def reset_nicknames(self, interaction: CustomInteraction):
+        assert interaction.guild
+
+        await interaction.response.defer()
+
+        if not isinstance(interaction.channel, TextChannel):
+            return await interaction.send_error_message(
+                description="Tej komendy można użyć tylko na kanale tekstowym."
+            )
+
+        if not await self.bot.bulk_actions.start(interaction.guild, "reset_nick", interaction.channel):
+            return await interaction.send_error_message(
+                description="Na serwerze trwa już inna masowa akcja. Poczekaj, aż się zakończy."
+            )
+
+        return await interaction.send_success_message(
+            title=f"Rozpoczęto resetowanie nicków {Emojis.GREENBUTTON.value}",
+            description=f"{Emojis.REPLY.value} Pseudonimy są resetowane w tle. "
+            f"Postęp będzie widoczny w osobnej wiadomości.",
+        )
+
+
+def setup(bot: Smiffy):
+    bot.add_cog(CommandResetNicknames(bot))
@@ -30,7 +30,7 @@ class CommandTempBan(CustomCog):
     def __init__(self, bot: Smiffy):
         super().__init__(bot=bot)
 
-        self.bot.loop.create_task(self.load_tempbans())
+        self.bot.add_startup_task(self.load_tempbans)
 
     @slash_command(
         name="tempban",
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from io import BytesIO
+from typing import TYPE_CHECKING, Optional
+
+from nextcord import File, SlashOption, slash_command
+from nextcord.ext.application_checks import errors, is_owner
+
+from enums import Emojis
+from utilities import CustomCog, CustomInteraction
+
+if TYPE_CHECKING:
+    from bot import Smiffy
+    from utilities import LatencyHistogram
+
+
+class CommandDiagnostics(CustomCog):
+    def get_loop_stats(self) -> str:
+        if not self.bot.loop_monitor.running:
+            return f"{Emojis.REPLY.value} Monitor pętli jest wyłączony (`LOOP_MONITOR`)."
+
+        lag: LatencyHistogram = self.bot.loop_monitor.lag
+
+        return (
+            f"{Emojis.REPLY.value} Opóźnienie pętli p50: `{lag.quantile(0.5) * 1000:.0f}ms`, "
+            f"p99: `{lag.quantile(0.99) * 1000:.0f}ms`, blokady: `{self.bot.loop_monitor.blocks}`"
+        )
+
+    async def send_result(
+        self,
+        interaction: CustomInteraction,
+        result: Optional[str],
+        title: str,
+        filename: str,
+    ):
+        if result is None:
+            return await interaction.send_error_message(
+                description="Inna diagnostyka jest w trakcie, spróbuj ponownie za chwilę.",
+                ephemeral=True,
+            )
+
+        await interaction.send_success_message(
+            title=f"{title} {Emojis.GREENBUTTON.value}",
+            description=self.get_loop_stats(),
+            ephemeral=True,
+        )
+        await interaction.send(
+            file=File(BytesIO(result.encode()), filename=filename),
+            ephemeral=True,
+        )
+
+    @slash_command(name="diagnostyka", dm_permission=False)
+    async def diagnostics(self, interaction: CustomInteraction):
+        pass
+
+    @diagnostics.subcommand(
+        name="stos",
+        description="Próbkuje stos pętli zdarzeń bota przez podany czas",
+    )
+    @is_owner()
+    async def diagnostics_stack(
+        self,
+        interaction: CustomInteraction,
+        duration: int = SlashOption(
+            name="czas",
+            description="Podaj czas próbkowania w sekundach",
+            min_value=1,
+            max_value=60,
+            default=10,
+        ),
+    ):
+        await interaction.response.defer(ephemeral=True)
+
+        result: Optional[str] = await self.bot.loop_monitor.sample(duration)
+        await self.send_result(interaction, result, "Próbkowanie zakończone", "stack.txt")
+
+    @diagnostics.subcommand(
+        name="profil",
+        description="Uruchamia cProfile na pętli zdarzeń bota przez podany czas",
+    )
+    @is_owner()
+    async def diagnostics_profile(
+        self,
+        interaction: CustomInteraction,
+        duration: int = SlashOption(
+            name="czas",
+            description="Podaj czas profilowania w sekundach",
+            min_value=1,
+            max_value=60,
+            default=10,
+        ),
+    ):
+        await interaction.response.defer(ephemeral=True)
+
+        result: Optional[str] = await self.bot.loop_monitor.profile(duration)
+        await self.send_result(interaction, result, "Profilowanie zakończone", "profile.txt")
+
+    @diagnostics.error  # pyright: ignore[reportGeneralTypeIssues]
+    async def diagnostics_error(
+        self,
+        interaction: CustomInteraction,
+        error: Exception,
+    ):
+        if isinstance(error, errors.ApplicationNotOwner):
+            return await interaction.send_error_message(
+                description="Tylko właściciel bota może użyć tej komendy."
+            )
+
+
+def setup(bot: Smiffy):
+    bot.add_cog(CommandDiagnostics(bot))
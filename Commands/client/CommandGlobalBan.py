@@ -10,7 +10,6 @@ from utilities import CustomCog, CustomInteraction
 
 if TYPE_CHECKING:
     from bot import Smiffy
-    from utilities import DB_RESPONSE, Optional
 
 
 class CommandGlobalBan(CustomCog):
@@ -35,18 +34,9 @@ class CommandGlobalBan(CustomCog):
             description="Podaj powód blokady",
         ),
     ):
-        response: Optional[DB_RESPONSE] = await self.bot.db.execute_fetchone(
-            "SELECT * FROM global_bans WHERE user_id = ?",
-            (int(user_id),),
-        )
-        if response:
+        if not await self.bot.global_bans.add(int(user_id), reason):
             return await interaction.send_error_message(description="Podana osoba już posiada blokadę.")
 
-        await self.bot.db.execute_fetchone(
-            "INSERT INTO global_bans(user_id, reason) VALUES(?,?)",
-            (int(user_id), reason),
-        )
-
         await interaction.send_success_message(
             title=f"Pomyślnie nadano blokadę {Emojis.GREENBUTTON.value}",
             description=f"{Emojis.REPLY.value} Blokada dla id: `{user_id}` została nadana.",
@@ -65,18 +55,9 @@ class CommandGlobalBan(CustomCog):
             description="Podaj id osoby",
         ),
     ):
-        response: Optional[DB_RESPONSE] = await self.bot.db.execute_fetchone(
-            "SELECT * FROM global_bans WHERE user_id = ?",
-            (int(user_id),),
-        )
-        if not response:
+        if not await self.bot.global_bans.remove(int(user_id)):
             return await interaction.send_error_message(description="Podana osoba nie posiada blokady.")
 
-        await self.bot.db.execute_fetchone(
-            "DELETE FROM global_bans WHERE user_id = ?",
-            (int(user_id),),
-        )
-
         await interaction.send_success_message(
             title=f"Pomyślnie zdjęto blokadę {Emojis.GREENBUTTON.value}",
             description=f"{Emojis.REPLY.value} Pomyślnie usunięto blokade osobie: `{user_id}`",
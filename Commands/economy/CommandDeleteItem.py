@@ -1,11 +1,11 @@
 from __future__ import annotations
 
+from functools import partial
 from typing import TYPE_CHECKING, Optional
 
 from nextcord import Color, SlashOption
 
 from enums import Emojis
-from typings import EconomyItemData
 from utilities import CustomCog, CustomInteraction, PermissionHandler
 
 from .__main__ import EconomyCog, EconomyManager
@@ -63,16 +63,13 @@ class CommandDeleteItem(CustomCog):
 
         manager: EconomyManager = EconomyManager(bot=self.bot)
 
-        items: list[EconomyItemData] = await manager.get_guild_shop(guild=interaction.guild)
-        if not items:
-            return None
-
-        items_name: list[str] = [data["name"] for data in items]
-        if not query:
-            return items_name
-
-        get_near_item: list[str] = [item for item in items_name if item.lower().startswith(query.lower())]
-        return get_near_item
+        items_name: list[str] = await self.bot.autocomplete.search_labels(
+            "economy_items",
+            interaction.guild.id,
+            query,
+            partial(manager.get_shop_item_names, interaction.guild.id),
+        )
+        return items_name or None
 
 
 def setup(bot: Smiffy):
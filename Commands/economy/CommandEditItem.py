@@ -2,12 +2,12 @@
 
 from __future__ import annotations
 
+from functools import partial
 from typing import TYPE_CHECKING, Optional
 
 from nextcord import Color, Role, SlashOption
 
 from enums import Emojis
-from typings import EconomyItemData
 from utilities import CustomCog, CustomInteraction, PermissionHandler
 
 from .__main__ import EconomyCog, EconomyManager
@@ -137,18 +137,16 @@ class CommandEditItem(CustomCog):
         query: Optional[str],
     ) -> Optional[list[str]]:
         assert interaction.guild
-        manager: EconomyManager = EconomyManager(bot=self.bot)
-
-        items: list[EconomyItemData] = await manager.get_guild_shop(guild=interaction.guild)
-        if not items:
-            return None
 
-        items_name: list[str] = [data["name"] for data in items]
-        if not query:
-            return items_name
+        manager: EconomyManager = EconomyManager(bot=self.bot)
 
-        get_near_item: list[str] = [item for item in items_name if item.lower().startswith(query.lower())]
-        return get_near_item
+        items_name: list[str] = await self.bot.autocomplete.search_labels(
+            "economy_items",
+            interaction.guild.id,
+            query,
+            partial(manager.get_shop_item_names, interaction.guild.id),
+        )
+        return items_name or None
 
 
 def setup(bot: Smiffy):
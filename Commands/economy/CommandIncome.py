@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 from ast import literal_eval
-from asyncio import sleep
+from asyncio import Event, Task
+from asyncio import TimeoutError as AsyncioTimeoutError
+from asyncio import wait_for
+from heapq import heappop, heappush
+from time import monotonic
 from typing import TYPE_CHECKING, Optional
 
 from nextcord import (
@@ -30,13 +34,28 @@ if TYPE_CHECKING:
 
 
 class IncomeHandler:
+    # SQLite limits the amount of variables in a single query
+    chunk_size: int = 500
+
     def __init__(self, bot: Smiffy):
         self.bot: Smiffy = bot
 
         role_income_data = tuple[int, int, Optional[int], Optional[str]]
         self.income_data: dict[int, dict[int, role_income_data]] = {}
 
-        self.economy_manager: EconomyManager = EconomyManager(bot)
+        # (next payout time, guild_id, role_id, generation)
+        self.payouts: list[tuple[float, int, int, int]] = []
+        self.generations: dict[tuple[int, int], int] = {}
+
+        self.wakeup: Event = Event()
+        self.scheduler: Optional[Task] = None
+
+    def schedule_role(self, guild_id: int, role_id: int, frequency: int) -> None:
+        generation: int = self.generations.get((guild_id, role_id), 0) + 1
+        self.generations[(guild_id, role_id)] = generation
+
+        heappush(self.payouts, (monotonic() + frequency, guild_id, role_id, generation))
+        self.wakeup.set()
 
     def add_income_data(
         self,
@@ -44,25 +63,29 @@ class IncomeHandler:
         income_data: dict[int, tuple],
     ):
         """
-        The add_income_data function adds income data to the guild's income_data dictionary.
+        The add_income_data function replaces the guild's income data and reschedules the payouts of its roles.
+        Roles missing in the new data stop receiving incomes.
 
         :param guild_id: Specify the guild id of the server
-        :param income_data: Get the tuple with income data
+        :param income_data: Dict with roles and their income data
         :return: None
         """
 
-        data: Optional[dict] = self.income_data.get(guild_id)
-        run_new_loop: bool = False
+        previous_data: dict[int, tuple] = self.income_data.pop(guild_id, {})
 
-        if data is None:
-            run_new_loop = True
-            data = {}
+        for role_id in previous_data:
+            if role_id not in income_data:
+                # Entries of removed roles are skipped by the scheduler. The generation is never reset,
+                # so the old entries don't match again if the role is added back.
+                key: tuple[int, int] = (guild_id, role_id)
+                self.generations[key] = self.generations.get(key, 0) + 1
 
-        data.update(income_data)
-        self.income_data[guild_id] = data
+        if income_data:
+            self.income_data[guild_id] = income_data
 
-        if run_new_loop:
-            self.bot.loop.create_task(self.run_incomes(guild_id))
+        for role_id, role_income_data in income_data.items():
+            if previous_data.get(role_id) != role_income_data:
+                self.schedule_role(guild_id, role_id, role_income_data[0])
 
     async def request_data(self):
         """
@@ -77,43 +100,44 @@ class IncomeHandler:
             "SELECT guild_id, income_roles FROM economy_settings"
         )
         for row in response:
-            self.income_data[row[0]] = literal_eval(row[1])
+            if row and row[1]:
+                self.add_income_data(row[0], literal_eval(row[1]))
 
-    async def run_incomes(self, guild_id: int) -> None:
+    async def run_scheduler(self) -> None:
         """
-        The run_incomes function is a coroutine that runs in the background of the bot.
-        It's purpose is to add income to roles at a specified frequency.
-        The function takes one argument, guild_id, which specifies which guild's data should be used.
+        The run_scheduler function pays the incomes of all guilds using a single heap of the next payout times.
+        It sleeps until the nearest payout or until a role with an earlier payout is added.
 
-        :param guild_id: Identify the guild that the income is being added to
         :return: None
         """
 
         while True:
-            await sleep(1)
-
-            data: Optional[dict[int, tuple]] = self.income_data.get(guild_id)
-
-            if data is None:
-                break
-
-            for (
-                role_id,
-                income_data,
-            ) in data.items():
-                frequency: int = income_data[0]
-
-                self.bot.loop.call_later(
-                    frequency,
-                    self.bot.loop.create_task,
-                    self.add_income(
-                        guild_id,
-                        role_id,
-                        income_data,
-                    ),
-                )
+            self.wakeup.clear()
+
+            if not self.payouts:
+                await self.wakeup.wait()
+                continue
+
+            delay: float = self.payouts[0][0] - monotonic()
+
+            if delay > 0:
+                try:
+                    await wait_for(self.wakeup.wait(), timeout=delay)
+                except AsyncioTimeoutError:
+                    pass
+
+                continue
+
+            payout_time, guild_id, role_id, generation = heappop(self.payouts)
 
-            self.income_data[guild_id] = {}
+            if self.generations.get((guild_id, role_id)) != generation:
+                # The role income was changed or removed
+                continue
+
+            role_income_data: tuple = self.income_data[guild_id][role_id]
+
+            heappush(self.payouts, (payout_time + role_income_data[0], guild_id, role_id, generation))
+            self.bot.loop.create_task(self.add_income(guild_id, role_id, role_income_data))
 
     async def add_income(
         self,
@@ -123,6 +147,7 @@ class IncomeHandler:
     ):
         """
         The add_income function is a coroutine that adds income to all members of a role.
+        Missing accounts are created and the balances are updated in batches.
 
         :param guild_id: Get the guild object
         :param role_id: Identify the role that is being added to the income loop
@@ -130,81 +155,85 @@ class IncomeHandler:
         :return: None
         """
 
-        if await self.check_income_role_status(guild_id, role_id):
-            income: int = role_income_data[1]
-            channel_id: Optional[int] = role_income_data[2]
-            channel_message: Optional[str] = role_income_data[3]
+        response: Optional[DB_RESPONSE] = await self.bot.db.execute_fetchone(
+            "SELECT start_balance, max_balance FROM economy_settings WHERE guild_id = ?",
+            (guild_id,),
+        )
 
-            guild: Optional[Guild] = await self.bot.getch_guild(guild_id)
-            if not guild:
-                return
+        if not response:
+            # Economy was disabled on the server
+            self.add_income_data(guild_id, {})
+            return
 
-            role: Optional[Role] = await self.bot.getch_role(guild, role_id)
-            if not role:
-                return
+        start_balance, max_balance = response[0], response[1]
 
-            if channel_id and channel_message:
-                channel: Optional[GuildChannel] = await self.bot.getch_channel(channel_id)
+        income: int = role_income_data[1]
+        channel_id: Optional[int] = role_income_data[2]
+        channel_message: Optional[str] = role_income_data[3]
 
-                try:
-                    if isinstance(channel, TextChannel):
-                        await channel.send(channel_message)
-                except (HTTPException, Forbidden):
-                    pass
+        guild: Optional[Guild] = self.bot.get_guild(guild_id)
+        if not guild:
+            return
+
+        role: Optional[Role] = guild.get_role(role_id)
+        if not role:
+            return
+
+        if channel_id and channel_message:
+            channel: Optional[GuildChannel] = await self.bot.getch_channel(channel_id)
+
+            try:
+                if isinstance(channel, TextChannel):
+                    await channel.send(channel_message)
+            except (HTTPException, Forbidden):
+                pass
 
-            for member in role.members:
-                await self.economy_manager.add_user_money(member, {"money": income})
+        member_ids: list[int] = [member.id for member in role.members]
 
-            data: Optional[dict] = self.income_data.get(guild_id)
-            if data is not None:
-                data.update({role_id: role_income_data})
-                self.income_data[guild_id] = data
+        for index in range(0, len(member_ids), self.chunk_size):
+            chunk: list[int] = member_ids[index : index + self.chunk_size]
+            placeholders: str = ",".join("?" * len(chunk))
+
+            existing_accounts: Iterable[DB_RESPONSE] = await self.bot.db.execute_fetchall(
+                f"SELECT user_id FROM economy_users WHERE guild_id = ? AND user_id IN ({placeholders})",
+                (guild_id, *chunk),
+            )
+            existing_ids: set[int] = {row[0] for row in existing_accounts}
+
+            await self.bot.db.execute_many(
+                "INSERT INTO economy_users(guild_id, user_id, money, bank_money, items) VALUES(?,?,?,?,?)",
+                [
+                    (guild_id, user_id, start_balance, 0, "[]")
+                    for user_id in chunk
+                    if user_id not in existing_ids
+                ],
+            )
+
+            await self.bot.db.execute_fetchone(
+                f"UPDATE economy_users SET money = MIN(money + ?, ? - bank_money) "
+                f"WHERE guild_id = ? AND user_id IN ({placeholders})",
+                (income, max_balance, guild_id, *chunk),
+            )
 
     async def run_handler(self) -> None:
         """
         The run_handler function is the main function of this cog. It does the following:
             1) Requests data from the database
-            2) Runs through each guild in that data and runs incomes for it
+            2) Starts the scheduler which pays the incomes
 
         :return: None
         """
 
         await self.request_data()
 
-        for guild_id in self.income_data:
-            self.bot.loop.create_task(self.run_incomes(guild_id))
-
-    async def check_income_role_status(self, guild_id: int, role_id: int) -> bool:
-        """
-        The check_income_role_status function is used to check if a role has been set as an income role.
-        This function will return True if the given role_id is in the database, and False otherwise.
-        This is necessary because while the bot is running, the server administrator can remove role from income roles
-
-        :param guild_id: Get the guild id
-        :param role_id: Check if the role_id is in the data dict
-        :return: A boolean value
-        """
-
-        response: Optional[DB_RESPONSE] = await self.bot.db.execute_fetchone(
-            "SELECT income_roles from economy_settings WHERE guild_id = ?",
-            (guild_id,),
-        )
-        if not response or not response[0]:
-            return False
-
-        data: dict[int, tuple] = literal_eval(response[0])
-
-        for role in data:
-            if role == role_id:
-                return True
-
-        return False
+        if not self.scheduler:
+            self.scheduler = self.bot.loop.create_task(self.run_scheduler())
 
     @classmethod
     def setup(cls, bot: Smiffy) -> IncomeHandler:
         handler = cls(bot)
 
-        bot.loop.create_task(handler.run_handler())
+        bot.add_startup_task(handler.run_handler)
 
         return handler
 
@@ -405,6 +434,7 @@ class CommandIncome(CustomCog):
             "UPDATE economy_settings SET income_roles = ? WHERE guild_id = ?",
             (str(data), interaction.guild.id),
         )
+        self.income_handler.add_income_data(guild_id=interaction.guild.id, income_data=data)
 
         await interaction.send_success_message(
             title=f"Pomyślnie usunięto {Emojis.GREENBUTTON.value}",
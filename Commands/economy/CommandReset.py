@@ -87,6 +87,8 @@ class ConfirmReset(ui.View):
                 (interaction.guild.id,),
             )
 
+        self.bot.autocomplete.invalidate("economy_items", interaction.guild.id)
+
         embed = Embed(
             title=f"Pomyślnie zresetowano ekonomię {Emojis.GREENBUTTON.value}",
             color=Color.green(),
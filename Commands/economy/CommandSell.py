@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from functools import partial
 from typing import TYPE_CHECKING, Optional
 
 from nextcord import Member, SlashOption
@@ -81,25 +82,13 @@ class CommandSell(CustomCog):
         if not await manager.get_guild_economy_status(interaction.guild):
             return None
 
-        user_data: EconomyUserData = await manager.get_user_data(interaction.user)
-
-        user_items_ids: list[str] = user_data["items"]
-        if len(user_items_ids) == 0:
-            return None
-
-        items: list[str] = []
-        for item_id in user_items_ids:
-            item: Optional[EconomyItemData] = await manager.get_guild_item(interaction.guild, item_id=item_id)
-            if item and item["name"] not in items:
-                items.append(item["name"])
-
-        if not query:
-            return items
-
-        get_near_item: list[str] = [
-            item_name for item_name in items if item_name.lower().startswith(query.lower())
-        ]
-        return get_near_item
+        items: list[str] = await self.bot.autocomplete.search_labels(
+            "economy_user_items",
+            (interaction.guild.id, interaction.user.id),
+            query,
+            partial(manager.get_user_item_names, interaction.guild.id, interaction.user.id),
+        )
+        return items or None
 
 
 def setup(bot: Smiffy):
@@ -108,6 +108,7 @@ class EconomyManager:
             "DELETE FROM economy_shop WHERE guild_id = ? AND name = ?",
             (guild.id, item_name),
         )
+        self.bot.autocomplete.invalidate("economy_items", guild.id)
 
     async def edit_guild_item(
         self,
@@ -130,6 +131,7 @@ class EconomyManager:
         )
 
         await self.bot.db.execute_fetchone(sql, values)
+        self.bot.autocomplete.invalidate("economy_items", guild.id)
 
     async def generate_item_id(self, guild: Guild) -> str:
         item_id: str = f"sf-{randint(10000, 99999)}{str(guild.id)[0:3]}"
@@ -145,6 +147,37 @@ class EconomyManager:
             f"INSERT INTO economy_shop({', '.join(item_data.keys())}) VALUES(?,?,?,?,?,?,?,?)",
             tuple(item_data.values()),
         )
+        self.bot.autocomplete.invalidate("economy_items", item_data["guild_id"])
+
+    async def get_shop_item_names(self, guild_id: int) -> list[tuple[str, str]]:
+        response: Iterable[DB_RESPONSE] = await self.bot.db.execute_fetchall(
+            "SELECT name FROM economy_shop WHERE guild_id = ?",
+            (guild_id,),
+        )
+
+        return [(data[0], data[0]) for data in response]
+
+    async def get_user_item_names(self, guild_id: int, user_id: int) -> list[tuple[str, str]]:
+        response: Optional[DB_RESPONSE] = await self.bot.db.execute_fetchone(
+            "SELECT items FROM economy_users WHERE guild_id = ? AND user_id = ?",
+            (guild_id, user_id),
+        )
+
+        if not response:
+            return []
+
+        user_items_ids: set[str] = set(literal_eval(response[0]))
+
+        if not user_items_ids:
+            return []
+
+        shop: Iterable[DB_RESPONSE] = await self.bot.db.execute_fetchall(
+            "SELECT item_id, name FROM economy_shop WHERE guild_id = ?",
+            (guild_id,),
+        )
+
+        names: dict[str, None] = {name: None for item_id, name in shop if item_id in user_items_ids}
+        return [(name, name) for name in names]
 
     async def get_guild_shop(self, guild: Guild) -> list[EconomyItemData]:
         response: Optional[Iterable[DB_RESPONSE]] = await self.bot.db.execute_fetchall(
@@ -287,6 +320,7 @@ class EconomyManager:
                 user.id,
             ),
         )
+        self.bot.autocomplete.invalidate("economy_user_items", (user.guild.id, user.id))
 
         return user_data
 
@@ -346,6 +380,7 @@ class EconomyManager:
             "DELETE FROM economy_users WHERE guild_id = ? AND user_id = ?",
             (guild.id, user_id),
         )
+        self.bot.autocomplete.invalidate("economy_user_items", (guild.id, user_id))
 
     async def set_guild_economy_status(self, guild: Guild, status: bool) -> None:
         if status:
@@ -9,7 +9,7 @@ from utilities import CustomCog, CustomInteraction
 
 if TYPE_CHECKING:
     from bot import Smiffy
-    from utilities import ClientResponse, Optional
+    from utilities import Optional
 
 
 class CommandAchievement(CustomCog):
@@ -31,16 +31,15 @@ class CommandAchievement(CustomCog):
 
         api_url: str = f"https://api.alexflipnote.dev/achievement?text={text}&icon=1"
 
-        response: Optional[ClientResponse] = await self.bot.session.send_api_request(
+        content: Optional[bytes] = await self.bot.session.send_cached_request(
             interaction=interaction,
             url=api_url,
-            method="GET",
         )
 
-        if not response:
+        if content is None:
             return
 
-        data: BytesIO = BytesIO(await response.read())
+        data: BytesIO = BytesIO(content)
 
         await interaction.send(file=File(data, "mc.png"))
 
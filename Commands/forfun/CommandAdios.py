@@ -9,7 +9,7 @@ from utilities import CustomCog, CustomInteraction
 
 if TYPE_CHECKING:
     from bot import Smiffy
-    from utilities import ClientResponse, Optional
+    from utilities import Optional
 
 
 class CommandAdios(CustomCog):
@@ -30,16 +30,15 @@ class CommandAdios(CustomCog):
 
         api_url: str = f"https://vacefron.nl/api/adios?user={user.display_avatar.url}"
 
-        response: Optional[ClientResponse] = await self.bot.session.send_api_request(
+        content: Optional[bytes] = await self.bot.session.send_cached_request(
             interaction=interaction,
             url=api_url,
-            method="GET",
         )
 
-        if not response:
+        if content is None:
             return
 
-        data: BytesIO = BytesIO(await response.read())
+        data: BytesIO = BytesIO(content)
 
         await interaction.send(file=File(data, "adios.png"))
 
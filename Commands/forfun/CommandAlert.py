@@ -9,7 +9,7 @@ from utilities import CustomCog, CustomInteraction
 
 if TYPE_CHECKING:
     from bot import Smiffy
-    from utilities import ClientResponse, Optional
+    from utilities import Optional
 
 
 class CommandAlert(CustomCog):
@@ -29,15 +29,14 @@ class CommandAlert(CustomCog):
     ):
         await interaction.response.defer()
 
-        response: Optional[ClientResponse] = await self.bot.session.send_api_request(
+        content: Optional[bytes] = await self.bot.session.send_cached_request(
             interaction=interaction,
             url=f"https://api.popcat.xyz/alert?text={text}",
-            method="GET",
         )
-        if not response:
+        if content is None:
             return
 
-        data = BytesIO(await response.read())
+        data = BytesIO(content)
 
         await interaction.send(file=File(data, "alert.png"))
 
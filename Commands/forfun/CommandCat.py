@@ -8,10 +8,17 @@ from utilities import CustomCog, CustomInteraction
 
 if TYPE_CHECKING:
     from bot import Smiffy
-    from utilities import ClientResponse, Optional
+    from utilities import Optional
 
 
 class CommandCat(CustomCog):
+    api_url: str = "https://some-random-api.com/animal/cat"
+
+    def __init__(self, bot: Smiffy) -> None:
+        super().__init__(bot=bot)
+
+        bot.image_pool.register(self.api_url)
+
     @slash_command(
         name="kot",
         description="Wysyła randomowy obrazek kici.",
@@ -20,16 +27,10 @@ class CommandCat(CustomCog):
     async def cat(self, interaction: CustomInteraction):
         await interaction.response.defer()
 
-        response: Optional[ClientResponse] = await self.bot.session.send_api_request(
-            interaction=interaction,
-            url="https://some-random-api.com/animal/cat",
-            method="GET",
-        )
-        if not response:
+        data: Optional[dict] = await self.bot.image_pool.get(interaction, self.api_url)
+        if not data:
             return
 
-        data = await response.json()
-
         embed = Embed(
             title="Oto Twój kitku.",
             color=Color.dark_theme(),
@@ -9,7 +9,7 @@ from utilities import CustomCog, CustomInteraction
 
 if TYPE_CHECKING:
     from bot import Smiffy
-    from utilities import ClientResponse, Optional
+    from utilities import Optional
 
 
 class CommandComment(CustomCog):
@@ -34,15 +34,15 @@ class CommandComment(CustomCog):
             f"&&comment={title}&&avatar={interaction.user_avatar_url}"
         )
 
-        response: Optional[ClientResponse] = await self.bot.session.send_api_request(
+        content: Optional[bytes] = await self.bot.session.send_cached_request(
             interaction=interaction,
             url=api_url,
-            method="GET",
         )
 
-        if not response:
+        if content is None:
             return
-        data = BytesIO(await response.read())
+
+        data = BytesIO(content)
 
         await interaction.send(file=File(data, "comment.png"))
 
@@ -8,10 +8,17 @@ from utilities import CustomCog, CustomInteraction
 
 if TYPE_CHECKING:
     from bot import Smiffy
-    from utilities import ClientResponse, Optional
+    from utilities import Optional
 
 
 class CommandDog(CustomCog):
+    api_url: str = "https://some-random-api.com/animal/dog"
+
+    def __init__(self, bot: Smiffy) -> None:
+        super().__init__(bot=bot)
+
+        bot.image_pool.register(self.api_url)
+
     @slash_command(
         name="pies",
         description="Wysyła obrazek z randomowym pieskiem :)",
@@ -20,17 +27,11 @@ class CommandDog(CustomCog):
     async def dog(self, interaction: CustomInteraction):
         await interaction.response.defer()
 
-        response: Optional[ClientResponse] = await self.bot.session.send_api_request(
-            interaction=interaction,
-            url="https://some-random-api.com/animal/dog",
-            method="GET",
-        )
+        data: Optional[dict] = await self.bot.image_pool.get(interaction, self.api_url)
 
-        if not response:
+        if not data:
             return
 
-        data = await response.json()
-
         embed = Embed(
             title="Oto Twój piesek.",
             timestamp=utils.utcnow(),
@@ -9,7 +9,7 @@ from utilities import CustomCog, CustomInteraction
 
 if TYPE_CHECKING:
     from bot import Smiffy
-    from utilities import ClientResponse, Optional
+    from utilities import Optional
 
 
 class CommandDidYouMean(CustomCog):
@@ -38,16 +38,15 @@ class CommandDidYouMean(CustomCog):
 
         api_url: str = f"https://api.alexflipnote.dev/didyoumean?top={text}&bottom={second_text}"
 
-        response: Optional[ClientResponse] = await self.bot.session.send_api_request(
+        content: Optional[bytes] = await self.bot.session.send_cached_request(
             interaction=interaction,
             url=api_url,
-            method="GET",
         )
 
-        if not response:
+        if content is None:
             return
 
-        data: BytesIO = BytesIO(await response.read())
+        data: BytesIO = BytesIO(content)
 
         await interaction.send(file=File(data, "didyoumean.png"))
 
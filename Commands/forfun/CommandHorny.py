@@ -9,7 +9,7 @@ from utilities import CustomCog, CustomInteraction
 
 if TYPE_CHECKING:
     from bot import Smiffy
-    from utilities import ClientResponse, Optional
+    from utilities import Optional
 
 
 class CommandHorny(CustomCog):
@@ -33,15 +33,14 @@ class CommandHorny(CustomCog):
             f"avatar={interaction.avatars.get_user_avatar(member)}"
         )
 
-        response: Optional[ClientResponse] = await self.bot.session.send_api_request(
+        content: Optional[bytes] = await self.bot.session.send_cached_request(
             interaction=interaction,
             url=api_url,
-            method="GET",
         )
-        if not response:
+        if content is None:
             return
 
-        data = BytesIO(await response.read())
+        data = BytesIO(content)
 
         await interaction.send(file=File(data, "horny.png"))
 
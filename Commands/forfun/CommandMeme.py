@@ -8,10 +8,17 @@ from utilities import CustomCog, CustomInteraction
 
 if TYPE_CHECKING:
     from bot import Smiffy
-    from utilities import ClientResponse, Optional
+    from utilities import Optional
 
 
 class CommandMeme(CustomCog):
+    api_url: str = "https://ivall.pl/memy"
+
+    def __init__(self, bot: Smiffy) -> None:
+        super().__init__(bot=bot)
+
+        bot.image_pool.register(self.api_url)
+
     @slash_command(
         name="mem",
         description="Wysyła randomowego mema.",
@@ -20,16 +27,11 @@ class CommandMeme(CustomCog):
     async def meme(self, interaction: CustomInteraction):
         await interaction.response.defer()
 
-        response: Optional[ClientResponse] = await self.bot.session.send_api_request(
-            interaction=interaction,
-            url="https://ivall.pl/memy",
-            method="GET",
-        )
+        meme_data: Optional[dict] = await self.bot.image_pool.get(interaction, self.api_url)
 
-        if not response:
+        if not meme_data:
             return
 
-        meme_data: dict = await response.json()
         meme_link = meme_data["url"]
         embed = Embed(
             title="Oto twój mem!",
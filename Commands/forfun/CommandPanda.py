@@ -8,10 +8,17 @@ from utilities import CustomCog, CustomInteraction
 
 if TYPE_CHECKING:
     from bot import Smiffy
-    from utilities import ClientResponse, Optional
+    from utilities import Optional
 
 
 class CommandPanda(CustomCog):
+    api_url: str = "https://some-random-api.com/img/panda"
+
+    def __init__(self, bot: Smiffy) -> None:
+        super().__init__(bot=bot)
+
+        bot.image_pool.register(self.api_url)
+
     @slash_command(
         name="panda",
         description="Wysyła obrazek z losową pandą :)",
@@ -20,16 +27,10 @@ class CommandPanda(CustomCog):
     async def panda(self, interaction: CustomInteraction):
         await interaction.response.defer()
 
-        response: Optional[ClientResponse] = await self.bot.session.send_api_request(
-            interaction=interaction,
-            url="https://some-random-api.com/img/panda",
-            method="GET",
-        )
-        if not response:
+        data: Optional[dict] = await self.bot.image_pool.get(interaction, self.api_url)
+        if not data:
             return
 
-        data: dict = await response.json()
-
         embed = Embed(
             title="Oto Twoja panda.",
             timestamp=utils.utcnow(),
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from ast import literal_eval
 from datetime import timedelta
+from functools import partial
 from typing import TYPE_CHECKING, Optional, Union
 
 from mafic import Playlist, SearchType, __version__, errors
@@ -159,6 +160,7 @@ class SelectMusic(ui.Select):
                 "INSERT INTO music_users(user_id, favorite_songs) VALUES(?,?)",
                 (interaction.user.id, str(data)),
             )
+            bot.autocomplete.invalidate("favorite_songs", interaction.user.id)
 
             await interaction.send_success_message(
                 title=f"Pomyślnie dodano {Emojis.GREENBUTTON.value}",
@@ -193,6 +195,7 @@ class SelectMusic(ui.Select):
                 "UPDATE music_users SET favorite_songs = ? WHERE user_id = ?",
                 (str(data), interaction.user.id),
             )
+            bot.autocomplete.invalidate("favorite_songs", interaction.user.id)
 
 
 class SelectMusicView(ui.View):
@@ -429,6 +432,7 @@ class CommandFavoriteSongs(CustomCog):
                         interaction.user.id,
                     ),
                 )
+                self.bot.autocomplete.invalidate("favorite_songs", interaction.user.id)
                 return
 
         return await interaction.send_error_message(
@@ -444,27 +448,25 @@ class CommandFavoriteSongs(CustomCog):
     ) -> Optional[list[str]]:
         assert isinstance(interaction.user, Member)
 
+        songs_titles: list[str] = await self.bot.autocomplete.search_labels(
+            "favorite_songs",
+            interaction.user.id,
+            query,
+            partial(self.get_songs_titles, interaction.user.id),
+        )
+        return songs_titles or None
+
+    async def get_songs_titles(self, user_id: int) -> list[tuple[str, str]]:
         response: Optional[DB_RESPONSE] = await self.bot.db.execute_fetchone(
             "SELECT favorite_songs FROM music_users WHERE user_id = ?",
-            (interaction.user.id,),
+            (user_id,),
         )
 
         if not response:
-            return None
+            return []
 
         songs_data: list[dict[str, str]] = literal_eval(response[0])
-        if len(songs_data) == 0:
-            return None
-
-        songs_titles: list[str] = []
-        for song in songs_data:
-            songs_titles.append(song["title"])
-
-        if not query:
-            return songs_titles
-
-        get_near_song: list = [title for title in songs_titles if title.lower().startswith(query.lower())]
-        return get_near_song
+        return [(song["title"], song["title"]) for song in songs_data]
 
     @music_favorite_songs.subcommand(
         name="dodaj",
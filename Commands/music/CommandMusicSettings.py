@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from nextcord import ButtonStyle, Color, Embed, Member, SlashOption, ui, utils
 
@@ -11,7 +11,7 @@ from .__main__ import MusicCog
 
 if TYPE_CHECKING:
     from bot import Smiffy
-    from utilities import DB_RESPONSE, Optional
+    from utilities import DB_RESPONSE
 
 
 class NotifyStatusView(ui.View):
@@ -73,6 +73,8 @@ class NotifyStatusView(ui.View):
                 (None, interaction.guild.id),
             )
 
+        bot.music_settings.invalidate(interaction.guild.id)
+
         await interaction.send_success_message(
             title=f"Pomyślnie zaktualizowano {Emojis.GREENBUTTON.value}",
             description=f"{Emojis.REPLY.value} Pomyślnie włączono powiadomienia.",
@@ -116,6 +118,8 @@ class NotifyStatusView(ui.View):
                 ("off", interaction.guild.id),
             )
 
+        bot.music_settings.invalidate(interaction.guild.id)
+
         await interaction.send_success_message(
             title=f"Pomyślnie zaktualizowano {Emojis.GREENBUTTON.value}",
             description=f"{Emojis.REPLY.value} Pomyślnie wyłączono powiadomienia.",
@@ -195,6 +199,8 @@ class SelectView(ui.View):
                 (data, interaction.guild.id),
             )
 
+        bot.music_settings.invalidate(interaction.guild.id)
+
         if interaction.message:
             await interaction.message.delete()
 
@@ -219,10 +225,53 @@ class CommandMusicSettings(CustomCog):
             choices={
                 "Uprawnienia komend": "permissions",
                 "Powiadomienia": "alerts",
+                "Czas bezczynności": "idle_timeout",
             },
         ),
+        idle_timeout: Optional[int] = SlashOption(
+            name="sekundy",
+            description="Po ilu sekundach samotności bot ma opuścić kanał (opcja: Czas bezczynności)",
+            min_value=30,
+            max_value=3600,
+            required=False,
+        ),
     ):
-        assert isinstance(interaction.user, Member)
+        assert isinstance(interaction.user, Member) and interaction.guild
+
+        if option == "idle_timeout":
+            if not idle_timeout:
+                return await interaction.send_error_message(
+                    description="Podaj czas w sekundach, po którym bot ma opuścić pusty kanał.",
+                )
+
+            response: Optional[DB_RESPONSE] = await self.bot.db.execute_fetchone(
+                "SELECT * FROM music_settings WHERE guild_id = ?",
+                (interaction.guild.id,),
+            )
+
+            if not response:
+                await self.bot.db.execute_fetchone(
+                    "INSERT INTO music_settings(guild_id, permission_roles, notify, idle_timeout) "
+                    "VALUES(?,?,?,?)",
+                    (
+                        interaction.guild.id,
+                        None,
+                        None,
+                        idle_timeout,
+                    ),
+                )
+            else:
+                await self.bot.db.execute_fetchone(
+                    "UPDATE music_settings SET idle_timeout = ? WHERE guild_id = ?",
+                    (idle_timeout, interaction.guild.id),
+                )
+
+            self.bot.music_settings.invalidate(interaction.guild.id)
+
+            return await interaction.send_success_message(
+                title=f"Pomyślnie zaktualizowano {Emojis.GREENBUTTON.value}",
+                description=f"{Emojis.REPLY.value} Bot opuści pusty kanał po: `{idle_timeout}s`",
+            )
 
         if option == "permissions":
             embed = Embed(
@@ -549,14 +549,7 @@ class MusicManagerView(ui.View):
 
 class CommandPlay(CustomCog):
     async def alerts_enabled(self, guild: Guild) -> bool:
-        response: Optional[DB_RESPONSE] = await self.bot.db.execute_fetchone(
-            "SELECT notify FROM music_settings WHERE guild_id = ?",
-            (guild.id,),
-        )
-        if not response or not response[0]:
-            return True
-
-        return False
+        return (await self.bot.music_settings.get(guild.id))["notify"]
 
     @MusicCog.main.subcommand(  # pylint: disable=no-member  # pyright: ignore
         name="play",
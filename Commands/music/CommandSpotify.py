@@ -18,7 +18,7 @@ from nextcord import (
 )
 
 from enums import Emojis
-from errors import MissingSpotifyData
+from errors import HostUnavailable, MissingSpotifyData
 from utilities import CustomCog, CustomInteraction, PermissionHandler, bot_utils
 
 from .__main__ import MusicCog, MusicPlayer
@@ -71,7 +71,6 @@ class SelectPlaylist(ui.Select):
 
     async def get_tracks_links(
         self,
-        bot: Smiffy,
         playlist_id: str,
         inter: CustomInteraction,
     ) -> list[str]:
@@ -79,11 +78,15 @@ class SelectPlaylist(ui.Select):
 
         headers: dict[str, str] = {"Authorization": f"Bearer {self.cog.authorization_token}"}
 
-        response: ClientResponse = await bot.session.get(
-            url=f"https://api.spotify.com/v1/playlists/{playlist_id}/tracks",
-            headers=headers,
+        response: Optional[ClientResponse] = await self.cog.get_api_response(
+            inter,
+            f"https://api.spotify.com/v1/playlists/{playlist_id}/tracks",
+            headers,
         )
 
+        if not response:
+            return []
+
         if response.status == 429:
             await self.cog.handle_ratelimit(inter, response)
             return []
@@ -125,7 +128,6 @@ class SelectPlaylist(ui.Select):
         bot: Smiffy = interaction.bot
 
         tracks_links: list[str] = await self.get_tracks_links(
-            bot=bot,
             playlist_id=playlist_id,
             inter=interaction,
         )
@@ -336,6 +338,20 @@ class CommandSpotify(CustomCog):
             "Spróbuj ponownie później.",
         )
 
+    async def get_api_response(
+        self,
+        inter: CustomInteraction,
+        url: str,
+        headers: dict[str, str],
+    ) -> Optional[ClientResponse]:
+        try:
+            return await self.bot.session.get(url=url, headers=headers)
+        except HostUnavailable:
+            await inter.send_error_message(
+                description="Spotify jest chwilowo niedostępne. Spróbuj ponownie później.",
+            )
+            return None
+
     async def get_access_token(self):
         await self.bot.wait_until_ready()
 
@@ -357,11 +373,16 @@ class CommandSpotify(CustomCog):
                 "client_secret": secret,
             }
 
-            response: ClientResponse = await self.bot.session.post(
-                url=url,
-                data=data,
-                headers=headers,
-            )
+            try:
+                response: ClientResponse = await self.bot.session.post(
+                    url=url,
+                    data=data,
+                    headers=headers,
+                )
+            except HostUnavailable:
+                self.bot.logger.error("Connection to Spotify API failed. Spotify is temporarily unavailable.")
+                return None
+
             if response.status != 200:
                 self.bot.logger.error("Connection to Spotify API failed. Invalid parameters.")
                 return None
@@ -380,7 +401,7 @@ class CommandSpotify(CustomCog):
 
                 app_data = await get_app_data(client_secret, client_id)
 
-                self.bot.logger.debug(f"Spotify API response has been received: {app_data}")
+                self.bot.logger.debug("Spotify API response has been received: %s", app_data)
 
                 if not app_data:
                     self.bot.logger.error("Spotify API connection has been terminated.")
@@ -419,7 +440,10 @@ class CommandSpotify(CustomCog):
         url: str = f"https://api.spotify.com/v1/users/{account_id}/playlists?limit=25"
         headers: dict[str, str] = {"Authorization": f"Bearer {self.authorization_token}"}
 
-        response: ClientResponse = await self.bot.session.get(url=url, headers=headers)
+        response: Optional[ClientResponse] = await self.get_api_response(interaction, url, headers)
+
+        if not response:
+            return
 
         if response.status == 429:
             await self.handle_ratelimit(interaction, response)
@@ -518,7 +542,10 @@ class CommandSpotify(CustomCog):
         url: str = f"https://api.spotify.com/v1/users/{account_id}"
         headers: dict[str, str] = {"Authorization": f"Bearer {self.authorization_token}"}
 
-        response: ClientResponse = await self.bot.session.get(url=url, headers=headers)
+        response: Optional[ClientResponse] = await self.get_api_response(interaction, url, headers)
+
+        if not response:
+            return
 
         if response.status == 429:
             await self.handle_ratelimit(interaction, response)
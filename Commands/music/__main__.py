@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from asyncio import sleep
+from asyncio import Task, sleep
 from datetime import timedelta
-from typing import TYPE_CHECKING, Optional, Type
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional, Type
 
 from aiohttp import client_exceptions
 from mafic import NodePool, Player, Strategy, TrackEndEvent, VoiceRegion, __version__
@@ -16,8 +16,6 @@ if TYPE_CHECKING:
     from mafic import Node, Track
     from nextcord.abc import Connectable, GuildChannel
 
-    from typings import DB_RESPONSE
-
 
 class MusicPlayer(Player[Smiffy]):
     def __init__(self, bot: Smiffy, channel: Connectable):
@@ -27,6 +25,7 @@ class MusicPlayer(Player[Smiffy]):
         self.loop: bool = False
         self.channel_last_command: Optional[GuildChannel] = None
         self.queue: list[Track] = []
+        self.idle_timer: Optional[Task] = None
 
         @bot.listen()
         async def on_track_end(
@@ -49,14 +48,49 @@ class MusicPlayer(Player[Smiffy]):
                     )
 
     async def get_notify_status(self, guild: Guild) -> bool:
-        response: Optional[DB_RESPONSE] = await self.bot.db.execute_fetchone(
-            "SELECT notify FROM music_settings WHERE guild_id = ?",
-            (guild.id,),
-        )
-        if not response or not response[0]:
-            return True
+        return (await self.bot.music_settings.get(guild.id))["notify"]
+
+    def start_idle_timer(
+        self,
+        timeout: int,
+        callback: Callable[[MusicPlayer], Awaitable[None]],
+    ) -> None:
+        """
+        The start_idle_timer function schedules the callback after the given timeout.
+        If the timer is already running, it is left untouched, so there is only one timer per player.
+
+        :param timeout: Seconds after which the callback is called
+        :param callback: Coroutine function called with the player
+        :return: None
+        """
+
+        if self.idle_timer and not self.idle_timer.done():
+            return
+
+        async def idle_runner() -> None:
+            await sleep(timeout)
+
+            self.idle_timer = None
+            await callback(self)
+
+        self.idle_timer = self.bot.loop.create_task(idle_runner())
+
+    def cancel_idle_timer(self) -> None:
+        """
+        The cancel_idle_timer function cancels the idle timer of the player if it is running.
+
+        :return: None
+        """
+
+        if self.idle_timer and not self.idle_timer.done():
+            self.idle_timer.cancel()
+
+        self.idle_timer = None
+
+    async def disconnect(self, *, force: bool = False) -> None:
+        self.cancel_idle_timer()
 
-        return False
+        await super().disconnect(force=force)
 
     async def send_playing_song_notify(
         self,
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from functools import partial
 from io import BytesIO
 from typing import TYPE_CHECKING, Iterable, Optional
 
@@ -86,6 +87,7 @@ class ReplyAnswerModal(ui.Modal):
                 image_bytes,
             ),
         )
+        bot.autocomplete.invalidate("autoresponder", interaction.guild.id)
 
         description: str = (
             f"`✏️` **Słowo**\n{Emojis.REPLY.value} {self.text.replace('`', '')}\n\n"
@@ -185,6 +187,7 @@ class CommandAutoResponder(CustomCog):
                 message_content.lower(),
             ),
         )
+        self.bot.autocomplete.invalidate("autoresponder", interaction.guild.id)
 
         return await interaction.send_success_message(
             title=f"Pomyślnie usunięto AutoResponder {Emojis.GREENBUTTON.value}",
@@ -192,6 +195,14 @@ class CommandAutoResponder(CustomCog):
             description=f"{Emojis.REPLY.value} **Slowo:** `{message_content.replace('`', '')}`",
         )
 
+    async def get_messages_content(self, guild_id: int) -> list[tuple[str, str]]:
+        response: Iterable[DB_RESPONSE] = await self.bot.db.execute_fetchall(
+            "SELECT message_content FROM autoresponder WHERE guild_id = ?",
+            (guild_id,),
+        )
+
+        return [(data[0], data[0]) for data in response]
+
     @autoresponder_remove.on_autocomplete("message_content")
     async def autoresponder_remove_autocomplete(
         self,
@@ -200,19 +211,13 @@ class CommandAutoResponder(CustomCog):
     ) -> Optional[list[str]]:
         assert interaction.guild
 
-        response: Iterable[DB_RESPONSE] = await self.bot.db.execute_fetchall(
-            "SELECT * FROM autoresponder WHERE guild_id = ?",
-            (interaction.guild.id,),
+        list_of_messages: list[str] = await self.bot.autocomplete.search_labels(
+            "autoresponder",
+            interaction.guild.id,
+            query,
+            partial(self.get_messages_content, interaction.guild.id),
         )
-        list_of_messages: list[str] = [message_data[1] for message_data in response]
-
-        if not query:
-            return list_of_messages[0:25]
-
-        get_near_message: list = [
-            message for message in list_of_messages if message.lower().startswith(query.lower())
-        ][0:25]
-        return get_near_message
+        return list_of_messages
 
     @autoresponder.subcommand(
         name="info",
@@ -289,19 +294,13 @@ class CommandAutoResponder(CustomCog):
     ) -> Optional[list[str]]:
         assert interaction.guild
 
-        response: Iterable[DB_RESPONSE] = await self.bot.db.execute_fetchall(
-            "SELECT * FROM autoresponder WHERE guild_id = ?",
-            (interaction.guild.id,),
+        list_of_messages: list[str] = await self.bot.autocomplete.search_labels(
+            "autoresponder",
+            interaction.guild.id,
+            query,
+            partial(self.get_messages_content, interaction.guild.id),
         )
-        list_of_messages: list[str] = [message_data[1] for message_data in response]
-
-        if not query:
-            return list_of_messages[0:25]
-
-        get_near_message: list = [
-            message for message in list_of_messages if message.lower().startswith(query.lower())
-        ][0:25]
-        return get_near_message
+        return list_of_messages
 
 
 def setup(bot: Smiffy):
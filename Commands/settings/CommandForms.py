@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from ast import literal_eval
+from functools import partial
 from typing import TYPE_CHECKING, Iterable, Optional
 
 from nextcord import (
@@ -469,6 +470,7 @@ class CommandForms(CustomCog):
                 str(questions),
             ),
         )
+        self.bot.autocomplete.invalidate("forms", interaction.guild.id)
 
         await interaction.send_success_message(
             title=f"Pomyślnie utworzono formularz {Emojis.GREENBUTTON.value}",
@@ -511,6 +513,7 @@ class CommandForms(CustomCog):
             "DELETE FROM forms WHERE guild_id = ? AND form_id = ?",
             (interaction.guild.id, form_name),
         )
+        self.bot.autocomplete.invalidate("forms", interaction.guild.id)
 
         return await interaction.send_success_message(
             title=f"Pomyślnie usunięto formularz {Emojis.GREENBUTTON.value}",
@@ -526,23 +529,21 @@ class CommandForms(CustomCog):
     ) -> Optional[list[str]]:
         assert interaction.guild
 
-        response: Iterable[DB_RESPONSE] = await self.bot.db.execute_fetchall(
-            "SELECT * FROM forms WHERE guild_id = ?",
-            (interaction.guild.id,),
+        forms: list[str] = await self.bot.autocomplete.search_labels(
+            "forms",
+            interaction.guild.id,
+            query,
+            partial(self.get_form_names, interaction.guild.id),
         )
+        return forms or None
 
-        if not response:
-            return
-
-        forms: list[str] = [db_data[1] for db_data in response]
-        if not query:
-            return forms[0:25]
-
-        get_near_message: list[str] = [
-            form_name for form_name in forms if form_name.lower().startswith(query.lower())
-        ]
+    async def get_form_names(self, guild_id: int) -> list[tuple[str, str]]:
+        response: Iterable[DB_RESPONSE] = await self.bot.db.execute_fetchall(
+            "SELECT form_id FROM forms WHERE guild_id = ?",
+            (guild_id,),
+        )
 
-        return get_near_message[0:25]
+        return [(data[0], data[0]) for data in response]
 
 
 def setup(bot: Smiffy):
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from ast import literal_eval
 from asyncio import exceptions
 from itertools import islice
 from time import mktime
@@ -81,6 +80,8 @@ class CommandInvites(CustomCog):
             ),
         )
 
+        self.bot.invite_tracker.forget(interaction.guild.id)
+
         await interaction.send_success_message(
             title="Pomyślnie włączono",
             description=f"{Emojis.REPLY.value} System zaproszeń został włączony.",
@@ -107,6 +108,8 @@ class CommandInvites(CustomCog):
             (interaction.guild.id,),
         )
 
+        self.bot.invite_tracker.forget(interaction.guild.id)
+
         await interaction.send_success_message(
             title="Pomyślnie wyłączono",
             description=f"{Emojis.REPLY.value} System zaproszeń został wyłączony.",
@@ -636,26 +639,13 @@ class CommandInvites(CustomCog):
                 description="System zaproszeń na serwerze jest wyłączony."
             )
 
-        users: Iterable[DB_RESPONSE] = await self.bot.db.execute_fetchall(
-            "SELECT * FROM user_invites WHERE guild_id = ?",
-            (interaction.guild.id,),
-        )
-
         inviter: Optional[Member] = None
+        inviter_id: Optional[int] = await self.bot.invite_tracker.get_inviter_id(
+            interaction.guild.id, member.id
+        )
 
-        for user_data in users:
-            invited: str = user_data[6]
-
-            if invited != "[]":
-                invited_users: list[int] = literal_eval(invited)
-
-                if member.id in invited_users:
-                    inviter_id: int = user_data[1]
-
-                    inviter = await self.bot.getch_member(
-                        interaction.guild,
-                        inviter_id,
-                    )
+        if inviter_id:
+            inviter = await self.bot.getch_member(interaction.guild, inviter_id)
 
         if not inviter:
             return await interaction.send_error_message(
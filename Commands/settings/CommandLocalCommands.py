@@ -1,5 +1,7 @@
-from asyncio import sleep
+from asyncio import Semaphore, gather
+from functools import partial
 from string import punctuation
+from typing import TYPE_CHECKING
 
 from nextcord import (
     Color,
@@ -8,6 +10,7 @@ from nextcord import (
     SlashApplicationCommand,
     SlashOption,
     TextInputStyle,
+    errors,
     slash_command,
     ui,
     utils,
@@ -22,8 +25,57 @@ from utilities import (
     Iterable,
     Optional,
     PermissionHandler,
+    TokenBucket,
 )
 
+if TYPE_CHECKING:
+    from nextcord import BaseApplicationCommand
+
+
+async def sync_guild_commands(bot: Smiffy, guild: Guild) -> bool:
+    """
+    The sync_guild_commands function registers the local commands of the guild with a single bulk overwrite request.
+    The overwrite is skipped if the commands registered on Discord are already the same.
+
+    :param bot: Bot object used to send the requests
+    :param guild: Guild to sync
+    :return: True if the commands were overwritten, False if they were up to date
+    """
+
+    assert bot.application_id
+
+    local_commands: list[BaseApplicationCommand] = guild.get_application_commands(rollout=True)
+    registered: list[dict] = await bot.http.get_guild_commands(
+        bot.application_id, guild.id
+    )  # pyright: ignore
+
+    registered_by_name: dict[str, dict] = {data["name"]: data for data in registered}
+    up_to_date: bool = len(registered) == len(local_commands) and all(
+        command.name in registered_by_name
+        and command.is_payload_valid(registered_by_name[command.name], guild.id)  # pyright: ignore
+        for command in local_commands
+    )
+
+    if not up_to_date:
+        registered = await bot.http.bulk_upsert_guild_commands(  # pyright: ignore
+            bot.application_id,
+            guild.id,
+            [command.get_payload(guild.id) for command in local_commands],  # pyright: ignore
+        )
+
+    commands_by_name: dict[str, BaseApplicationCommand] = {
+        command.name: command for command in local_commands
+    }
+
+    for data in registered:
+        command: Optional[BaseApplicationCommand] = commands_by_name.get(data["name"])
+
+        if command:
+            command.parse_discord_response(bot._connection, data)  # pylint: disable=protected-access
+            guild.add_application_command(command, overwrite=True, use_rollout=True)
+
+    return not up_to_date
+
 
 class ReplyTextModal(ui.Modal):
     def __init__(
@@ -65,7 +117,7 @@ class ReplyTextModal(ui.Modal):
 
         await command.setup()
 
-        await interaction.guild.sync_application_commands()
+        await sync_guild_commands(interaction.bot, interaction.guild)
 
         try:
             command_mention: str = command.get_mention(guild=interaction.guild)
@@ -107,6 +159,9 @@ class SlashCommand(SlashApplicationCommand):
     async def _callback(self, interaction: CustomInteraction):
         return await interaction.send(self.reply_text)
 
+    def register(self) -> None:
+        self.guild.add_application_command(self, overwrite=True, use_rollout=True)
+
     async def setup(self):
         response: Optional[DB_RESPONSE] = await self.bot.db.execute_fetchone(
             "SELECT * FROM local_commands WHERE guild_id = ? and command_name = ?",
@@ -123,24 +178,31 @@ class SlashCommand(SlashApplicationCommand):
                     self.reply_text,
                 ),
             )
+            self.bot.autocomplete.invalidate("local_commands", self.guild.id)
 
-        self.guild.add_application_command(self, overwrite=True, use_rollout=True)
+        self.register()
 
 
 class CommandLocalCommands(CustomCog):
+    sync_concurrency: int = 4
+    sync_rate: float = 2.0
+
     def __init__(self, bot: Smiffy):
         super().__init__(bot=bot)
 
-        self.bot.loop.create_task(self.load_local_commands())
+        self.bot.add_startup_task(self.load_local_commands)
 
     async def load_local_commands(self):
         commands: Iterable[DB_RESPONSE] = await self.bot.db.execute_fetchall("SELECT * FROM local_commands")
 
-        command_objects: list[SlashCommand] = []
-        guilds_to_sync: list[Guild] = []
+        guilds_commands: dict[int, list[DB_RESPONSE]] = {}
 
         for command_data in commands:
-            guild_id: int = command_data[0]
+            guilds_commands.setdefault(command_data[0], []).append(command_data)
+
+        guilds_to_sync: list[Guild] = []
+
+        for guild_id, guild_commands in guilds_commands.items():
             guild: Optional[Guild] = await self.bot.getch_guild(guild_id)
 
             if not guild:
@@ -150,30 +212,41 @@ class CommandLocalCommands(CustomCog):
                 )
                 continue
 
-            name: str = command_data[1]
-            description: str = command_data[2]
-            reply_text: str = command_data[3]
-
-            command_objects.append(
+            for command_data in guild_commands:
                 SlashCommand(
-                    name=name,
-                    description=description,
-                    reply_text=reply_text,
+                    name=command_data[1],
+                    description=command_data[2],
+                    reply_text=command_data[3],
                     bot=self.bot,
                     guild=guild,
-                )
-            )
+                ).register()
 
-            if guild not in guilds_to_sync:
-                guilds_to_sync.append(guild)
+            guilds_to_sync.append(guild)
 
-        for command in command_objects:
-            await command.setup()
-            await sleep(1.5)
+        semaphore: Semaphore = Semaphore(self.sync_concurrency)
+        limiter: TokenBucket = TokenBucket(rate=self.sync_rate, capacity=self.sync_concurrency)
 
-        for guild_to_sync in guilds_to_sync:
-            await guild_to_sync.sync_application_commands()
-            await sleep(1.5)
+        async def sync_guild(guild_to_sync: Guild) -> bool:
+            async with semaphore:
+                await limiter.acquire()
+
+                try:
+                    return await sync_guild_commands(self.bot, guild_to_sync)
+                except (errors.Forbidden, errors.HTTPException) as error:
+                    self.bot.logger.warning(
+                        "Local commands of the guild: %s could not be synced (%s).",
+                        guild_to_sync.id,
+                        error,
+                    )
+                    return False
+
+        results: list[bool] = await gather(*(sync_guild(guild) for guild in guilds_to_sync))
+
+        self.bot.logger.info(
+            "Local commands loaded for %s guilds, %s of them were updated.",
+            len(guilds_to_sync),
+            sum(results),
+        )
 
     @slash_command("lokalnekomendy", dm_permission=False)
     async def local_commands(self, interaction: CustomInteraction) -> None:
@@ -269,7 +342,8 @@ class CommandLocalCommands(CustomCog):
             if cmd.name == command_name:
                 await interaction.guild.delete_application_commands(cmd)
 
-                await self.bot.sync_application_commands()
+                # Otherwise the next bulk overwrite would register the command again.
+                self.bot._connection.remove_application_command(cmd)  # pylint: disable=protected-access
 
                 await self.bot.db.execute_fetchone(
                     "DELETE FROM local_commands WHERE guild_id = ? AND command_name = ?",
@@ -278,6 +352,7 @@ class CommandLocalCommands(CustomCog):
                         command_name,
                     ),
                 )
+                self.bot.autocomplete.invalidate("local_commands", interaction.guild.id)
 
                 return await interaction.send_success_message(
                     title=f"Pomyślnie usunieto {Emojis.GREENBUTTON.value}",
@@ -295,19 +370,21 @@ class CommandLocalCommands(CustomCog):
     ) -> Optional[list[str]]:
         assert interaction.guild
 
+        command_names: list[str] = await self.bot.autocomplete.search_labels(
+            "local_commands",
+            interaction.guild.id,
+            search,
+            partial(self.get_command_names, interaction.guild.id),
+        )
+        return command_names
+
+    async def get_command_names(self, guild_id: int) -> list[tuple[str, str]]:
         response: Iterable[DB_RESPONSE] = await self.bot.db.execute_fetchall(
             "SELECT command_name FROM local_commands WHERE guild_id = ?",
-            (interaction.guild.id,),
+            (guild_id,),
         )
-        command_names: list[str] = [data[0] for data in response]
-
-        if not search:
-            return command_names
 
-        get_near_command: list[str] = [
-            command for command in command_names if command.lower().startswith(search.lower())
-        ]
-        return get_near_command
+        return [(data[0], data[0]) for data in response]
 
     @local_commands.subcommand(
         name="lista",
@@ -53,6 +53,8 @@ class CommandLogs(CustomCog):
                 ),
             )
 
+        self.bot.log_sink.invalidate(interaction.guild.id)
+
         return await interaction.send_success_message(
             title=f"Pomyślnie zaktualizowano {Emojis.GREENBUTTON.value}",
             description=f"{Emojis.REPLY.value} Kanał: {channel.mention} został ustawiony jako logi serwera.",
@@ -79,6 +81,7 @@ class CommandLogs(CustomCog):
             "DELETE FROM server_logs WHERE guild_id = ?",
             (interaction.guild.id,),
         )
+        self.bot.log_sink.invalidate(interaction.guild.id)
 
         await interaction.send_success_message(
             title=f"Pomyślnie zaktualizowano {Emojis.GREENBUTTON.value}",
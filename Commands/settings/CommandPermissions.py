@@ -104,6 +104,8 @@ class CommandPermissions(CustomCog):
                 ),
             )
 
+        self.bot.command_permissions.invalidate(interaction.guild.id)
+
         return await interaction.send_success_message(
             title=f"Pomyślnie zaktualizowano uprawnienia {Emojis.GREENBUTTON.value}",
             color=Color.dark_theme(),
@@ -161,6 +163,7 @@ class CommandPermissions(CustomCog):
                         role.id,
                     ),
                 )
+                self.bot.command_permissions.invalidate(interaction.guild.id)
 
                 command_mention: str = interaction.get_command_mention(command_name=command)
 
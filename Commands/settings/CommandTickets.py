@@ -3,11 +3,18 @@
 from __future__ import annotations
 
 from ast import literal_eval
-from asyncio import sleep
-from io import BytesIO
-from typing import TYPE_CHECKING, Iterable, Optional
-
-from chat_exporter import export, link
+from asyncio import get_running_loop, sleep
+from functools import partial
+from gzip import GzipFile
+from shutil import copyfileobj
+from tempfile import SpooledTemporaryFile
+from typing import IO, TYPE_CHECKING, Any, Callable, Iterable, Optional
+
+from chat_exporter import link
+from chat_exporter.construct.assets.component import Component
+from chat_exporter.construct.message import MessageConstruct
+from chat_exporter.construct.transcript import TranscriptDAO
+from chat_exporter.ext.cache import clear_cache
 from nextcord import (
     AllowedMentions,
     ButtonStyle,
@@ -66,6 +73,210 @@ class SelectCloseRole(ui.RoleSelect):
                 )
 
 
+class TicketTranscript:
+    chunk_size: int = 100
+    spool_size: int = 1024 * 1024
+
+    default_max_messages: int = 5000
+    default_max_bytes: int = 8 * 1024 * 1024
+
+    timezone: str = "UTC"
+    messages_marker: str = "<!--ticket-transcript-messages-->"
+
+    def __init__(
+        self,
+        channel: TextChannel | Thread,
+        max_messages: int,
+        max_bytes: int,
+        compress: bool,
+    ) -> None:
+        """
+        TicketTranscript renders the ticket history into a chat_exporter html file.
+        Messages are rendered in chunks and written incrementally to a spooled temporary file,
+        so the whole transcript is never kept in memory as a single string.
+
+        :param channel: Ticket channel
+        :param max_messages: Maximum amount of the newest messages saved in the transcript
+        :param max_bytes: Maximum size of the (uncompressed) rendered messages
+        :param compress: Whether the transcript should be gzipped
+        :return: None
+        """
+
+        self.channel: TextChannel | Thread = channel
+        self.max_messages: int = max_messages
+        self.max_bytes: int = min(max_bytes, channel.guild.filesize_limit)
+        self.compress: bool = compress
+
+        self.file: IO[bytes] = SpooledTemporaryFile(  # pylint: disable=consider-using-with
+            max_size=self.spool_size
+        )
+        self.writer: IO[bytes] = GzipFile(fileobj=self.file, mode="wb") if compress else self.file
+        self.body: IO[bytes] = SpooledTemporaryFile(  # pylint: disable=consider-using-with
+            max_size=self.spool_size
+        )
+
+        self.body_bytes: int = 0
+        self.messages: int = 0
+        self.truncated: bool = False
+
+    @property
+    def filename(self) -> str:
+        filename: str = f"transcript-{self.channel.id}.html"
+
+        if self.compress:
+            filename += ".gz"
+
+        return filename
+
+    @classmethod
+    async def from_guild_settings(cls, bot: Smiffy, channel: TextChannel | Thread) -> TicketTranscript:
+        response: Optional[DB_RESPONSE] = await bot.db.execute_fetchone(
+            "SELECT max_messages, max_bytes, compress FROM tickets_transcripts WHERE guild_id = ?",
+            (channel.guild.id,),
+        )
+
+        if not response:
+            return cls(channel, cls.default_max_messages, cls.default_max_bytes, False)
+
+        return cls(
+            channel,
+            response[0] or cls.default_max_messages,
+            response[1] or cls.default_max_bytes,
+            bool(response[2]),
+        )
+
+    @staticmethod
+    async def run_in_executor(function: Callable[..., Any], *args: Any) -> Any:
+        # The spooled files roll over to the disk, so file operations are moved out of the event loop.
+        return await get_running_loop().run_in_executor(None, function, *args)
+
+    async def render_messages(self, messages: list[Message]) -> tuple[list[int], dict]:
+        """
+        The render_messages function renders the messages with chat_exporter into the body file.
+
+        :param messages: Messages in chronological order
+        :return: Offset of every message in the body and chat_exporter's participants meta data
+        """
+
+        await self.run_in_executor(self.body.seek, 0)
+        await self.run_in_executor(self.body.truncate)
+        self.body_bytes = 0
+
+        offsets: list[int] = []
+        meta_data: dict = {}
+        message_dict: dict[int, Message] = {message.id: message for message in messages}
+        previous_message: Optional[Message] = None
+
+        for index in range(0, len(messages), self.chunk_size):
+            chunk: list[bytes] = []
+
+            for message in messages[index : index + self.chunk_size]:
+                content_html, meta_data = await MessageConstruct(
+                    message,
+                    previous_message,
+                    self.timezone,
+                    True,
+                    self.channel.guild,
+                    meta_data,
+                    message_dict,
+                ).construct_message()
+                previous_message = message
+
+                rendered: bytes = content_html.encode()
+                offsets.append(self.body_bytes)
+                chunk.append(rendered)
+                self.body_bytes += len(rendered)
+
+            await self.run_in_executor(self.body.write, b"".join(chunk))
+
+        await self.run_in_executor(self.body.write, b"</div>")
+        self.body_bytes += len(b"</div>")
+
+        return offsets, meta_data
+
+    async def export(self) -> File:
+        """
+        The export function writes the whole transcript and returns a file ready to upload.
+        The newest messages are kept when the transcript exceeds one of the limits.
+        The returned file streams its content from the spooled temporary file.
+
+        :return: nextcord File object
+        """
+
+        # TranscriptDAO provides chat_exporter's page around the rendered messages.
+        page: TranscriptDAO = TranscriptDAO(
+            channel=self.channel,
+            limit=None,
+            messages=[],
+            pytz_timezone=self.timezone,
+            military_time=True,
+            fancy_times=True,
+            before=None,
+            after=None,
+            support_dev=True,
+            bot=None,
+        )
+
+        try:
+            limit: int = self.max_messages
+
+            while True:
+                # One message over the limit is fetched to know whether the history was cut.
+                messages: list[Message] = [message async for message in self.channel.history(limit=limit + 1)]
+
+                if len(messages) > limit:
+                    self.truncated = True
+                    del messages[limit:]
+
+                messages.reverse()
+                offsets, meta_data = await self.render_messages(messages)
+
+                if self.body_bytes <= self.max_bytes or not messages:
+                    break
+
+                # The oldest messages are dropped until the rest fits. chat_exporter modifies
+                # the rendered messages, so the kept ones are fetched and rendered again.
+                self.truncated = True
+                cut: int = next(
+                    (
+                        index
+                        for index, offset in enumerate(offsets)
+                        if self.body_bytes - offset <= self.max_bytes
+                    ),
+                    len(messages) - 1,
+                )
+                limit = len(messages) - max(cut, 1)
+
+            self.messages = len(messages)
+            page.messages = messages
+            page.limit = self.messages if self.truncated else None
+
+            await page.export_transcript(self.messages_marker, meta_data)
+        finally:
+            clear_cache()
+            Component.menu_div_id = 0
+
+        header, footer = page.html.split(self.messages_marker, 1)
+
+        await self.run_in_executor(self.writer.write, header.encode())
+        await self.run_in_executor(self.body.seek, 0)
+        await self.run_in_executor(copyfileobj, self.body, self.writer)
+        await self.run_in_executor(self.writer.write, footer.encode())
+
+        if self.compress:
+            self.writer.close()
+
+        self.body.close()
+        self.file.seek(0)
+
+        return File(self.file, filename=self.filename)
+
+    def close(self) -> None:
+        self.writer.close()
+        self.body.close()
+        self.file.close()
+
+
 class CloseTicketButtonView(ui.View):
     def __init__(
         self,
@@ -188,27 +399,41 @@ class CloseTicketButtonView(ui.View):
                 )
 
                 if response and response[0]:
-                    transcript: str = await export(interaction.channel)
-                    if transcript:
-                        transcript_file = File(
-                            BytesIO(transcript.encode()),
-                            filename=f"transcript-{interaction.channel.id}.html",
-                        )
-                        channel: Optional[GuildChannel] = await bot.getch_channel(response[0])
+                    channel: Optional[GuildChannel] = await bot.getch_channel(response[0])
 
-                        if not isinstance(channel, TextChannel):
-                            return
+                    if not isinstance(channel, TextChannel):
+                        return
+
+                    transcript: TicketTranscript = await TicketTranscript.from_guild_settings(
+                        bot, interaction.channel
+                    )
 
+                    try:
+                        transcript_file: File = await transcript.export()
                         message_transcript = await channel.send(file=transcript_file)
-                        transcript_link: str = await link(message_transcript)
+                    except errors.HTTPException:
+                        await interaction.message.edit(view=CloseTicketButtonView(disabled=False))
 
-                        embed = Embed(
-                            title=f"Transcript: {ticket_title}",
-                            description=f"> [LINK]({transcript_link})",
-                            color=Color.green(),
+                        return await interaction.send_error_message(
+                            description="Nie udało się wysłać zapisu ticketu, "
+                            "ticket nie został zamknięty. Zmniejsz limity zapisu (`/tickety zapis`)."
                         )
+                    finally:
+                        transcript.close()
+
+                    if transcript.compress:
+                        # Compressed transcripts can't be displayed by the chat_exporter viewer.
+                        transcript_link: str = message_transcript.attachments[0].url
+                    else:
+                        transcript_link: str = await link(message_transcript)
+
+                    embed = Embed(
+                        title=f"Transcript: {ticket_title}",
+                        description=f"> [LINK]({transcript_link})",
+                        color=Color.green(),
+                    )
 
-                        await channel.send(embed=embed)
+                    await channel.send(embed=embed)
 
                 await interaction.channel.delete()
 
@@ -888,6 +1113,7 @@ class ButtonsCloseTicketView(ui.View):
                 transcript_channel,
             ),
         )
+        bot.autocomplete.invalidate("tickets", interaction.guild.id)
 
         await bot.db.execute_fetchone(
             "INSERT INTO tickets_close(guild_id, channel_name, message_title, message_description, "
@@ -1322,6 +1548,62 @@ class CommandTickets(CustomCog):
 
         await interaction.send(embed=embed, view=configure_buttons)
 
+    @tickets.subcommand(  # pyright: ignore
+        name="zapis",
+        description="Ustawia limity zapisu (transcriptu) ticketów.",
+    )
+    @PermissionHandler(manage_guild=True)
+    async def tickets_transcript(
+        self,
+        interaction: CustomInteraction,
+        max_messages: int = SlashOption(
+            name="limit_wiadomości",
+            description="Maksymalna ilość zapisanych wiadomości",
+            min_value=100,
+            max_value=50000,
+        ),
+        max_megabytes: int = SlashOption(
+            name="limit_mb",
+            description="Maksymalny rozmiar zapisu w MB",
+            min_value=1,
+            max_value=25,
+        ),
+        compress: bool = SlashOption(
+            name="kompresja",
+            description="Czy zapis ma zostać skompresowany (.gz)",
+            default=False,
+            required=False,
+        ),
+    ):
+        assert interaction.guild
+
+        await interaction.response.defer()
+
+        response: Optional[DB_RESPONSE] = await self.bot.db.execute_fetchone(
+            "SELECT * FROM tickets_transcripts WHERE guild_id = ?",
+            (interaction.guild.id,),
+        )
+        # Discord rejects files over the server upload limit, so the transcript can't be any bigger.
+        max_bytes: int = min(max_megabytes * 1024 * 1024, interaction.guild.filesize_limit)
+
+        if not response:
+            await self.bot.db.execute_fetchone(
+                "INSERT INTO tickets_transcripts(guild_id, max_messages, max_bytes, compress) VALUES(?,?,?,?)",
+                (interaction.guild.id, max_messages, max_bytes, int(compress)),
+            )
+        else:
+            await self.bot.db.execute_fetchone(
+                "UPDATE tickets_transcripts SET max_messages = ?, max_bytes = ?, compress = ? WHERE guild_id = ?",
+                (max_messages, max_bytes, int(compress), interaction.guild.id),
+            )
+
+        await interaction.send_success_message(
+            title=f"Pomyślnie zaktualizowano {Emojis.GREENBUTTON.value}",
+            description=f"{Emojis.REPLY.value} Limit wiadomości: `{max_messages}`\n"
+            f"{Emojis.REPLY.value} Limit rozmiaru: `{max_bytes // (1024 * 1024)}MB`\n"
+            f"{Emojis.REPLY.value} Kompresja: `{'Tak' if compress else 'Nie'}`",
+        )
+
     @tickets.subcommand(
         name="usuń",
         description="Usuwa system ticketu z serwera.",
@@ -1356,6 +1638,7 @@ class CommandTickets(CustomCog):
             "DELETE FROM tickets WHERE guild_id = ? AND channel_name = ?",
             (interaction.guild.id, channel_name),
         )
+        self.bot.autocomplete.invalidate("tickets", interaction.guild.id)
 
         await self.bot.db.execute_fetchone(
             "DELETE FROM tickets_close WHERE guild_id = ? AND channel_name = ?",
@@ -1367,6 +1650,14 @@ class CommandTickets(CustomCog):
             description=f"{Emojis.REPLY.value} Ticket powiązany z nazwą kanału: `{channel_name}` został usunięty.",
         )
 
+    async def get_channel_names(self, guild_id: int) -> list[tuple[str, str]]:
+        response: Iterable[DB_RESPONSE] = await self.bot.db.execute_fetchall(
+            "SELECT channel_name FROM tickets WHERE guild_id = ?",
+            (guild_id,),
+        )
+
+        return [(data[0], data[0]) for data in response]
+
     @ticket_delete.on_autocomplete("channel_name")
     async def ticket_delete_autocomplete(
         self,
@@ -1375,24 +1666,13 @@ class CommandTickets(CustomCog):
     ):
         assert interaction.guild
 
-        response: Iterable[DB_RESPONSE] = await self.bot.db.execute_fetchall(
-            "SELECT * FROM tickets WHERE guild_id = ?",
-            (interaction.guild.id,),
+        channel_name_data: list[str] = await self.bot.autocomplete.search_labels(
+            "tickets",
+            interaction.guild.id,
+            query,
+            partial(self.get_channel_names, interaction.guild.id),
         )
-        if not response:
-            return
-
-        channel_name_data: list[str] = []
-        for data in response:
-            channel_name_data.append(data[3])
-
-        if not query:
-            return channel_name_data[0:25]
-
-        get_near_channel_name: list[str] = [
-            name for name in channel_name_data if name.lower().startswith(query.lower())
-        ]
-        return get_near_channel_name
+        return channel_name_data or None
 
     @tickets.subcommand(  # pyright: ignore
         name="info",
@@ -1489,24 +1769,13 @@ class CommandTickets(CustomCog):
     ):
         assert interaction.guild
 
-        response: Iterable[DB_RESPONSE] = await self.bot.db.execute_fetchall(
-            "SELECT * FROM tickets WHERE guild_id = ?",
-            (interaction.guild.id,),
+        channel_name_data: list[str] = await self.bot.autocomplete.search_labels(
+            "tickets",
+            interaction.guild.id,
+            query,
+            partial(self.get_channel_names, interaction.guild.id),
         )
-        if not response:
-            return
-
-        channel_name_data: list[str] = []
-        for data in response:
-            channel_name_data.append(data[3])
-
-        if not query:
-            return channel_name_data[0:25]
-
-        get_near_channel_name: list[str] = [
-            name for name in channel_name_data if name.lower().startswith(query.lower())
-        ]
-        return get_near_channel_name
+        return channel_name_data or None
 
 
 def setup(bot: Smiffy):
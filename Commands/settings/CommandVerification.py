@@ -1,7 +1,10 @@
 from __future__ import annotations
 
-from random import choice
-from string import ascii_lowercase
+from asyncio import Task, get_running_loop
+from collections import deque
+from io import BytesIO
+from random import choices
+from string import ascii_lowercase, digits
 from typing import TYPE_CHECKING, Any, Awaitable, Callable, Optional
 
 from captcha.image import ImageCaptcha
@@ -34,6 +37,93 @@ if TYPE_CHECKING:
     from typings import DB_RESPONSE
 
 
+class CaptchaPool:
+    pool_size: int = 20
+
+    # size -> (width, height)
+    sizes: dict[str, tuple[int, int]] = {
+        "small": (240, 80),
+        "normal": (300, 100),
+        "large": (400, 130),
+    }
+    # difficulty -> (code length, characters)
+    difficulties: dict[str, tuple[int, str]] = {
+        "easy": (5, ascii_lowercase),
+        "normal": (8, ascii_lowercase),
+        "hard": (8, ascii_lowercase + digits),
+    }
+
+    def __init__(self) -> None:
+        """
+        CaptchaPool keeps pre-rendered (code, png) pairs for every used size and difficulty.
+        Rendering is done in the executor, so a raid on the verification doesn't block the event loop.
+
+        :return: None
+        """
+
+        self.pools: dict[tuple[str, str], deque[tuple[str, bytes]]] = {}
+        self.refills: dict[tuple[str, str], Task] = {}
+        self.images: dict[tuple[str, str], ImageCaptcha] = {}
+
+    @classmethod
+    def get_profile(cls, size: Optional[str], difficulty: Optional[str]) -> tuple[str, str]:
+        return (
+            size if size in cls.sizes else "normal",
+            difficulty if difficulty in cls.difficulties else "normal",
+        )
+
+    @staticmethod
+    def generate_code(length: int, characters: str) -> str:
+        return "".join(choices(characters, k=length))
+
+    def render(self, profile: tuple[str, str]) -> tuple[str, bytes]:
+        image: Optional[ImageCaptcha] = self.images.get(profile)
+
+        if not image:
+            width, height = self.sizes[profile[0]]
+            image = self.images[profile] = ImageCaptcha(width=width, height=height)
+
+        code: str = self.generate_code(*self.difficulties[profile[1]])
+
+        return code, image.generate(code).getvalue()
+
+    async def refill(self, profile: tuple[str, str] = ("normal", "normal")) -> None:
+        pool: deque[tuple[str, bytes]] = self.pools.setdefault(profile, deque())
+
+        while len(pool) < self.pool_size:
+            pool.append(await get_running_loop().run_in_executor(None, self.render, profile))
+
+    def schedule_refill(self, profile: tuple[str, str]) -> None:
+        task: Optional[Task] = self.refills.get(profile)
+
+        if task and not task.done():
+            return
+
+        self.refills[profile] = get_running_loop().create_task(self.refill(profile))
+
+    async def get(self, profile: tuple[str, str]) -> tuple[str, bytes]:
+        """
+        The get function returns a pre-rendered captcha and refills the pool in the background.
+        If the pool is empty, the captcha is rendered right away (still in the executor).
+
+        :param profile: Size and difficulty of the captcha
+        :return: Captcha code and png image
+        """
+
+        pool: deque[tuple[str, bytes]] = self.pools.setdefault(profile, deque())
+
+        if pool:
+            captcha: tuple[str, bytes] = pool.popleft()
+        else:
+            captcha = await get_running_loop().run_in_executor(None, self.render, profile)
+
+        self.schedule_refill(profile)
+        return captcha
+
+
+captcha_pool: CaptchaPool = CaptchaPool()
+
+
 class CustomButton(ui.Button):
     def __init__(
         self,
@@ -55,11 +145,12 @@ class CustomButton(ui.Button):
 
 
 class CaptchaButtons(ui.View):
-    def __init__(self, captcha_code: str, message_id: int):
+    def __init__(self, captcha_code: str, message_id: int, difficulty: str = "normal"):
         super().__init__(timeout=None)
 
         self.captcha_code: str = captcha_code
         self.message_id: int = message_id
+        self.difficulty: str = difficulty
 
         self.add_item(
             CustomButton(
@@ -69,7 +160,7 @@ class CaptchaButtons(ui.View):
             )
         )
 
-        for code in self.generate_random_codes(2):
+        for code in self.generate_random_codes(2, self.difficulty):
             self.add_item(
                 CustomButton(
                     custom_callback=self.button_callback,
@@ -93,17 +184,11 @@ class CaptchaButtons(ui.View):
     @staticmethod
     def generate_random_codes(
         amount: int,
+        difficulty: str,
     ) -> list[str]:
-        codes: list[str] = []
+        length, characters = CaptchaPool.difficulties[difficulty]
 
-        for _ in range(amount):
-            captcha_text: str = ""
-            for code in range(8):  # pylint: disable=unused-variable
-                captcha_text += choice(list(ascii_lowercase))
-
-            codes.append(captcha_text)
-
-        return codes
+        return [CaptchaPool.generate_code(length, characters) for _ in range(amount)]
 
     async def button_callback(
         self,
@@ -281,14 +366,14 @@ class ButtonVerifyView(ui.View):
                     )
                     return
 
-                image = ImageCaptcha(width=300, height=100)
-
-                captcha_text: str = ""
-                for x in range(8):  # pylint: disable=unused-variable
-                    captcha_text += choice(list(ascii_lowercase))
+                settings: Optional[DB_RESPONSE] = await bot.db.execute_fetchone(
+                    "SELECT size, difficulty FROM verification_captcha WHERE guild_id = ?",
+                    (interaction.guild.id,),
+                )
+                profile: tuple[str, str] = CaptchaPool.get_profile(*(settings or (None, None)))
 
-                data = image.generate(captcha_text)
-                file = File(data, filename="captcha.png")
+                captcha_text, data = await captcha_pool.get(profile)
+                file = File(BytesIO(data), filename="captcha.png")
 
                 embed = Embed(
                     title=f"Weryfikacja {Emojis.GREENBUTTON.value}",
@@ -300,6 +385,7 @@ class ButtonVerifyView(ui.View):
                 buttons = CaptchaButtons(
                     captcha_text,
                     interaction.message.id,
+                    profile[1],
                 )
 
                 await interaction.send(
@@ -653,6 +739,7 @@ class CommandVerification(CustomCog):
         super().__init__(bot)
 
         self.bot.loop.create_task(self.update_views())
+        self.bot.add_startup_task(captcha_pool.refill)
 
     async def update_views(self):
         self.bot.add_view(
@@ -738,6 +825,47 @@ class CommandVerification(CustomCog):
         )
         await interaction.send(embed=embed, view=configure_buttons)
 
+    @verify.subcommand(
+        name="captcha",
+        description="Ustaw rozmiar i trudność kodu captcha.",
+    )  # pyright: ignore
+    @PermissionHandler(manage_guild=True)
+    async def verify_captcha(
+        self,
+        interaction: CustomInteraction,
+        size: str = SlashOption(
+            name="rozmiar",
+            description="Wybierz rozmiar obrazka captcha",
+            choices={
+                "Mały": "small",
+                "Normalny": "normal",
+                "Duży": "large",
+            },
+        ),
+        difficulty: str = SlashOption(
+            name="trudność",
+            description="Wybierz trudność kodu captcha",
+            choices={
+                "Łatwy (5 liter)": "easy",
+                "Normalny (8 liter)": "normal",
+                "Trudny (8 liter i cyfr)": "hard",
+            },
+        ),
+    ):
+        assert interaction.guild
+
+        await self.bot.db.execute_fetchone(
+            "INSERT OR REPLACE INTO verification_captcha(guild_id, size, difficulty) VALUES(?,?,?)",
+            (interaction.guild.id, size, difficulty),
+        )
+        captcha_pool.schedule_refill(CaptchaPool.get_profile(size, difficulty))
+
+        await interaction.send_success_message(
+            title=f"Pomyślnie zaktualizowano captcha {Emojis.GREENBUTTON.value}",
+            description=f"{Emojis.REPLY.value} Rozmiar: `{size}`, trudność: `{difficulty}`.",
+            color=Color.green(),
+        )
+
 
 def setup(bot: Smiffy):
     bot.add_cog(CommandVerification(bot))
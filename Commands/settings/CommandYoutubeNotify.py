@@ -1,11 +1,21 @@
 from __future__ import annotations
 
 from ast import literal_eval
+from asyncio import Semaphore
+from asyncio import TimeoutError as AsyncioTimeoutError
 from asyncio import sleep
+from datetime import datetime
 from json import JSONDecodeError
+from random import uniform
+from re import Match, Pattern
+from re import compile as re_compile
+from time import monotonic
 from typing import TYPE_CHECKING, Optional
+from urllib.parse import urlparse
+from xml.etree.ElementTree import Element, ParseError, fromstring
 
 import scrapetube
+from aiohttp import ClientError, ClientResponse
 from nextcord import (
     AllowedMentions,
     Color,
@@ -22,7 +32,8 @@ from nextcord import (
 from requests import exceptions
 
 from enums import Emojis
-from utilities import CustomCog, CustomInteraction, PermissionHandler
+from errors import HostUnavailable
+from utilities import CustomCog, CustomInteraction, PermissionHandler, TokenBucket
 
 if TYPE_CHECKING:
     from nextcord.abc import GuildChannel
@@ -31,26 +42,113 @@ if TYPE_CHECKING:
     from typings import DB_RESPONSE
 
 
+class YoutubeChannel:
+    __slots__ = (
+        "channel_url",
+        "channel_id",
+        "subscribers",
+        "etag",
+        "last_modified",
+        "interval",
+        "next_poll",
+        "polling",
+    )
+
+    def __init__(self, channel_url: str, interval: int) -> None:
+        """
+        YoutubeChannel holds the polling state of a single youtube channel,
+        shared by every guild that follows this channel.
+
+        :param channel_url: Url of the youtube channel
+        :param interval: Initial polling interval in seconds
+        :return: None
+        """
+
+        self.channel_url: str = channel_url
+        self.channel_id: Optional[str] = None
+        self.subscribers: set[int] = set()
+
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+
+        self.interval: int = interval
+        self.next_poll: float = monotonic() + uniform(0, interval)  # Staggering the first polls.
+        self.polling: bool = False
+
+
 class VideoListener:
+    rss_url: str = "https://www.youtube.com/feeds/videos.xml?channel_id={}"
+    channel_id_regex: Pattern = re_compile(r"(?:channel_id=|/channel/|\"externalId\":\")(UC[\w-]{22})")
+
+    atom_namespace: str = "{http://www.w3.org/2005/Atom}"
+    youtube_namespace: str = "{http://www.youtube.com/xml/schemas/2015}"
+
+    min_interval: int = 180
+    max_interval: int = 1800
+    workers: int = 4
+
     def __init__(self, bot: Smiffy):
         self.bot: Smiffy = bot
 
         self.yt_data: dict[int, dict[str, list | str | int]] = {}
+        self.channels: dict[str, YoutubeChannel] = {}
         self.running_loop: bool = False
 
         self.delay: int = 6
 
+        self.workers_semaphore: Semaphore = Semaphore(self.workers)
+        self.host_limiters: dict[str, TokenBucket] = {}
+
+    @staticmethod
+    def normalize_channel_url(channel_url: str) -> str:
+        channel_url = channel_url.strip().lower().split("?")[0].rstrip("/")
+
+        for prefix in ("https://", "http://", "www.", "m."):
+            channel_url = channel_url.removeprefix(prefix)
+
+        for suffix in ("/videos", "/featured", "/streams"):
+            channel_url = channel_url.removesuffix(suffix)
+
+        return channel_url
+
     def add_new_channel(
         self,
         guild_id: int,
         data: dict[str, list | str | int],
     ) -> None:
+        self.remove_subscriber(guild_id)
         self.yt_data[guild_id] = data
 
+        channel_key: str = self.normalize_channel_url(str(data["channel_url"]))
+        channel: Optional[YoutubeChannel] = self.channels.get(channel_key)
+
+        if not channel:
+            channel = YoutubeChannel(str(data["channel_url"]), self.min_interval)
+            self.channels[channel_key] = channel
+
+        channel.subscribers.add(guild_id)
+
         if not self.running_loop:
-            self.bot.logger.debug(f"Creating a new VideoListener loop for the server: {guild_id}")
+            self.bot.logger.debug("Creating a new VideoListener loop for the server: %s", guild_id)
             self.bot.loop.create_task(self.run_new_loop())
 
+    def remove_subscriber(self, guild_id: int) -> None:
+        guild_data: Optional[dict] = self.yt_data.get(guild_id)
+
+        if not guild_data:
+            return
+
+        channel_key: str = self.normalize_channel_url(guild_data["channel_url"])
+        channel: Optional[YoutubeChannel] = self.channels.get(channel_key)
+
+        if not channel:
+            return
+
+        channel.subscribers.discard(guild_id)
+
+        if not channel.subscribers:
+            del self.channels[channel_key]
+
     async def update_video_ids_db(self, guild_id: int, video_ids: list[str]) -> None:
         response: Optional[DB_RESPONSE] = await self.bot.db.execute_fetchone(
             "SELECT * FROM yt_notifications WHERE guild_id = ?",
@@ -87,9 +185,9 @@ class VideoListener:
         return channel_data
 
     def delete_channel_data(self, guild_id: int) -> None:
-        try:
-            del self.yt_data[guild_id]
-        except ValueError:
+        self.remove_subscriber(guild_id)
+
+        if self.yt_data.pop(guild_id, None) is None:
             return
 
         async def delete_from_db():
@@ -100,6 +198,15 @@ class VideoListener:
 
         self.bot.loop.create_task(delete_from_db())
 
+    def get_host_limiter(self, url: str) -> TokenBucket:
+        host: str = urlparse(url).netloc
+
+        if not self.host_limiters.get(host):
+            # One request per second with small bursts for every host.
+            self.host_limiters[host] = TokenBucket(rate=1.0, capacity=self.workers)
+
+        return self.host_limiters[host]
+
     async def get_latest_video(self, channel_url: str) -> Optional[str]:
         delay: int = int(self.delay / 2)
 
@@ -111,6 +218,162 @@ class VideoListener:
             latest_video_id = video_data.get("videoId")
             return latest_video_id
 
+    async def resolve_channel_id(self, channel: YoutubeChannel) -> Optional[str]:
+        match: Optional[Match] = self.channel_id_regex.search(channel.channel_url)
+
+        if not match:
+            await self.get_host_limiter(channel.channel_url).acquire()
+
+            response: ClientResponse = await self.bot.session.get(channel.channel_url)
+
+            async with response:
+                if response.status != 200:
+                    return None
+
+                match = self.channel_id_regex.search(await response.text())
+
+        if not match:
+            return None
+
+        return match.group(1)
+
+    async def fetch_feed(self, channel: YoutubeChannel) -> Optional[list[tuple[str, datetime]]]:
+        """
+        The fetch_feed function downloads the RSS feed of the channel.
+        ETag and Last-Modified headers are sent back, so an unchanged feed costs a single 304 response.
+
+        :param channel: Youtube channel to fetch
+        :return: List of (video_id, published) tuples, newest first or None if the feed did not change
+        """
+
+        url: str = self.rss_url.format(channel.channel_id)
+        headers: dict[str, str] = {}
+
+        if channel.etag:
+            headers["If-None-Match"] = channel.etag
+        if channel.last_modified:
+            headers["If-Modified-Since"] = channel.last_modified
+
+        await self.get_host_limiter(url).acquire()
+
+        response: ClientResponse = await self.bot.session.get(url, headers=headers)
+
+        async with response:
+            if response.status == 304:
+                return None
+
+            if response.status != 200:
+                raise ClientError(f"Feed {url} returned status: {response.status}")
+
+            channel.etag = response.headers.get("ETag")
+            channel.last_modified = response.headers.get("Last-Modified")
+
+            root: Element = fromstring(await response.read())
+
+        videos: list[tuple[str, datetime]] = []
+
+        for entry in root.iter(f"{self.atom_namespace}entry"):
+            video_id: Optional[str] = entry.findtext(f"{self.youtube_namespace}videoId")
+            published: Optional[str] = entry.findtext(f"{self.atom_namespace}published")
+
+            if video_id and published:
+                videos.append((video_id, datetime.fromisoformat(published)))
+
+        return videos
+
+    def calculate_interval(self, videos: list[tuple[str, datetime]]) -> int:
+        """
+        The calculate_interval function adapts the polling interval to the channel upload frequency.
+        Channels that upload often are polled more frequently than the inactive ones.
+
+        :param videos: List of (video_id, published) tuples, newest first
+        :return: Polling interval in seconds
+        """
+
+        if len(videos) < 2:
+            return self.max_interval
+
+        gaps: list[float] = sorted(
+            (newer[1] - older[1]).total_seconds() for newer, older in zip(videos, videos[1:])
+        )
+        median_gap: float = gaps[len(gaps) // 2]
+
+        return int(min(self.max_interval, max(self.min_interval, median_gap / 48)))
+
+    async def poll_channel(self, channel: YoutubeChannel) -> None:
+        async with self.workers_semaphore:
+            try:
+                if not channel.channel_id:
+                    channel.channel_id = await self.resolve_channel_id(channel)
+
+                if channel.channel_id:
+                    videos: Optional[list[tuple[str, datetime]]] = await self.fetch_feed(channel)
+
+                    if videos is not None:
+                        channel.interval = self.calculate_interval(videos)
+
+                        if videos:
+                            await self.notify_subscribers(channel, videos[0][0])
+                else:
+                    # Channel id could not be resolved, falling back to the page scraping.
+                    latest_video_id: Optional[str] = await self.get_latest_video(channel.channel_url)
+
+                    if latest_video_id:
+                        await self.notify_subscribers(channel, latest_video_id)
+
+            except (ClientError, AsyncioTimeoutError, ParseError, ValueError, HostUnavailable) as e:
+                channel.interval = min(self.max_interval, channel.interval * 2)
+                self.bot.logger.warning(f"VideoListener: {channel.channel_url} polling failed: {type(e)}")
+
+            finally:
+                channel.next_poll = monotonic() + channel.interval
+                channel.polling = False
+
+    async def notify_subscribers(self, channel: YoutubeChannel, latest_video_id: str) -> None:
+        for guild_id in channel.subscribers.copy():
+            channel_data: Optional[dict] = self.yt_data.get(guild_id)
+
+            if not channel_data:
+                continue
+
+            video_ids: list[Optional[str]] = channel_data["video_ids"]
+
+            if latest_video_id in video_ids:
+                continue
+
+            self.bot.logger.debug("A new video for the channel has been found: %s", channel.channel_url)
+
+            if None in video_ids:
+                video_ids.remove(None)
+
+            video_ids.append(latest_video_id)
+
+            channel_data["video_ids"] = video_ids
+
+            self.update_channel_data(guild_id, channel_data)
+
+            text_channel: Optional[GuildChannel] = await self.bot.getch_channel(channel_data["channel_id"])
+
+            if not isinstance(text_channel, TextChannel):
+                self.delete_channel_data(guild_id)
+                continue
+
+            try:
+                video_url: str = f"\nhttps://www.youtube.com/watch?v={latest_video_id}"
+                await text_channel.send(
+                    channel_data["notify_content"] + video_url,
+                    allowed_mentions=AllowedMentions(
+                        everyone=True,
+                        users=True,
+                        roles=True,
+                    ),
+                )
+            except (
+                errors.HTTPException,
+                errors.Forbidden,
+            ):
+                pass
+
     async def fetch_data(self) -> None:
         for data in await self.bot.db.execute_fetchall("SELECT * FROM yt_notifications"):
             guild_data: dict[str, str | list | int] = {
@@ -128,54 +391,19 @@ class VideoListener:
 
         self.running_loop = True
 
-        while len(self.yt_data):
-            for guild_id in self.yt_data.copy():
-                try:
-                    channel_data: dict = self.yt_data[guild_id]
-                except KeyError:
-                    continue
-
-                await sleep(self.delay)
-
-                video_ids: list[Optional[str]] = channel_data["video_ids"]
-                channel_url: str = channel_data["channel_url"]
-                channel_id: int = channel_data["channel_id"]
-                notify_content: str = channel_data["notify_content"]
-                latest_video_id: Optional[str] = await self.get_latest_video(channel_url)
+        await self.bot.wait_until_ready()
 
-                if latest_video_id is not None and latest_video_id not in video_ids:
-                    self.bot.logger.debug(f"A new video for the channel has been found: {channel_url}")
+        while len(self.channels):
+            now: float = monotonic()
 
-                    if None in video_ids:
-                        video_ids.remove(None)
-
-                    video_ids.append(latest_video_id)
-
-                    channel_data["video_ids"] = video_ids
-
-                    self.update_channel_data(guild_id, channel_data)
-
-                    channel: Optional[GuildChannel] = await self.bot.getch_channel(channel_id)
+            for channel in tuple(self.channels.values()):
+                if channel.polling or channel.next_poll > now:
+                    continue
 
-                    if not isinstance(channel, TextChannel):
-                        self.delete_channel_data(guild_id)
-                        continue
+                channel.polling = True
+                self.bot.loop.create_task(self.poll_channel(channel))
 
-                    try:
-                        video_url: str = f"\nhttps://www.youtube.com/watch?v={latest_video_id}"
-                        await channel.send(
-                            notify_content + video_url,
-                            allowed_mentions=AllowedMentions(
-                                everyone=True,
-                                users=True,
-                                roles=True,
-                            ),
-                        )
-                    except (
-                        errors.HTTPException,
-                        errors.Forbidden,
-                    ):
-                        pass
+            await sleep(self.delay)
 
         self.running_loop = False
         self.bot.logger.debug("Closing the VideoListener loop")
@@ -184,7 +412,7 @@ class VideoListener:
     def run(cls, bot: Smiffy) -> VideoListener:
         listener: VideoListener = cls(bot)
 
-        bot.loop.create_task(listener.fetch_data())
+        bot.add_startup_task(listener.fetch_data)
 
         return listener
 
@@ -35,7 +35,7 @@ class BotGuilds(CustomCog):
         assert self.bot.user
 
         if guild.me.guild_permissions.administrator:
-            self.bot.dispatch("invite_update", guild)
+            self.bot.invite_tracker.queue_sync(guild)
 
             if guild not in self.bot.guilds:
                 self.bot.guilds.append(guild)
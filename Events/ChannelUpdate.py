@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Optional
 
-from nextcord import AuditLogAction, Color, Embed, Member, TextChannel, errors, utils
+from nextcord import AuditLogAction, Color, Embed, Member, TextChannel, utils
 
 from enums import Emojis
 from utilities import CustomCog
@@ -65,13 +65,7 @@ class ChannelUpdate(CustomCog):
                 icon_url=self.bot.avatar_url,
             )
 
-        try:
-            await logs_channel.send(embed=embed)
-        except (
-            errors.HTTPException,
-            errors.Forbidden,
-        ):
-            pass
+        await self.bot.log_sink.send(logs_channel, embed)
 
     @CustomCog.listener()
     async def on_guild_channel_delete(self, deleted_channel: GuildChannel):
@@ -124,13 +118,7 @@ class ChannelUpdate(CustomCog):
                 icon_url=self.bot.avatar_url,
             )
 
-        try:
-            await logs_channel.send(embed=embed)
-        except (
-            errors.HTTPException,
-            errors.Forbidden,
-        ):
-            pass
+        await self.bot.log_sink.send(logs_channel, embed)
 
 
 def setup(bot: Smiffy):
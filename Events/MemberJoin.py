@@ -11,7 +11,7 @@ from enums import Emojis
 from utilities import CustomCog
 
 if TYPE_CHECKING:
-    from nextcord import Guild, Invite, Member, User
+    from nextcord import Guild, Member, User
     from nextcord.abc import GuildChannel
 
     from bot import Smiffy
@@ -113,8 +113,15 @@ class MemberJoin(CustomCog):
         normal: int = 0,
         fake: int = 0,
     ):
+        await self.bot.invite_tracker.add_edge(
+            member.guild.id,
+            member.id,
+            inviter.id,
+            "fake" if fake else "normal",
+        )
+
         response: Optional[DB_RESPONSE] = await self.bot.db.execute_fetchone(
-            "SELECT normal, fake, invited FROM user_invites WHERE guild_id = ? AND user_id = ?",
+            "SELECT 1 FROM user_invites WHERE guild_id = ? AND user_id = ?",
             (member.guild.id, inviter.id),
         )
 
@@ -128,26 +135,15 @@ class MemberJoin(CustomCog):
                     0,
                     fake,
                     0,
-                    f"[{member.id}]",
+                    "[]",
                 ),
             )
 
-        normal_i, fake_i = response[0:2]
-
-        normal_i += normal
-        fake_i += fake
-
-        invited: list[int] = literal_eval(response[2])
-
-        if member.id not in invited:
-            invited.append(member.id)
-
         await self.bot.db.execute_fetchone(
-            "UPDATE user_invites SET normal = ?, fake = ?, invited = ? WHERE guild_id = ? AND user_id = ?",
+            "UPDATE user_invites SET normal = normal + ?, fake = fake + ? WHERE guild_id = ? AND user_id = ?",
             (
-                normal_i,
-                fake_i,
-                str(invited),
+                normal,
+                fake,
                 member.guild.id,
                 inviter.id,
             ),
@@ -265,37 +261,27 @@ class MemberJoin(CustomCog):
         except ValueError:
             notify_data = None
 
-        invites_data: list[dict] = literal_eval(guild_invites_data[1])
-
-        guild_invites: list[Invite] = await guild.invites()
-        inviter: Optional[User] = None
-
-        for guild_invite, db_invite in zip(guild_invites, invites_data):
-            if guild_invite.inviter and guild_invite.inviter.id == db_invite["inviter_id"]:
-                if db_invite["invite_uses"] + 1 == guild_invite.uses:
-                    now = utils.utcnow()
-                    inviter = guild_invite.inviter
-
-                    if (now.year, now.month) == (
-                        member.created_at.year,
-                        member.created_at.month,
-                    ):
-                        if now.day - member.created_at.day < 7:
-                            return await self.update_invites(
-                                inviter=guild_invite.inviter,
-                                member=member,
-                                fake=1,
-                            )
-
-                    await self.update_invites(
-                        inviter=guild_invite.inviter,
+        inviter: Optional[User] = await self.bot.invite_tracker.find_inviter(guild)
+
+        if inviter:
+            now = utils.utcnow()
+
+            if (now.year, now.month) == (
+                member.created_at.year,
+                member.created_at.month,
+            ):
+                if now.day - member.created_at.day < 7:
+                    return await self.update_invites(
+                        inviter=inviter,
                         member=member,
-                        normal=1,
+                        fake=1,
                     )
 
-        self.bot.dispatch("invite_update", member.guild)
-        # Even if the bot did not find an inviter we still update,
-        # because used invites may have changed while the bot was offline.
+            await self.update_invites(
+                inviter=inviter,
+                member=member,
+                normal=1,
+            )
 
         if notify_data:
             await self.handle_invites_notify(notify_data, inviter, member)
@@ -307,45 +293,38 @@ class MemberJoin(CustomCog):
         logs_channel: Optional[GuildChannel] = await self.get_logs_channel(member.guild)
 
         if isinstance(logs_channel, TextChannel):
-            try:
-                account_age_timestamp: str = f"<t:{int(mktime(member.created_at.timetuple()))}:R>"
-                account_age: str = str(member.created_at)[0:19]
-
-                embed = Embed(
-                    title="<:user2:992156083231666267> Dołączył nowy użytkownik!",
-                    color=Color.green(),
-                    timestamp=utils.utcnow(),
-                    description=f"{Emojis.REPLY.value} **Wiek konta:** `{account_age}` ({account_age_timestamp})",
-                )
-
-                embed.add_field(
-                    name="`⚙️` Identyfikator",
-                    value=f"{Emojis.REPLY.value} `{member.id}`",
-                )
+            account_age_timestamp: str = f"<t:{int(mktime(member.created_at.timetuple()))}:R>"
+            account_age: str = str(member.created_at)[0:19]
+
+            embed = Embed(
+                title="<:user2:992156083231666267> Dołączył nowy użytkownik!",
+                color=Color.green(),
+                timestamp=utils.utcnow(),
+                description=f"{Emojis.REPLY.value} **Wiek konta:** `{account_age}` ({account_age_timestamp})",
+            )
 
-                embed.add_field(
-                    name="`👥` Osoby",
-                    value=f"{Emojis.REPLY.value} `{member.guild.member_count}`",
-                )
+            embed.add_field(
+                name="`⚙️` Identyfikator",
+                value=f"{Emojis.REPLY.value} `{member.id}`",
+            )
 
-                embed.set_author(
-                    name=member,
-                    icon_url=self.avatars.get_user_avatar(member),
-                )
-                embed.set_thumbnail(url=self.avatars.get_guild_icon(member.guild))
+            embed.add_field(
+                name="`👥` Osoby",
+                value=f"{Emojis.REPLY.value} `{member.guild.member_count}`",
+            )
 
-                embed.set_footer(
-                    text=f"Smiffy v{self.bot.__version__}",
-                    icon_url=self.bot.avatar_url,
-                )
+            embed.set_author(
+                name=member,
+                icon_url=self.avatars.get_user_avatar(member),
+            )
+            embed.set_thumbnail(url=self.avatars.get_guild_icon(member.guild))
 
-                await logs_channel.send(embed=embed)
+            embed.set_footer(
+                text=f"Smiffy v{self.bot.__version__}",
+                icon_url=self.bot.avatar_url,
+            )
 
-            except (
-                errors.HTTPException,
-                errors.Forbidden,
-            ):
-                pass
+            await self.bot.log_sink.send(logs_channel, embed)
 
         startrole_response: Optional[DB_RESPONSE] = await self.bot.db.execute_fetchone(
             "SELECT role_id FROM startrole WHERE guild_id = ?",
@@ -148,31 +148,7 @@ class MemberLeaveEvent(CustomCog):
         if guild_invites_data is None:
             return
 
-        users: Iterable[DB_RESPONSE] = await self.bot.db.execute_fetchall(
-            "SELECT * FROM user_invites WHERE guild_id = ?",
-            (guild.id,),
-        )
-
-        inviter_id: Optional[int] = None
-
-        for user_data in users:
-            invited: str = user_data[6]
-
-            if invited != "[]":
-                invited_users: list[int] = literal_eval(invited)
-                if member.id in invited_users:
-                    invited_users.remove(member.id)
-
-                    inviter_id = user_data[1]
-
-                    await self.bot.db.execute_fetchone(
-                        "UPDATE user_invites SET left = left + 1, invited = ? WHERE guild_id = ? AND user_id = ?",
-                        (
-                            str(invited_users),
-                            guild.id,
-                            inviter_id,
-                        ),
-                    )
+        inviter_id: Optional[int] = await self.bot.invite_tracker.mark_left(guild.id, member.id)
 
         if guild_invites_data[3]:
             notify_data: dict = literal_eval(guild_invites_data[3])
@@ -193,53 +169,41 @@ class MemberLeaveEvent(CustomCog):
         if guild:
             await self.update_invites(event_data.user, guild)
 
-        logs_response: Optional[DB_RESPONSE] = await self.bot.db.execute_fetchone(
-            "SELECT channel_id FROM server_logs WHERE guild_id = ?",
-            (event_data.guild_id,),
-        )
-
-        if logs_response:
-            logs_channel: Optional[GuildChannel] = await self.bot.getch_channel(logs_response[0])
+        logs_channel: Optional[GuildChannel] = await self.get_logs_channel(guild) if guild else None
 
+        if isinstance(logs_channel, TextChannel):
             account_age_timestamp: str = f"<t:{int(mktime(event_data.user.created_at.timetuple()))}:R>"
             account_age: str = str(event_data.user.created_at)[0:19]
 
-            if isinstance(logs_channel, TextChannel):
-                embed = Embed(
-                    title="<:user3:992156113678110780> Użytkownik wyszedł!",
-                    color=Color.red(),
-                    timestamp=utils.utcnow(),
-                    description=f"{Emojis.REPLY.value} **Wiek konta:** `{account_age}` ({account_age_timestamp})",
-                )
+            embed = Embed(
+                title="<:user3:992156113678110780> Użytkownik wyszedł!",
+                color=Color.red(),
+                timestamp=utils.utcnow(),
+                description=f"{Emojis.REPLY.value} **Wiek konta:** `{account_age}` ({account_age_timestamp})",
+            )
+            embed.add_field(
+                name="`⚙️` Identyfikator",
+                value=f"{Emojis.REPLY.value} `{event_data.user.id}`",
+            )
+
+            if guild:
                 embed.add_field(
-                    name="`⚙️` Identyfikator",
-                    value=f"{Emojis.REPLY.value} `{event_data.user.id}`",
+                    name="`👥` Osoby",
+                    value=f"{Emojis.REPLY.value} `{guild.member_count}`",
                 )
 
-                if guild:
-                    embed.add_field(
-                        name="`👥` Osoby",
-                        value=f"{Emojis.REPLY.value} `{guild.member_count}`",
-                    )
-
-                embed.set_author(
-                    name=event_data.user,
-                    icon_url=self.avatars.get_user_avatar(event_data.user),
-                )
-                embed.set_thumbnail(url=self.avatars.get_guild_icon(guild))
+            embed.set_author(
+                name=event_data.user,
+                icon_url=self.avatars.get_user_avatar(event_data.user),
+            )
+            embed.set_thumbnail(url=self.avatars.get_guild_icon(guild))
 
-                embed.set_footer(
-                    text=f"Smiffy v{self.bot.__version__}",
-                    icon_url=self.bot.avatar_url,
-                )
+            embed.set_footer(
+                text=f"Smiffy v{self.bot.__version__}",
+                icon_url=self.bot.avatar_url,
+            )
 
-                try:
-                    await logs_channel.send(embed=embed)
-                except (
-                    errors.HTTPException,
-                    errors.Forbidden,
-                ):
-                    pass
+            await self.bot.log_sink.send(logs_channel, embed)
 
         lobby_response: Optional[DB_RESPONSE] = await self.bot.db.execute_fetchone(
             "SELECT goodbye_channel_id, goodbye_data FROM goodbyes WHERE guild_id = ?",
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Optional
 
-from nextcord import Color, Embed, TextChannel, errors, utils
+from nextcord import Color, Embed, TextChannel, utils
 
 from enums import Emojis
 from utilities import CustomCog
@@ -66,13 +66,7 @@ class MemberUpdate(CustomCog):
                 icon_url=self.bot.avatar_url,
             )
 
-            try:
-                await logs_channel.send(embed=embed)
-            except (
-                errors.Forbidden,
-                errors.HTTPException,
-            ):
-                pass
+            await self.bot.log_sink.send(logs_channel, embed)
 
 
 def setup(bot: Smiffy):
@@ -39,6 +39,9 @@ class MessageDelete(CustomCog):
             (message.guild.id, message.id),
         )
 
+        if message.author == message.guild.me:
+            self.bot.autocomplete.invalidate("tickets", message.guild.id)
+
         if not message.author.bot:
             logs_channel: Optional[GuildChannel] = await self.get_logs_channel(message.guild)
 
@@ -71,13 +74,7 @@ class MessageDelete(CustomCog):
                     icon_url=self.bot.avatar_url,
                 )
 
-                try:
-                    await logs_channel.send(embed=embed)
-                except (
-                    errors.Forbidden,
-                    errors.HTTPException,
-                ):
-                    pass
+                await self.bot.log_sink.send(logs_channel, embed)
 
         ghostping_response = await self.bot.db.execute_fetchone(
             "SELECT * FROM antyghostping WHERE guild_id = ?",
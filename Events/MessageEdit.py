@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Optional
 
-from nextcord import Color, Embed, TextChannel, errors, utils
+from nextcord import Color, Embed, TextChannel, utils
 
 from enums import Emojis
 from utilities import CustomCog
@@ -56,13 +56,7 @@ class MessageEdit(CustomCog):
                 value=f"- ```{after_content}```",
             )
 
-            try:
-                await logs_channel.send(embed=embed)
-            except (
-                errors.Forbidden,
-                errors.HTTPException,
-            ):
-                pass
+            await self.bot.log_sink.send(logs_channel, embed)
 
 
 def setup(bot: Smiffy):
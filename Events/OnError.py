@@ -47,7 +47,7 @@ class OnError(CustomCog):
             )
         )
         if isinstance(exception, self.bot.ignore_exceptions):
-            self.bot.logger.debug(f"Ignoring exception: {type(exception)}.")
+            self.bot.logger.debug("Ignoring exception: %s.", type(exception))
             return
 
         guild: str = inter.guild.name if inter.guild else "None"
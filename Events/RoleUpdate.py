@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Optional
 
-from nextcord import AuditLogAction, Color, Embed, Role, TextChannel, errors, utils
+from nextcord import AuditLogAction, Color, Embed, Role, TextChannel, utils
 
 from enums import Emojis
 from utilities import CustomCog
@@ -48,10 +48,7 @@ class RoleUpdate(CustomCog):
                 )
                 embed.set_thumbnail(url=self.avatars.get_guild_icon(role.guild))
 
-                try:
-                    await logs_channel.send(embed=embed)
-                except errors.Forbidden:
-                    pass
+                await self.bot.log_sink.send(logs_channel, embed)
 
     @CustomCog.listener()
     async def on_guild_role_update(self, before: Role, after: Role):
@@ -111,10 +108,7 @@ class RoleUpdate(CustomCog):
                 )
                 embed.set_thumbnail(url=self.avatars.get_guild_icon(after.guild))
 
-                try:
-                    await logs_channel.send(embed=embed)
-                except errors.Forbidden:
-                    pass
+                await self.bot.log_sink.send(logs_channel, embed)
 
     @CustomCog.listener()
     async def on_guild_role_delete(self, role: Role):
@@ -150,10 +144,7 @@ class RoleUpdate(CustomCog):
                 )
                 embed.set_thumbnail(url=self.avatars.get_guild_icon(role.guild))
 
-                try:
-                    await logs_channel.send(embed=embed)
-                except errors.Forbidden:
-                    pass
+                await self.bot.log_sink.send(logs_channel, embed)
 
 
 def setup(bot: Smiffy):
@@ -1,82 +1,82 @@
 from __future__ import annotations
 
-from asyncio import sleep
 from typing import TYPE_CHECKING, Optional
 
 from nextcord import Color, Embed, Member, TextChannel, utils
 
+from Commands.music.__main__ import MusicPlayer
 from enums import Emojis
 from utilities import CustomCog
 
 if TYPE_CHECKING:
     from nextcord import Guild, VoiceState
+    from nextcord.abc import GuildChannel
 
     from bot import Smiffy
-    from typings import DB_RESPONSE, PlayerT
+    from typings import MusicGuildSettings
 
 
 class VoiceUpdate(CustomCog):
     async def alerts_enabled(self, guild: Guild) -> bool:
-        response: Optional[DB_RESPONSE] = await self.bot.db.execute_fetchone(
-            "SELECT notify FROM music_settings WHERE guild_id = ?",
-            (guild.id,),
-        )
-        if not response or not response[0]:
-            return True
+        return (await self.bot.music_settings.get(guild.id))["notify"]
 
-        return False
+    async def handle_bot_disconnect(self, player: MusicPlayer):
+        guild: Guild = player.guild
+        channel: Optional[GuildChannel] = player.channel_last_command
 
-    async def handle_bot_disconnect(self, state: VoiceState):
-        if not state.channel:
+        if not guild.me.voice or not guild.me.voice.channel:
             return
 
-        seconds: int = 0
-        while not len(state.channel.members) - 1:
-            if not state.channel.guild.me.voice or not state.channel.guild.me.voice.channel:
-                break
-
-            await sleep(5)
-            seconds += 5
-
-            if seconds >= 150:
-                await state.channel.guild.me.disconnect()
-
-                if await self.alerts_enabled(state.channel.guild):
-                    player: Optional[PlayerT] = state.channel.guild.voice_client  # pyright: ignore
-
-                    if player and getattr(
-                        player,
-                        "channel_last_command",
-                        None,
-                    ):
-                        channel: TextChannel = player.channel_last_command  # pyright: ignore
-
-                        embed = Embed(
-                            title="`🔊` Odłączono z kanału",
-                            colour=Color.dark_theme(),
-                            description=f"{Emojis.REPLY.value} Wygląda na to, "
-                            f"że spędziłem na kanale sam zbyt dużo czasu.",
-                            timestamp=utils.utcnow(),
-                        )
-                        embed.set_author(
-                            name="Smiffy v2.0 - Muzyka",
-                            icon_url=self.bot.avatar_url,
-                        )
-                        embed.set_thumbnail(self.avatars.get_guild_icon(channel.guild))
-                        await channel.send(embed=embed)
-
-                break
+        await guild.me.disconnect()
+
+        if not await self.alerts_enabled(guild) or not isinstance(channel, TextChannel):
+            return
+
+        embed = Embed(
+            title="`🔊` Odłączono z kanału",
+            colour=Color.dark_theme(),
+            description=f"{Emojis.REPLY.value} Wygląda na to, że spędziłem na kanale sam zbyt dużo czasu.",
+            timestamp=utils.utcnow(),
+        )
+        embed.set_author(
+            name="Smiffy v2.0 - Muzyka",
+            icon_url=self.bot.avatar_url,
+        )
+        embed.set_thumbnail(self.avatars.get_guild_icon(channel.guild))
+        await channel.send(embed=embed)
 
     @CustomCog.listener()
     async def on_voice_state_update(
         self,
-        member: Member,  # pylint: disable=unused-argument
+        member: Member,
         before: VoiceState,
-        after: VoiceState,  # pylint: disable=unused-argument
+        after: VoiceState,
     ):
-        if before.channel and before.channel.guild.me.voice and before.channel.guild.me.voice.channel:
-            if before.channel.id == before.channel.guild.me.voice.channel.id:
-                self.bot.loop.create_task(self.handle_bot_disconnect(state=before))
+        guild: Guild = member.guild
+
+        if not guild.me.voice or not guild.me.voice.channel:
+            return
+
+        bot_channel_id: int = guild.me.voice.channel.id
+
+        if bot_channel_id not in (
+            getattr(before.channel, "id", None),
+            getattr(after.channel, "id", None),
+        ):
+            return
+
+        player: Optional[MusicPlayer] = guild.voice_client  # pyright: ignore
+
+        if not isinstance(player, MusicPlayer):
+            return
+
+        if len(guild.me.voice.channel.members) - 1:
+            # Someone is still listening with the bot.
+            player.cancel_idle_timer()
+            return
+
+        settings: MusicGuildSettings = await self.bot.music_settings.get(guild.id)
+        player.start_idle_timer(settings["idle_timeout"], self.handle_bot_disconnect)
 
 
 def setup(bot: Smiffy):
@@ -1 +1,573 @@
-# TODO: API
+from __future__ import annotations
+
+from ast import literal_eval
+from hashlib import blake2b
+from math import isinf, isnan
+from os import path
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+from urllib.request import pathname2url
+
+from aiohttp import web
+from aiosqlite import connect
+from orjson import OPT_NON_STR_KEYS, dumps
+
+from utilities import Database, bot_utils
+
+if TYPE_CHECKING:
+    from aiosqlite import Connection
+
+    from bot import Smiffy
+    from typings import DB_RESPONSE
+    from utilities import LatencyHistogram
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in labels.items()) + "}"
+
+
+def format_value(value: float) -> str:
+    if isnan(value):
+        return "NaN"
+
+    if isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+
+    return repr(float(value))
+
+
+class MetricsWriter:
+    __slots__ = ("lines",)
+
+    def __init__(self) -> None:
+        """
+        MetricsWriter builds a response in the Prometheus text format.
+
+        :return: None
+        """
+
+        self.lines: list[str] = []
+
+    def add(
+        self,
+        name: str,
+        kind: str,
+        description: str,
+        samples: Iterable[tuple[dict[str, str], float]],
+    ) -> None:
+        self.lines.append(f"# HELP {name} {description}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+        for labels, value in samples:
+            self.lines.append(f"{name}{format_labels(labels)} {format_value(value)}")
+
+    def add_histogram(
+        self,
+        name: str,
+        description: str,
+        histograms: Iterable[tuple[dict[str, str], LatencyHistogram]],
+    ) -> None:
+        self.lines.append(f"# HELP {name} {description}")
+        self.lines.append(f"# TYPE {name} histogram")
+
+        for labels, histogram in histograms:
+            # LatencyHistogram counts every bucket separately, Prometheus buckets are cumulative
+            cumulative: int = 0
+
+            for bucket, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                bucket_labels: str = format_labels({**labels, "le": format_value(bucket)})
+                self.lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+
+            self.lines.append(f"{name}_bucket{format_labels({**labels, 'le': '+Inf'})} {histogram.count}")
+            self.lines.append(f"{name}_sum{format_labels(labels)} {format_value(histogram.total)}")
+            self.lines.append(f"{name}_count{format_labels(labels)} {histogram.count}")
+
+    def render(self) -> bytes:
+        return ("\n".join(self.lines) + "\n").encode()
+
+
+def decode_value(value: Any) -> Any:
+    # Dicts and lists are stored as python literals (str(dict)), the api returns them as json.
+    if isinstance(value, str) and value[:1] in ("{", "["):
+        try:
+            return literal_eval(value)
+        except (ValueError, SyntaxError):
+            return value
+
+    if isinstance(value, bytes):
+        return None
+
+    return value
+
+
+def json_error(error: type[web.HTTPException], message: str) -> web.HTTPException:
+    return error(body=dumps({"error": message}), content_type="application/json")
+
+
+class ReadOnlyApi:
+    __slots__ = ("db",)
+
+    default_page_size: int = 50
+    max_page_size: int = 100
+
+    # table -> columns returned by /config, every table is filtered by guild_id
+    config_tables: dict[str, tuple[str, ...]] = {
+        "antyflood": ("messages_limit",),
+        "antylink": ("punishment",),
+        "antyghostping": (),
+        "economy_settings": (
+            "start_balance",
+            "max_balance",
+            "work_win_rate",
+            "work_cooldown",
+            "work_min_income",
+            "work_max_income",
+            "coin_flip_cooldown",
+            "income_roles",
+        ),
+        "goodbyes": ("goodbye_channel_id", "goodbye_data"),
+        "levels": ("roles_data", "alerts_data", "multiplier_data"),
+        "music_settings": ("permission_roles", "notify", "idle_timeout"),
+        "server_logs": ("channel_id",),
+        "startrole": ("role_id",),
+        "suggestions": ("channel_id", "comments"),
+        "tickets_transcripts": ("max_messages", "max_bytes", "compress"),
+        "verification_captcha": ("size", "difficulty"),
+        "verifications": ("message_id", "role_id", "type"),
+        "warnings_punishments": ("data",),
+        "welcomes": ("welcome_channel_id", "welcome_data"),
+    }
+
+    def __init__(self, db: Database) -> None:
+        """
+        ReadOnlyApi serves the bot data as json for dashboards. It uses its own read-only connection,
+        so reads never hold the connection used by the bot. Lists are paginated with keyset cursors
+        (?after=<cursor from the previous page>), so large guilds are not scanned with OFFSET.
+
+        :param db: Database with a read-only connection
+        :return: None
+        """
+
+        self.db: Database = db
+
+    @classmethod
+    async def setup(cls, db_path: str = "./Data/database.db") -> ReadOnlyApi:
+        connection: Connection = await connect(
+            f"file:{pathname2url(path.abspath(db_path))}?mode=ro", uri=True
+        )
+        return cls(Database(connection))
+
+    async def close(self) -> None:
+        await self.db.connection.close()
+
+    def add_routes(self, app: web.Application) -> None:
+        app.router.add_get("/api/guilds/{guild_id:\\d+}/config", self.get_config)
+        app.router.add_get("/api/guilds/{guild_id:\\d+}/leaderboard/economy", self.get_economy_leaderboard)
+        app.router.add_get("/api/guilds/{guild_id:\\d+}/leaderboard/levels", self.get_levels_leaderboard)
+        app.router.add_get("/api/guilds/{guild_id:\\d+}/economy/users", self.get_economy_users)
+        app.router.add_get("/api/guilds/{guild_id:\\d+}/warnings", self.get_warnings)
+
+    @staticmethod
+    def json_response(request: web.Request, data: Any, etag: bool = False) -> web.Response:
+        """
+        The json_response function serializes the data and, with etag enabled,
+        answers 304 Not Modified when the client already has the same body.
+
+        :param request: Request with the optional If-None-Match header
+        :param data: Data to serialize
+        :param etag: Whether to send an ETag
+        :return: Response
+        """
+
+        # literal_eval'd dicts often have int keys (role ids), json keys are always strings
+        body: bytes = dumps(data, option=OPT_NON_STR_KEYS)
+
+        if not etag:
+            return web.Response(body=body, content_type="application/json")
+
+        tag: str = f'"{blake2b(body, digest_size=16).hexdigest()}"'
+        headers: dict[str, str] = {"ETag": tag, "Cache-Control": "no-cache"}
+
+        if_none_match: str = request.headers.get("If-None-Match", "")
+        client_tags: set[str] = {value.strip().removeprefix("W/") for value in if_none_match.split(",")}
+
+        if tag in client_tags or "*" in client_tags:
+            return web.Response(status=304, headers=headers)
+
+        return web.Response(body=body, content_type="application/json", headers=headers)
+
+    def get_page_size(self, request: web.Request) -> int:
+        try:
+            limit: int = int(request.query.get("limit", self.default_page_size))
+        except ValueError as e:
+            raise json_error(web.HTTPBadRequest, "limit must be a number") from e
+
+        return max(1, min(limit, self.max_page_size))
+
+    @staticmethod
+    def get_cursor(request: web.Request, size: int) -> Optional[tuple[int, ...]]:
+        """
+        The get_cursor function parses the ?after= cursor, a comma separated list of the sort keys
+        of the last row of the previous page.
+
+        :param request: Request
+        :param size: Number of the sort keys
+        :return: Sort keys or None for the first page
+        """
+
+        after: Optional[str] = request.query.get("after")
+
+        if not after:
+            return None
+
+        try:
+            cursor: tuple[int, ...] = tuple(int(value) for value in after.split(","))
+        except ValueError:
+            cursor = ()
+
+        if len(cursor) != size:
+            raise json_error(web.HTTPBadRequest, "invalid cursor")
+
+        return cursor
+
+    async def get_page(
+        self,
+        request: web.Request,
+        first_page: str,
+        next_page: str,
+        keys: int,
+        columns: tuple[str, ...],
+    ) -> dict[str, Any]:
+        """
+        The get_page function runs a keyset query and builds the page.
+        Both expressions select the sort keys as the first `keys` columns,
+        first_page takes (guild_id, limit) and next_page takes (guild_id, *cursor, limit).
+
+        :param request: Request
+        :param first_page: Sql of the first page
+        :param next_page: Sql of the pages after the cursor
+        :param keys: Number of the sort keys
+        :param columns: Names of the selected columns
+        :return: Page with items and the cursor of the next page
+        """
+
+        guild_id: int = int(request.match_info["guild_id"])
+        limit: int = self.get_page_size(request)
+        cursor: Optional[tuple[int, ...]] = self.get_cursor(request, keys)
+
+        # One row more than needed tells if there is a next page.
+        if cursor is None:
+            response: Iterable[DB_RESPONSE] = await self.db.execute_fetchall(
+                first_page, (guild_id, limit + 1)
+            )
+        else:
+            response: Iterable[DB_RESPONSE] = await self.db.execute_fetchall(
+                next_page,
+                (guild_id, *cursor, limit + 1),
+            )
+
+        rows: list[DB_RESPONSE] = list(response)
+        next_cursor: Optional[str] = None
+
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = ",".join(str(value) for value in rows[-1][:keys])
+
+        return {
+            "items": [{column: decode_value(value) for column, value in zip(columns, row)} for row in rows],
+            "next": next_cursor,
+        }
+
+    async def get_config(self, request: web.Request) -> web.Response:
+        guild_id: int = int(request.match_info["guild_id"])
+        config: dict[str, list[dict[str, Any]]] = {}
+
+        for table, columns in self.config_tables.items():
+            response: Iterable[DB_RESPONSE] = await self.db.execute_fetchall(
+                f"SELECT {', '.join(('guild_id',) + columns)} FROM {table} WHERE guild_id = ?",
+                (guild_id,),
+            )
+
+            config[table] = [
+                {column: decode_value(value) for column, value in zip(columns, row[1:])} for row in response
+            ]
+
+        return self.json_response(request, {"guild_id": guild_id, "config": config}, etag=True)
+
+    async def get_economy_leaderboard(self, request: web.Request) -> web.Response:
+        page: dict[str, Any] = await self.get_page(
+            request,
+            "SELECT money + bank_money, user_id, money, bank_money FROM economy_users "
+            "WHERE guild_id = ? ORDER BY money + bank_money DESC, user_id DESC LIMIT ?",
+            # a row value over an expression can't seek the index, this form can
+            "SELECT money + bank_money, user_id, money, bank_money FROM economy_users "
+            "WHERE guild_id = ?1 AND money + bank_money <= ?2 AND (money + bank_money < ?2 OR user_id < ?3) "
+            "ORDER BY money + bank_money DESC, user_id DESC LIMIT ?4",
+            2,
+            ("total", "user_id", "money", "bank_money"),
+        )
+
+        return self.json_response(request, page, etag=True)
+
+    async def get_levels_leaderboard(self, request: web.Request) -> web.Response:
+        page: dict[str, Any] = await self.get_page(
+            request,
+            "SELECT level, xp, user_id FROM levels_users "
+            "WHERE guild_id = ? ORDER BY level DESC, xp DESC, user_id DESC LIMIT ?",
+            "SELECT level, xp, user_id FROM levels_users "
+            "WHERE guild_id = ? AND (level, xp, user_id) < (?, ?, ?) "
+            "ORDER BY level DESC, xp DESC, user_id DESC LIMIT ?",
+            3,
+            ("level", "xp", "user_id"),
+        )
+
+        return self.json_response(request, page, etag=True)
+
+    async def get_economy_users(self, request: web.Request) -> web.Response:
+        page: dict[str, Any] = await self.get_page(
+            request,
+            "SELECT user_id, money, bank_money, items FROM economy_users "
+            "WHERE guild_id = ? ORDER BY user_id LIMIT ?",
+            "SELECT user_id, money, bank_money, items FROM economy_users "
+            "WHERE guild_id = ? AND user_id > ? ORDER BY user_id LIMIT ?",
+            1,
+            ("user_id", "money", "bank_money", "items"),
+        )
+
+        return self.json_response(request, page)
+
+    async def get_warnings(self, request: web.Request) -> web.Response:
+        page: dict[str, Any] = await self.get_page(
+            request,
+            "SELECT user_id, warns FROM warnings WHERE guild_id = ? ORDER BY user_id LIMIT ?",
+            "SELECT user_id, warns FROM warnings WHERE guild_id = ? AND user_id > ? ORDER BY user_id LIMIT ?",
+            1,
+            ("user_id", "warns"),
+        )
+
+        return self.json_response(request, page)
+
+
+class WebServer:
+    __slots__ = ("bot", "port", "app", "runner", "api")
+
+    # The server exposes internal statistics and data without authorization,
+    # so it is never reachable from outside the machine.
+    host: str = "127.0.0.1"
+
+    def __init__(self, bot: Smiffy) -> None:
+        """
+        WebServer is a small aiohttp server running on the bot loop.
+        It serves /metrics in the Prometheus text format and, with WEB_API enabled,
+        the read-only json api under /api. WEB_PORT = 0 disables it.
+
+        :param bot: Bot instance
+        :return: None
+        """
+
+        self.bot: Smiffy = bot
+        self.port: int = bot_utils.get_value_from_config("WEB_PORT", 0)
+
+        self.app: web.Application = web.Application()
+        self.app.router.add_get("/metrics", self.metrics)
+
+        self.runner: Optional[web.AppRunner] = None
+        self.api: Optional[ReadOnlyApi] = None
+
+    async def start(self) -> None:
+        """
+        The start function starts listening on WEB_PORT.
+
+        :return: None
+        """
+
+        if not self.port:
+            return
+
+        if bot_utils.get_value_from_config("WEB_API", True):
+            self.api = await ReadOnlyApi.setup()
+            self.api.add_routes(self.app)
+
+        self.runner = web.AppRunner(self.app, access_log=None)
+        await self.runner.setup()
+
+        site: web.TCPSite = web.TCPSite(self.runner, self.host, self.port)
+
+        try:
+            await site.start()
+        except OSError as e:
+            self.bot.logger.error("Web server could not listen on %s:%s: %s", self.host, self.port, e)
+            await self.stop()
+            return
+
+        self.bot.logger.info("Web server is listening on %s:%s.", self.host, self.port)
+
+    async def stop(self) -> None:
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
+
+        if self.api:
+            await self.api.close()
+            self.api = None
+
+    def get_caches(self) -> dict[str, Any]:
+        caches: dict[str, Any] = {
+            "music_settings": self.bot.music_settings,
+            "command_permissions": self.bot.command_permissions,
+            "autocomplete": self.bot.autocomplete,
+            "image_pool": self.bot.image_pool,
+        }
+
+        if getattr(self.bot, "session", None):
+            caches["api_responses"] = self.bot.session.cache
+
+        return caches
+
+    def collect_metrics(self) -> bytes:
+        """
+        The collect_metrics function reads the counters kept by the bot managers.
+        Nothing is computed in the hot paths, so a scrape costs only this function.
+
+        :return: Metrics in the Prometheus text format
+        """
+
+        writer: MetricsWriter = MetricsWriter()
+
+        writer.add_histogram(
+            "smiffy_event_handler_seconds",
+            "Latency of the event handlers.",
+            (
+                ({"event": event, "handler": handler}, histogram)
+                for (event, handler), histogram in self.bot.event_latencies.items()
+            ),
+        )
+
+        writer.add_histogram(
+            "smiffy_db_query_seconds",
+            "Latency and count of the database queries by statement.",
+            (
+                ({"statement": " ".join(statement.split())}, histogram)
+                for statement, histogram in self.bot.db.queries.items()
+            ),
+        )
+
+        if getattr(self.bot, "session", None):
+            hosts = self.bot.session.hosts.values()
+
+            writer.add_histogram(
+                "smiffy_http_request_seconds",
+                "Latency and count of the HTTP requests by host.",
+                (({"host": host.host}, host.latency) for host in hosts),
+            )
+            writer.add(
+                "smiffy_http_errors_total",
+                "counter",
+                "Failed HTTP requests by host and error.",
+                (
+                    ({"host": host.host, "error": error}, count)
+                    for host in hosts
+                    for error, count in host.errors.items()
+                ),
+            )
+            writer.add(
+                "smiffy_http_circuit_open",
+                "gauge",
+                "1 if the circuit breaker of the host is open.",
+                (({"host": host.host}, int(host.is_open)) for host in hosts),
+            )
+
+        if self.bot.loop_monitor.running:
+            writer.add_histogram(
+                "smiffy_event_loop_lag_seconds",
+                "Delay of the event loop wakeups.",
+                (({}, self.bot.loop_monitor.lag),),
+            )
+            writer.add(
+                "smiffy_event_loop_blocks_total",
+                "counter",
+                "Times the event loop was blocked for longer than LOOP_MONITOR_THRESHOLD.",
+                (({}, self.bot.loop_monitor.blocks),),
+            )
+
+        writer.add(
+            "smiffy_gateway_latency_seconds",
+            "gauge",
+            "Heartbeat latency of the shards.",
+            (({"shard": str(shard_id)}, latency) for shard_id, latency in self.bot.latencies),
+        )
+
+        if getattr(self.bot, "pool", None):
+            nodes = self.bot.pool.label_to_node.items()
+
+            writer.add(
+                "smiffy_lavalink_node_available",
+                "gauge",
+                "1 if the Lavalink node is available.",
+                (({"node": label}, int(node.available)) for label, node in nodes),
+            )
+            writer.add(
+                "smiffy_lavalink_players",
+                "gauge",
+                "Players connected to the Lavalink node.",
+                (({"node": label}, len(node.players)) for label, node in nodes),
+            )
+            writer.add(
+                "smiffy_lavalink_playing_players",
+                "gauge",
+                "Players playing a track.",
+                (
+                    (
+                        {"node": label},
+                        sum(1 for player in node.players if player.current and not player.paused),
+                    )
+                    for label, node in nodes
+                ),
+            )
+
+        caches: dict[str, Any] = self.get_caches()
+
+        writer.add(
+            "smiffy_cache_hits_total",
+            "counter",
+            "Cache hits.",
+            (({"cache": name}, cache.hits) for name, cache in caches.items()),
+        )
+        writer.add(
+            "smiffy_cache_misses_total",
+            "counter",
+            "Cache misses.",
+            (({"cache": name}, cache.misses) for name, cache in caches.items()),
+        )
+        writer.add(
+            "smiffy_cache_hit_ratio",
+            "gauge",
+            "Hits divided by all lookups since the start.",
+            (
+                ({"cache": name}, cache.hits / (cache.hits + cache.misses))
+                for name, cache in caches.items()
+                if cache.hits + cache.misses
+            ),
+        )
+
+        writer.add(
+            "smiffy_guilds",
+            "gauge",
+            "Guilds the bot is in.",
+            (({}, len(self.bot.guilds)),),
+        )
+
+        return writer.render()
+
+    async def metrics(self, request: web.Request) -> web.Response:  # pylint: disable=unused-argument
+        return web.Response(
+            body=self.collect_metrics(),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+        )
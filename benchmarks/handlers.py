@@ -0,0 +1,669 @@
+"""
+Latency and throughput of the message, reaction and member join handlers.
+
+The cogs run inside a real bot against a temporary copy of the database schema seeded with
+synthetic guilds and users. Discord REST calls go to a local fake API, so the numbers only include
+the bot, nextcord and SQLite - compare them between commits, not with production.
+
+Usage (from the repository root):
+    python -m benchmarks.handlers --guilds 50 --users 1000 --events 2000
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser, Namespace
+from asyncio import Semaphore, gather, sleep
+from collections import Counter
+from datetime import datetime, timezone
+from itertools import count
+from json import dumps
+from math import ceil
+from os import path
+from platform import python_version
+from random import Random
+from re import sub
+from sqlite3 import connect
+from subprocess import run
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, Awaitable, Callable, ClassVar, Iterator, Optional
+
+from aiohttp import web
+from nextcord import Guild, Member, Message, PartialEmoji, RawReactionActionEvent, TextChannel
+from nextcord.http import Route
+
+from bot import Smiffy
+from utilities import BotBase, Database, InviteTracker, LogSink, bot_logger, bot_utils
+
+SCHEMA_PATH: str = "./Data/database.db"
+
+# @everyone: view channels, send messages, add reactions
+MEMBER_PERMISSIONS: int = 1024 | 2048 | 64
+ADMINISTRATOR: int = 8
+
+REACTION_EMOJIS: tuple[str, ...] = ("👍", "🔥", "⭐")
+GIVEAWAY_EMOJI: str = "🎉"
+WORDS: tuple[str, ...] = ("siema", "co", "tam", "gramy", "dzisiaj", "mecz", "bot", "serwer", "jutro", "ok")
+
+
+def timestamp() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def user_payload(user_id: int, bot: bool = False) -> dict[str, Any]:
+    return {
+        "id": str(user_id),
+        "username": f"user{user_id % 100_000}",
+        "global_name": None,
+        "discriminator": "0",
+        "avatar": None,
+        "bot": bot,
+    }
+
+
+def member_payload(user_id: int, roles: list[int], bot: bool = False) -> dict[str, Any]:
+    return {
+        "user": user_payload(user_id, bot),
+        "roles": [str(role_id) for role_id in roles],
+        "joined_at": timestamp(),
+        "deaf": False,
+        "mute": False,
+    }
+
+
+def message_payload(
+    message_id: int,
+    channel_id: int,
+    author_id: int,
+    content: str = "",
+    guild_id: Optional[int] = None,
+    roles: Optional[list[int]] = None,
+    bot: bool = False,
+) -> dict[str, Any]:
+    data: dict[str, Any] = {
+        "id": str(message_id),
+        "channel_id": str(channel_id),
+        "author": user_payload(author_id, bot),
+        "content": content,
+        "timestamp": timestamp(),
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "reactions": [],
+        "pinned": False,
+        "type": 0,
+    }
+
+    if guild_id is not None:
+        data["guild_id"] = str(guild_id)
+        data["member"] = member_payload(author_id, roles or [])
+        del data["member"]["user"]
+
+    return data
+
+
+def json_response(data: Any, status: int = 200) -> web.Response:
+    # nextcord decodes only the exact content type sent by Discord, without the charset
+    return web.Response(body=dumps(data), status=status, headers={"Content-Type": "application/json"})
+
+
+class FakeDiscordApi:
+    def __init__(self, bot_id: int, latency: float) -> None:
+        self.bot_id: int = bot_id
+        self.latency: float = latency
+        self.ids: Iterator[int] = count(9 * 10**17)
+
+        # "METHOD /route/{id}" -> number of requests
+        self.requests: Counter[str] = Counter()
+
+        # guild_id -> uses of the fake invite, every fetch reports one more join
+        self.invite_uses: Counter[int] = Counter()
+
+        self.runner: Optional[web.AppRunner] = None
+
+        # "METHOD /route/{id}" -> response data, None for 204 No Content
+        self.routes: dict[str, Callable[[list[str], Any], Any]] = {
+            "GET /users/@me": lambda *_: user_payload(self.bot_id, bot=True),
+            "POST /users/@me/channels": self.create_dm,
+            "GET /guilds/{id}/members/{id}": lambda parts, _: member_payload(int(parts[3]), []),
+            "GET /guilds/{id}/invites": self.get_invites,
+            "GET /channels/{id}/messages": lambda *_: [],
+            "GET /channels/{id}/messages/{id}": lambda parts, _: message_payload(
+                int(parts[3]), int(parts[1]), self.bot_id, bot=True
+            ),
+            "POST /channels/{id}/messages": self.create_message,
+            "PATCH /channels/{id}/messages/{id}": self.create_message,
+            "GET /channels/{id}/webhooks": lambda *_: [],
+            "POST /channels/{id}/webhooks": self.create_webhook,
+            "POST /webhooks/{id}/bench": lambda parts, _: message_payload(
+                next(self.ids), 0, int(parts[1]), bot=True
+            ),
+        }
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_route("*", "/api/v10/{route:.*}", self.handle)
+
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+
+        port: int = self.runner.addresses[0][1]
+        return f"http://127.0.0.1:{port}/api/v10"
+
+    async def stop(self) -> None:
+        if self.runner:
+            await self.runner.cleanup()
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        parts: list[str] = request.match_info["route"].split("/")
+        route: str = f"{request.method} /{sub(r'[0-9]+', '{id}', '/'.join(parts))}"
+        route = sub("/reactions/[^/]+", "/reactions/{emoji}", route)
+
+        self.requests[route] += 1
+
+        if self.latency:
+            await sleep(self.latency)
+
+        if request.method in ("PUT", "DELETE"):
+            # Roles, reactions and message deletes
+            return web.Response(status=204)
+
+        if route not in self.routes:
+            return json_response({"message": "Unknown Route", "code": 0}, status=404)
+
+        body: Any = await request.json() if request.content_type == "application/json" else None
+
+        return json_response(self.routes[route](parts, body))
+
+    def create_dm(self, _: list[str], body: dict[str, Any]) -> dict[str, Any]:
+        return {"id": str(next(self.ids)), "type": 1, "recipients": [user_payload(int(body["recipient_id"]))]}
+
+    def get_invites(self, parts: list[str], _: Any) -> list[dict[str, Any]]:
+        guild_id: int = int(parts[1])
+        self.invite_uses[guild_id] += 1
+
+        return [
+            {
+                "code": f"bench{guild_id}",
+                "uses": self.invite_uses[guild_id],
+                "max_uses": 0,
+                "max_age": 0,
+                "temporary": False,
+                "created_at": timestamp(),
+                "inviter": user_payload(10**17),
+                "guild": {"id": str(guild_id), "name": "bench"},
+                "channel": {"id": "0", "name": "bench", "type": 0},
+            }
+        ]
+
+    def create_message(self, parts: list[str], _: Any) -> dict[str, Any]:
+        return message_payload(next(self.ids), int(parts[1]), self.bot_id, bot=True)
+
+    def create_webhook(self, parts: list[str], _: Any) -> dict[str, Any]:
+        return {
+            "id": str(next(self.ids)),
+            "type": 1,
+            "name": LogSink.webhook_name,
+            "channel_id": parts[1],
+            "token": "bench",
+            "user": user_payload(self.bot_id, bot=True),
+        }
+
+
+class BenchGuild:
+    def __init__(self, index: int, ids: Iterator[int]) -> None:
+        self.index: int = index
+        self.id: int = next(ids)
+
+        self.general_id: int = next(ids)
+        self.suggestions_id: int = next(ids)
+        self.logs_id: int = next(ids)
+
+        self.bot_role_id: int = next(ids)
+        self.booster_role_id: int = next(ids)
+        self.start_role_id: int = next(ids)
+        self.level_roles: dict[int, int] = {2: next(ids), 5: next(ids)}
+        self.reaction_roles: dict[str, int] = {emoji: next(ids) for emoji in REACTION_EMOJIS}
+
+        self.reactionroles_message_id: int = next(ids)
+        self.giveaway_message_id: int = next(ids)
+
+    @property
+    def antylink(self) -> bool:
+        return self.index % 2 == 0
+
+    @property
+    def antyflood(self) -> bool:
+        return self.index % 5 == 4
+
+    @property
+    def autoresponder(self) -> bool:
+        return self.index % 3 != 2
+
+    @property
+    def logs(self) -> bool:
+        return self.index % 2 == 1
+
+    @property
+    def invites(self) -> bool:
+        return self.index % 4 == 0
+
+    def payload(self, bot_id: int) -> dict[str, Any]:
+        roles: list[tuple[int, str, int]] = [
+            (self.id, "@everyone", MEMBER_PERMISSIONS),
+            (self.bot_role_id, "Smiffy", ADMINISTRATOR),
+            (self.booster_role_id, "Booster", 0),
+            (self.start_role_id, "Nowy", 0),
+            *((role_id, f"Level {level}", 0) for level, role_id in self.level_roles.items()),
+            *((role_id, f"Reakcja {emoji}", 0) for emoji, role_id in self.reaction_roles.items()),
+        ]
+        channels: list[tuple[int, str]] = [
+            (self.general_id, "ogolny"),
+            (self.suggestions_id, "propozycje"),
+            (self.logs_id, "logi"),
+        ]
+
+        return {
+            "id": str(self.id),
+            "name": f"Serwer {self.index}",
+            "owner_id": str(10**17),
+            "member_count": 0,
+            "features": [],
+            "emojis": [],
+            "stickers": [],
+            "roles": [
+                {
+                    "id": str(role_id),
+                    "name": name,
+                    "permissions": str(permissions),
+                    "position": len(roles) - position if position else 0,
+                    "color": 0,
+                    "hoist": False,
+                    "managed": False,
+                    "mentionable": False,
+                }
+                for position, (role_id, name, permissions) in enumerate(roles)
+            ],
+            "channels": [
+                {
+                    "id": str(channel_id),
+                    "type": 0,
+                    "name": name,
+                    "position": position,
+                    "permission_overwrites": [],
+                    "guild_id": str(self.id),
+                }
+                for position, (channel_id, name) in enumerate(channels)
+            ],
+            "members": [member_payload(bot_id, [self.bot_role_id], bot=True)],
+        }
+
+    def rows(self, users: list[int], random: Random) -> dict[str, list[tuple]]:
+        rows: dict[str, list[tuple]] = {
+            "levels": [
+                (
+                    self.id,
+                    str(self.level_roles),
+                    str(
+                        {
+                            "type": "channel",
+                            "channel_id": self.general_id,
+                            "notify_content": "{user.mention} ma {level} lvl",
+                        }
+                    ),
+                    str({self.booster_role_id: 10}),
+                )
+            ],
+            "levels_users": [
+                (self.id, user_id, level, random.randrange(level * 50))
+                for user_id in users
+                if random.random() < 0.8
+                for level in (random.randint(1, 6),)
+            ],
+            "suggestions": [(self.id, self.suggestions_id, "off")],
+            "startrole": [(self.id, self.start_role_id)],
+            "reactionroles": [
+                (self.id, self.general_id, self.reactionroles_message_id, role_id, emoji)
+                for emoji, role_id in self.reaction_roles.items()
+            ],
+            "giveaways": [
+                (
+                    self.id,
+                    self.general_id,
+                    self.giveaway_message_id,
+                    str(2**31),
+                    "Nitro",
+                    1,
+                    str(10**17),
+                    str({"lvl": 3}),
+                )
+            ],
+        }
+
+        if self.antylink:
+            rows["antylink"] = [(self.id, "brak")]
+
+        if self.antyflood:
+            rows["antyflood"] = [(self.id, 3)]
+
+        if self.autoresponder:
+            rows["autoresponder"] = [
+                (self.id, "smiffy", "in", "Jestem!", None),
+                (self.id, "hej", "start", "Hej!", None),
+                (self.id, "pomocy", "equals", "Użyj /pomoc", None),
+            ]
+
+        if self.logs:
+            rows["server_logs"] = [(self.id, self.logs_id)]
+
+        if self.invites:
+            rows["server_invites"] = [
+                (
+                    self.id,
+                    "[]",
+                    0,
+                    str({"notify_channel": self.general_id, "notify_content": "{user} od {inviter}"}),
+                )
+            ]
+
+        return rows
+
+
+def create_database(db_path: str, guilds: list[BenchGuild], users: list[int], random: Random) -> None:
+    with connect(SCHEMA_PATH) as schema_connection:
+        statements: list[str] = [
+            sql
+            for (sql,) in schema_connection.execute(
+                "SELECT sql FROM sqlite_master WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%' "
+                "ORDER BY type = 'index'"
+            )
+        ]
+
+    schema_connection.close()
+
+    with connect(db_path) as connection:
+        for statement in statements:
+            connection.execute(statement)
+
+        for guild in guilds:
+            for table, rows in guild.rows(users, random).items():
+                if rows:
+                    connection.executemany(
+                        f"INSERT INTO {table} VALUES({', '.join('?' * len(rows[0]))})",
+                        rows,
+                    )
+
+    connection.close()
+
+
+class BenchBot(BotBase):
+    __version__: ClassVar[str] = Smiffy.__version__
+
+    def __init__(self, db_path: str, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+
+        self.logger = bot_logger.get_logger
+        self.db: Database = Database.setup(bot=self, db_path=db_path)  # pyright: ignore
+        self.invite_tracker: InviteTracker = InviteTracker(bot=self)  # pyright: ignore
+        self.log_sink: LogSink = LogSink(bot=self)  # pyright: ignore
+
+        for extension in ("Events.OnMessage", "Events.ReactionUpdate", "Events.MemberJoin"):
+            self.load_extension(extension)
+
+
+class Benchmark:
+    def __init__(self, args: Namespace, db_path: str) -> None:
+        self.args: Namespace = args
+
+        self.random: Random = Random(args.seed)
+        self.ids: Iterator[int] = count(10**18)
+        self.users: list[int] = list(range(10**17, 10**17 + args.users))
+        self.guilds: list[BenchGuild] = [BenchGuild(index, self.ids) for index in range(args.guilds)]
+
+        # Join events use accounts which aren't members of any guild yet
+        self.new_users: Iterator[int] = count(10**17 + args.users)
+
+        create_database(db_path, self.guilds, self.users, self.random)
+
+        settings: dict[str, Any] = dict(bot_utils.get_bot_settings)  # pyright: ignore
+        settings["chunk_guilds_at_startup"] = False
+
+        self.bot: BenchBot = BenchBot(db_path, **settings)
+        self.api: FakeDiscordApi = FakeDiscordApi(bot_id=10**16, latency=args.http_latency / 1000)
+
+    def get_roles(self, guild: BenchGuild, user_id: int) -> list[int]:
+        return [guild.booster_role_id] if user_id % 10 == 0 else []
+
+    def add_guilds(self) -> None:
+        assert self.bot.user
+
+        for bench_guild in self.guilds:
+            guild: Guild = self.bot._connection._add_guild_from_data(  # pylint: disable=protected-access
+                bench_guild.payload(self.bot.user.id)  # pyright: ignore
+            )
+
+            # The member cache is never complete in production, fetch_member fills the gaps
+            for user_id in self.random.sample(self.users, int(len(self.users) * self.args.cached)):
+                member = Member(
+                    data=member_payload(user_id, self.get_roles(bench_guild, user_id)),  # pyright: ignore
+                    guild=guild,
+                    state=self.bot._connection,  # pylint: disable=protected-access
+                )
+                guild._add_member(member)  # pylint: disable=protected-access
+
+            guild._member_count = len(self.users) + 1  # pylint: disable=protected-access
+
+    def get_channel(self, channel_id: int) -> TextChannel:
+        channel = self.bot.get_channel(channel_id)
+        assert isinstance(channel, TextChannel)
+
+        return channel
+
+    def create_message(self) -> Message:
+        guild: BenchGuild = self.random.choice(self.guilds)
+        user_id: int = self.random.choice(self.users)
+        channel_id: int = guild.suggestions_id if self.random.random() < 0.03 else guild.general_id
+
+        content: str = " ".join(self.random.choices(WORDS, k=self.random.randint(1, 12)))
+        chance: float = self.random.random()
+
+        if chance < 0.05:
+            content += " https://discord.gg/smiffy"
+        elif chance < 0.15:
+            content = f"hej {content}"
+        elif chance < 0.2:
+            content += " smiffy"
+
+        return Message(
+            state=self.bot._connection,  # pylint: disable=protected-access
+            channel=self.get_channel(channel_id),
+            data=message_payload(  # pyright: ignore
+                next(self.ids),
+                channel_id,
+                user_id,
+                content,
+                guild.id,
+                self.get_roles(guild, user_id),
+            ),
+        )
+
+    def create_reaction(self) -> RawReactionActionEvent:
+        guild: BenchGuild = self.random.choice(self.guilds)
+        chance: float = self.random.random()
+
+        if chance < 0.45:
+            message_id, emoji = guild.reactionroles_message_id, self.random.choice(REACTION_EMOJIS)
+        elif chance < 0.9:
+            message_id, emoji = guild.giveaway_message_id, GIVEAWAY_EMOJI
+        else:
+            message_id, emoji = next(self.ids), self.random.choice(REACTION_EMOJIS)
+
+        return RawReactionActionEvent(
+            {  # pyright: ignore
+                "message_id": str(message_id),
+                "channel_id": str(guild.general_id),
+                "user_id": str(self.random.choice(self.users)),
+                "guild_id": str(guild.id),
+            },
+            PartialEmoji(name=emoji),
+            "REACTION_ADD",
+        )
+
+    def create_member(self) -> Member:
+        guild: Optional[Guild] = self.bot.get_guild(self.random.choice(self.guilds).id)
+        assert guild
+
+        return Member(
+            data=member_payload(next(self.new_users), []),  # pyright: ignore
+            guild=guild,
+            state=self.bot._connection,  # pylint: disable=protected-access
+        )
+
+    async def member_join(self, member: Member) -> None:
+        # What the gateway MEMBER_ADD parser does before dispatching the event
+        member.guild._add_member(member)  # pylint: disable=protected-access
+        member.guild._member_count += 1  # pylint: disable=protected-access
+
+        await self.bot.get_cog("MemberJoin").on_member_join(member)  # pyright: ignore
+
+    def count_queries(self) -> int:
+        return sum(histogram.count for histogram in self.bot.db.queries.values())
+
+    async def measure(
+        self,
+        handler: Callable[[Any], Awaitable[Any]],
+        create_event: Callable[[], Any],
+    ) -> dict[str, Any]:
+        for _ in range(self.args.warmup):
+            await handler(create_event())
+
+        events: list[Any] = [create_event() for _ in range(self.args.events)]
+        latencies: list[float] = []
+        errors: int = 0
+
+        requests_before: Counter[str] = self.api.requests.copy()
+        queries_before: int = self.count_queries()
+        semaphore: Semaphore = Semaphore(self.args.concurrency)
+
+        async def run_event(event: Any) -> None:
+            nonlocal errors
+
+            async with semaphore:
+                started_at: float = perf_counter()
+
+                try:
+                    await handler(event)
+                except Exception:  # pylint: disable=broad-exception-caught
+                    errors += 1
+                    self.bot.logger.exception("Benchmark event failed.")
+
+                latencies.append(perf_counter() - started_at)
+
+        started_at: float = perf_counter()
+        await gather(*(run_event(event) for event in events))
+        elapsed: float = perf_counter() - started_at
+
+        latencies.sort()
+        requests: Counter[str] = self.api.requests - requests_before
+
+        return {
+            "events": len(events),
+            "errors": errors,
+            "seconds": round(elapsed, 3),
+            "throughput_per_s": round(len(events) / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 0.5) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+            "max_ms": round(latencies[-1] * 1000, 3),
+            "db_queries": self.count_queries() - queries_before,
+            "http_requests": dict(requests.most_common()),
+        }
+
+    async def run(self) -> dict[str, Any]:
+        Route.BASE = await self.api.start()
+
+        try:
+            await self.bot.login("bench")
+            self.add_guilds()
+
+            results: dict[str, Any] = {
+                "on_message": await self.measure(
+                    self.bot.get_cog("OnMessageEvent").on_message,  # pyright: ignore
+                    self.create_message,
+                ),
+                "on_raw_reaction_add": await self.measure(
+                    self.bot.get_cog("ReactionUpdateEvent").on_raw_reaction_add,  # pyright: ignore
+                    self.create_reaction,
+                ),
+                "on_member_join": await self.measure(self.member_join, self.create_member),
+            }
+
+            if self.bot.log_sink.flush_handles:
+                # Let the buffered logs go out before the HTTP session is closed
+                await sleep(self.bot.log_sink.flush_delay + 0.5)
+
+        finally:
+            await self.bot.close()
+            await self.api.stop()
+
+        return results
+
+
+def percentile(latencies: list[float], quantile: float) -> float:
+    # Nearest-rank percentile of sorted latencies
+    return latencies[max(ceil(quantile * len(latencies)) - 1, 0)] if latencies else 0.0
+
+
+def get_commit() -> Optional[str]:
+    try:
+        result = run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=False)
+    except OSError:
+        return None
+
+    return result.stdout.strip() or None
+
+
+def main() -> None:
+    parser = ArgumentParser()
+    parser.add_argument("--guilds", type=int, default=50)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=2000, help="measured events per handler")
+    parser.add_argument("--warmup", type=int, default=100, help="unmeasured events per handler")
+    parser.add_argument("--concurrency", type=int, default=1, help="events handled at the same time")
+    parser.add_argument("--cached", type=float, default=0.25, help="part of the members in the cache")
+    parser.add_argument("--http-latency", type=float, default=0.0, help="fake Discord API latency in ms")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as directory:
+        benchmark: Benchmark = Benchmark(args, path.join(directory, "database.db"))
+
+        try:
+            handlers: dict[str, Any] = benchmark.bot.loop.run_until_complete(benchmark.run())
+        finally:
+            benchmark.bot.db.close()
+            bot_logger.close()
+
+    results: dict[str, Any] = {
+        "commit": get_commit(),
+        "python": python_version(),
+        "guilds": args.guilds,
+        "users": args.users,
+        "cached": args.cached,
+        "concurrency": args.concurrency,
+        "http_latency_ms": args.http_latency,
+        "seed": args.seed,
+        "handlers": handlers,
+    }
+
+    print(dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Lookup cost of MemberNameIndex compared to a linear scan of the member cache.
+
+Usage (from the repository root):
+    python -m benchmarks.member_names --members 100000
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from json import dumps
+from random import Random
+from string import ascii_lowercase
+from time import perf_counter
+from types import SimpleNamespace
+from typing import Any, Callable, Optional
+
+from utilities import MemberNameIndex
+
+
+class FakeBot:
+    def add_listener(self, func: Callable, name: str) -> None:
+        pass
+
+
+class FakeGuild:
+    def __init__(self, members: list[SimpleNamespace]) -> None:
+        self.id: int = 1
+        self._members: dict[int, SimpleNamespace] = {member.id: member for member in members}
+
+    def get_member(self, member_id: int) -> Optional[SimpleNamespace]:
+        return self._members.get(member_id)
+
+
+def create_members(amount: int, seed: int) -> list[SimpleNamespace]:
+    random: Random = Random(seed)
+    members: list[SimpleNamespace] = []
+
+    for member_id in range(10**17, 10**17 + amount):
+        name: str = "".join(random.choices(ascii_lowercase, k=random.randint(4, 14)))
+
+        members.append(
+            SimpleNamespace(
+                id=member_id,
+                name=name,
+                discriminator="0",
+                nick=name.upper() if random.random() < 0.2 else None,
+                global_name=name.title() if random.random() < 0.5 else None,
+            )
+        )
+
+    return members
+
+
+def linear_get_member_named(guild: FakeGuild, name: str) -> Optional[Any]:
+    # Guild.get_member_named without the discriminator branch
+    for member in list(guild._members.values()):
+        if name in (member.nick, member.name):
+            return member
+
+    return None
+
+
+def measure(func: Callable[[], Any], repeat: int) -> float:
+    started_at: float = perf_counter()
+
+    for _ in range(repeat):
+        func()
+
+    return (perf_counter() - started_at) / repeat * 1_000_000
+
+
+def main() -> None:
+    parser = ArgumentParser()
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    members: list[SimpleNamespace] = create_members(args.members, args.seed)
+    guild: FakeGuild = FakeGuild(members)
+    index: MemberNameIndex = MemberNameIndex(FakeBot())  # pyright: ignore
+
+    started_at: float = perf_counter()
+    index.get_guild(guild)  # pyright: ignore
+    build_ms: float = (perf_counter() - started_at) * 1000
+
+    last_name: str = members[-1].name
+
+    results: dict[str, Any] = {
+        "members": args.members,
+        "index_build_ms": round(build_ms, 2),
+        "lookup_us": {
+            "linear_last_member": measure(lambda: linear_get_member_named(guild, last_name), args.repeat),
+            "linear_missing": measure(lambda: linear_get_member_named(guild, "missing member"), args.repeat),
+            "index_last_member": measure(
+                lambda: index.get_member_named(guild, last_name), args.repeat  # pyright: ignore
+            ),
+            "index_missing": measure(
+                lambda: index.get_member_named(guild, "missing member"), args.repeat  # pyright: ignore
+            ),
+        },
+    }
+
+    results["lookup_us"] = {name: round(value, 2) for name, value in results["lookup_us"].items()}
+    print(dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,25 @@
 from typing import ClassVar
 
+from Web.app import WebServer
 from typings import Bot_Settings, BotLogger
-from utilities import BotBase, CircuitBreaker, Database, bot_logger, bot_utils
+from utilities import (
+    AutocompleteService,
+    BotBase,
+    BulkActions,
+    CircuitBreaker,
+    Database,
+    GlobalBans,
+    HelpIndex,
+    ImagePool,
+    InviteTracker,
+    LogSink,
+    LoopMonitor,
+    MemberNameIndex,
+    MusicSettingsCache,
+    PermissionsCache,
+    bot_logger,
+    bot_utils,
+)
 
 
 class Smiffy(BotBase):
@@ -20,10 +38,28 @@ class Smiffy(BotBase):
 
         self.logger: BotLogger = bot_logger.get_logger
         self.db: Database = Database.setup(bot=self)
+        self.global_bans: GlobalBans = GlobalBans.setup(bot=self)
         self.circuit_breaker: CircuitBreaker = CircuitBreaker(client=self)
+        self.music_settings: MusicSettingsCache = MusicSettingsCache(bot=self)
+        self.command_permissions: PermissionsCache = PermissionsCache(bot=self)
+        self.invite_tracker: InviteTracker = InviteTracker(bot=self)
+        self.log_sink: LogSink = LogSink(bot=self)
+        self.bulk_actions: BulkActions = BulkActions(bot=self)
+        self.image_pool: ImagePool = ImagePool(bot=self)
+        self.help_index: HelpIndex = HelpIndex(bot=self)
+        self.member_names: MemberNameIndex = MemberNameIndex(bot=self)
+        self.autocomplete: AutocompleteService = AutocompleteService(bot=self)
+        self.loop_monitor: LoopMonitor = LoopMonitor(bot=self)
+        self.web_server: WebServer = WebServer(bot=self)
 
         bot_utils.load_cogs(bot=self)
         self.loop.create_task(bot_utils.set_activity(bot=self))
+        self.loop.create_task(self.invite_tracker.migrate_edges())
+        self.loop.create_task(self.log_http_stats())
+        self.loop.create_task(self.loop_monitor.run())
+        self.loop.create_task(self.web_server.start())
+        self.add_startup_task(self.bulk_actions.resume)
+        self.add_startup_task(self.image_pool.fill)
 
     async def on_ready(self) -> None:
         """
@@ -33,6 +69,7 @@ class Smiffy(BotBase):
         :return: None
         """
         bot_utils.print_welcome_message(bot=self)
+        self.loop.create_task(self.run_startup_tasks())
 
     async def on_connect(self) -> None:
         """
@@ -48,8 +85,19 @@ class Smiffy(BotBase):
 
         self.logger.info(f"Shard #{len(self.shards)} has been connected to Discord API.")
 
+    async def close(self) -> None:
+        """
+        The close function stops the web server before closing the connection to Discord.
+
+        :return: None
+        """
+
+        await self.web_server.stop()
+        await super().close()
+
 
 if __name__ == "__main__":
     bot = Smiffy(**bot_utils.get_bot_settings)
     bot.run(bot_utils.get_token)
     bot.db.close()
+    bot_logger.close()
@@ -25,6 +25,17 @@ if TYPE_CHECKING:
 
 CT = TypeVar("CT", bound=GuildChannel)
 
+_ID_REGEX: re.Pattern = re.compile(r"([0-9]{15,20})$")
+_MEMBER_MENTION_REGEX: re.Pattern = re.compile(r"<@!?([0-9]{15,20})>$")
+_ROLE_MENTION_REGEX: re.Pattern = re.compile(r"<@&([0-9]{15,20})>$")
+_CHANNEL_MENTION_REGEX: re.Pattern = re.compile(r"<#([0-9]{15,20})>$")
+_MESSAGE_ID_REGEX: re.Pattern = re.compile(r"(?:(?P<channel_id>[0-9]{15,20})-)?(?P<message_id>[0-9]{15,20})$")
+_MESSAGE_LINK_REGEX: re.Pattern = re.compile(
+    r"https?://(?:(ptb|canary|www)\.)?discord(?:app)?\.com/channels/"
+    r"(?P<guild_id>[0-9]{15,20}|@me)"
+    r"/(?P<channel_id>[0-9]{15,20})/(?P<message_id>[0-9]{15,20})/?$"
+)
+
 __all__: tuple[str, ...] = (
     "MessageConverter",
     "RoleConverter",
@@ -38,8 +49,6 @@ class BaseConverter(OptionConverter, ABC):
     def _get_id_match(
         argument: str,
     ) -> Optional[re.Match]:
-        _ID_REGEX: re.Pattern = re.compile(r"([0-9]{15,20})$")
-
         return _ID_REGEX.match(argument)
 
     @staticmethod
@@ -49,15 +58,7 @@ class BaseConverter(OptionConverter, ABC):
     ) -> Optional[tuple[Optional[int], ...]]:
         assert interaction.guild
 
-        id_regex: re.Pattern = re.compile(r"(?:(?P<channel_id>[0-9]{15,20})-)?(?P<message_id>[0-9]{15,20})$")
-
-        link_regex: re.Pattern = re.compile(
-            r"https?://(?:(ptb|canary|www)\.)?discord(?:app)?\.com/channels/"
-            r"(?P<guild_id>[0-9]{15,20}|@me)"
-            r"/(?P<channel_id>[0-9]{15,20})/(?P<message_id>[0-9]{15,20})/?$"
-        )
-
-        match: Optional[re.Match] = id_regex.match(argument) or link_regex.match(argument)
+        match: Optional[re.Match] = _MESSAGE_ID_REGEX.match(argument) or _MESSAGE_LINK_REGEX.match(argument)
 
         if not match:
             return None
@@ -115,7 +116,7 @@ class RoleConverter(BaseConverter):
         if not guild:
             return None
 
-        match: Optional[re.Match] = self._get_id_match(value) or re.match(r"<@&([0-9]{15,20})>$", value)
+        match: Optional[re.Match] = self._get_id_match(value) or _ROLE_MENTION_REGEX.match(value)
 
         if match:
             result: Optional[Role] = await interaction.bot.getch_role(guild, int(match.group(1)))
@@ -161,7 +162,7 @@ class MessageConverter(BaseConverter):
         try:
             return await channel.fetch_message(message_id)
         except Exception as exception:  # pylint: disable=broad-exception-caught
-            bot.logger.debug(f"An error was received while fetching the message: {exception} | {self}")
+            bot.logger.debug("An error was received while fetching the message: %s | %s", exception, self)
 
         return None
 
@@ -236,13 +237,15 @@ class MemberConverter(BaseConverter):
 
         result: Optional[Member] = None
         user_id: Optional[int] = None
-        match: Optional[re.Match] = self._get_id_match(value) or re.match(r"<@!?([0-9]{15,20})>$", value)
+        match: Optional[re.Match] = self._get_id_match(value) or _MEMBER_MENTION_REGEX.match(value)
 
         if match is None:
             # not a mention...
-            result = guild.get_member_named(value)
+            result = bot.member_names.get_member_named(guild, value)
 
         else:
+            user_id = int(match.group(1))
+
             if interaction.message:
                 result = utils.get(
                     interaction.message.mentions,
@@ -250,7 +253,6 @@ class MemberConverter(BaseConverter):
                 )  # pyright: ignore
 
             if not result:
-                user_id = int(match.group(1))
                 result = await bot.getch_member(guild, user_id)
 
         if result is None:
@@ -271,8 +273,6 @@ class GuildChannelConverter(Generic[CT]):
         return self
 
     def __init__(self):
-        self._ID_REGEX = re.compile(r"([0-9]{15,20})$")
-
         self.channel_type: Optional[GuildChannelTypes] = None
 
     def convert(
@@ -290,8 +290,9 @@ class GuildChannelConverter(Generic[CT]):
             self.channel_type.value,  # pyright: ignore
         )
 
-    def _get_id_match(self, argument: str) -> Optional[re.Match]:
-        return self._ID_REGEX.match(argument)
+    @staticmethod
+    def _get_id_match(argument: str) -> Optional[re.Match]:
+        return _ID_REGEX.match(argument)
 
     def _resolve_channel(
         self,
@@ -302,7 +303,7 @@ class GuildChannelConverter(Generic[CT]):
     ) -> Optional[CT]:
         bot: Smiffy = inter.bot
 
-        match: Optional[re.Match] = self._get_id_match(argument) or re.match(r"<#([0-9]{15,20})>$", argument)
+        match: Optional[re.Match] = self._get_id_match(argument) or _CHANNEL_MENTION_REGEX.match(argument)
         result: Optional[CT] = None
 
         guild: Optional[Guild] = inter.guild
@@ -25,3 +25,10 @@ class MissingMusicPermissions(SmiffyException):
 class ApplicationCommandIsGuildOnly(SmiffyException):
     def __init__(self, command: str):
         super().__init__(f"{command} is guild only.")
+
+
+class HostUnavailable(SmiffyException):
+    def __init__(self, host: str):
+        super().__init__(f"{host} is temporarily unavailable.")
+
+        self.host: str = host
@@ -61,3 +61,10 @@ class UserlevelingData(TypedDict):
     next_level_xp: int
     percentage: int
     rank: int
+
+
+class MusicGuildSettings(TypedDict):
+    guild_id: int
+    permission_roles: list[int]
+    notify: bool
+    idle_timeout: int
@@ -3,11 +3,47 @@
 from __future__ import annotations
 
 from ast import literal_eval
-from asyncio import AbstractEventLoop, get_event_loop, new_event_loop, set_event_loop
-from logging import DEBUG, INFO, Logger, StreamHandler, basicConfig, getLogger
-from os import listdir
-from traceback import format_exc
-from typing import TYPE_CHECKING, Any, Iterable, Optional, Union
+from asyncio import AbstractEventLoop, Lock, Semaphore, Task
+from asyncio import TimeoutError as AsyncioTimeoutError
+from asyncio import (
+    TimerHandle,
+    current_task,
+    gather,
+    get_event_loop,
+    new_event_loop,
+    set_event_loop,
+    shield,
+    sleep,
+)
+from bisect import bisect_left
+from collections import Counter, OrderedDict, deque
+from cProfile import Profile
+from hashlib import sha256
+from io import StringIO
+from logging import (
+    INFO,
+    WARNING,
+    Filter,
+    Formatter,
+    Handler,
+    Logger,
+    LogRecord,
+    StreamHandler,
+    getLevelName,
+    getLogger,
+)
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+from os import listdir, makedirs, path, remove, stat
+from pstats import SortKey, Stats
+from queue import SimpleQueue
+from random import uniform
+from sys import _current_frames
+from threading import Thread, get_ident
+from time import monotonic, perf_counter, time
+from time import sleep as time_sleep
+from traceback import format_exc, format_stack
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Coroutine, Iterable, Optional, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 from aiofiles import open as aioopen
 from aiohttp import ClientSession, ClientTimeout, client_exceptions
@@ -25,14 +61,17 @@ from nextcord import (
     Color,
     Embed,
     Game,
+    Guild,
     Intents,
     Interaction,
+    InteractionType,
     Member,
     MemberCacheFlags,
     Message,
     Permissions,
     SlashApplicationCommand,
     Status,
+    TextChannel,
     Locale
 )
 from nextcord import errors as nextcord_errors
@@ -42,16 +81,18 @@ from nextcord.ext.application_checks import ApplicationMissingPermissions
 from nextcord.ext.commands import AutoShardedBot, Cog
 from nextcord.ext.commands import RoleConverter as ncRoleConverter
 from nextcord.ext.commands import errors
-from orjson import loads
+from orjson import dumps, loads
 
 from converters import RoleConverter
+from enums import Emojis
 from errors import (
     ApplicationCommandIsGuildOnly,
+    HostUnavailable,
     InvalidServerData,
     MissingBotToken,
     MissingMusicPermissions,
 )
-from typings import DB_RESPONSE, RED_COLOR, Bot_Settings
+from typings import DB_RESPONSE, RED_COLOR, Bot_Settings, MusicGuildSettings
 
 if TYPE_CHECKING:
     from aiohttp import ClientResponse
@@ -59,11 +100,13 @@ if TYPE_CHECKING:
     from mafic import NodePool
     from nextcord import (
         BaseApplicationCommand,
-        Guild,
+        Invite,
         PartialInteractionMessage,
         Role,
         ShardInfo,
         SlashApplicationSubcommand,
+        User,
+        Webhook,
         WebhookMessage,
     )
     from nextcord.ext.commands import Context
@@ -180,6 +223,32 @@ class BotUtils:
         if self.get_value_from_config("SHARDS_CHECK") is True:
             self.shards_check(bot)
 
+        if self.get_value_from_config("COGS_TIMINGS") is True:
+            self.print_cog_timings(bot)
+
+    @staticmethod
+    def print_cog_timings(bot: Smiffy, limit: int = 15) -> None:
+        """
+        The print_cog_timings function prints the cogs which took the longest to import and set up.
+
+        :param bot: Bot object to get the cog timings
+        :param limit: Amount of cogs to show
+        :return: None
+        """
+
+        timings: list[tuple[str, float]] = sorted(bot.cog_timings.items(), key=lambda item: item[1], reverse=True)
+        total: float = sum(timing for _, timing in timings)
+
+        rows: str = "\n".join(f"│ {name:<50} {timing * 1000:>8.1f} ms" for name, timing in timings[:limit])
+
+        print(
+            Fore.CYAN
+            + f"""------- COGS TIMINGS -------
+{rows}
+┗ Total: {len(timings)} cogs in {total:.2f}s
+"""
+        )
+
     @staticmethod
     def shards_check(bot: Smiffy) -> None:
         """
@@ -299,78 +368,181 @@ class BotUtils:
         return _settings
 
     @staticmethod
-    def load_cogs(bot: Smiffy) -> None:
+    def get_cog_paths(cog_folder: str) -> Iterable[tuple[str, str]]:
+        """
+        The get_cog_paths function yields the extension paths of all cogs in the folder and its subfolders.
+
+        :param cog_folder: Folder with cogs
+        :return: Tuples with the extension path and the file name
+        """
+
+        for file_or_folder in listdir(cog_folder):
+            if file_or_folder.endswith(".py"):
+                yield f"{cog_folder[2::]}.{file_or_folder[:-3]}", file_or_folder
+
+            elif not file_or_folder.startswith("__"):
+                # this is folder with cogs
+                for file in listdir(f"./{cog_folder}/{file_or_folder}"):
+                    if file.endswith(".py") and file != "__main__.py":
+                        yield f"{cog_folder[2::]}.{file_or_folder}.{file[:-3]}", file
+
+    def load_cogs(self, bot: Smiffy, lazy: bool = False) -> None:
         """
         The load_cogs function is used to load all the cogs in the bot.
-            It takes a single argument, which is an instance of Smiffy.
-            The function then loads all cogs from two folders: Commands and Events.
+            Events are loaded first, because the bot can't miss them, and then the commands.
+            Command folders listed in LAZY_COG_FOLDERS are skipped and loaded with lazy=True once the bot is ready.
 
         :param bot: Pass the bot object to the function
+        :param lazy: Load only the lazy command folders
         :return: None
         """
 
-        bot.load_cog("Commands.music.__main__", "__main__")
-        bot.load_cog(
-            "Commands.economy.__main__",
-            "__main__",
-        )
+        lazy_folders: list[str] = self.get_value_from_config("LAZY_COG_FOLDERS", [])
+
+        if not lazy:
+            bot.load_cog("Commands.music.__main__", "__main__")
+            bot.load_cog(
+                "Commands.economy.__main__",
+                "__main__",
+            )
 
         cog_folders: list[str] = [
-            "./Commands",
             "./Events",
+            "./Commands",
         ]
 
         for cog_folder in cog_folders:
-            for file_or_folder in listdir(cog_folder):
-                if file_or_folder.endswith(".py"):
-                    extenstion_path: str = f"{cog_folder[2::]}.{file_or_folder[:-3]}"
-                    bot.load_cog(
-                        extenstion_path,
-                        file_or_folder,
-                    )
-                else:
-                    # this is folder with cogs
-                    for file in listdir(f"./{cog_folder}/{file_or_folder}"):
-                        if file.endswith(".py") and file != "__main__.py":
-                            extenstion_path: str = f"{cog_folder[2::]}.{file_or_folder}.{file[:-3]}"
-                            bot.load_cog(
-                                extenstion_path,
-                                file,
-                            )
+            for extension_path, file in self.get_cog_paths(cog_folder):
+                path_parts: list[str] = extension_path.split(".")
+                is_lazy: bool = len(path_parts) == 3 and path_parts[1] in lazy_folders
+
+                if is_lazy == lazy:
+                    bot.load_cog(extension_path, file)
+
+
+class JsonLinesFormatter(Formatter):
+    def format(self, record: LogRecord) -> str:
+        """
+        The format function returns the log record as a single json line,
+        so the logs file can be shipped to the logs aggregator.
+
+        :param record: Log record
+        :return: Json line
+        """
+
+        data: dict[str, Any] = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "message": record.getMessage(),
+        }
+
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+
+        return dumps(data).decode()
+
+
+class ConsoleFilter(Filter):
+    def filter(self, record: LogRecord) -> bool:
+        """
+        The filter function passes the bot's own records and warnings or errors from any other logger,
+        so library INFO/DEBUG noise stays out of the console.
+
+        :param record: Log record
+        :return: Whether the record is printed
+        """
+
+        return record.levelno >= WARNING or super().filter(record)
 
 
 class BotLogger:
-    __slots__ = ("log", "__logger")
+    __slots__ = ("log", "__logger", "listener")
 
-    log_level: int = DEBUG
     log_format: str = "%(log_color)s%(levelname)s | %(filename)s | %(asctime)s > %(message)s"
+    file_format: str = "%(levelname)s | %(filename)s | %(asctime)s | %(message)s"
+    file_path: str = "Data/logs.txt"
 
     def __init__(self) -> None:
         """
         Logger sets up the logging module and creates a logger object that can be used to log messages.
-        The logger object has a set level, which determines what kind of messages are logged (debug, info, warning etc.)
-        The formatter defines how the message will look like in the console.
+        Records are put into a queue and written by the QueueListener thread,
+        so disk and console I/O never happens in the event loop.
+        Log levels, rotation and the output format are loaded from the config file.
 
         :return: None
         """
 
+        log_level: int = getLevelName(str(bot_utils.get_value_from_config("LOGS_LEVEL", "DEBUG")).upper())
+
+        handlers: list[Handler] = []
+
         if bot_utils.get_value_from_config("LOGS_FILE"):
-            basicConfig(
-                level=self.log_level,
-                format="%(levelname)s | %(filename)s | %(asctime)s | %(message)s",
-                datefmt="%H:%M:%S",
-                filename="Data/logs.txt",
-                filemode="w",
-            )
+            handlers.append(self.get_file_handler())
 
         formatter = ColoredFormatter(self.log_format, datefmt="%H:%M:%S")
         stream = StreamHandler()
         stream.setLevel(INFO)
         stream.setFormatter(formatter)
+        stream.addFilter(ConsoleFilter("SmiffyCFG"))
+        handlers.append(stream)
+
+        queue: SimpleQueue = SimpleQueue()
+        self.listener: QueueListener = QueueListener(queue, *handlers, respect_handler_level=True)
+        self.listener.start()
+
+        root_logger: Logger = getLogger()
+        root_logger.setLevel(log_level)
+        root_logger.addHandler(QueueHandler(queue))
+
+        modules_levels: dict[str, str] = bot_utils.get_value_from_config("LOGS_MODULES_LEVELS", {})
+        for module, level in modules_levels.items():
+            getLogger(module).setLevel(level.upper())
 
         self.__logger = getLogger("SmiffyCFG")
-        self.__logger.setLevel(self.log_level)
-        self.__logger.addHandler(stream)
+        self.__logger.setLevel(log_level)
+
+    def get_file_handler(self) -> Handler:
+        """
+        The get_file_handler function creates the logs file handler, rotated by size or by time.
+
+        :return: The file handler
+        """
+
+        rotation: str = bot_utils.get_value_from_config("LOGS_ROTATION", "size")
+        backup_count: int = bot_utils.get_value_from_config("LOGS_BACKUP_COUNT", 5)
+
+        if rotation == "time":
+            handler: Handler = TimedRotatingFileHandler(
+                self.file_path,
+                when="midnight",
+                backupCount=backup_count,
+                encoding="utf-8",
+            )
+        else:
+            handler: Handler = RotatingFileHandler(
+                self.file_path,
+                maxBytes=bot_utils.get_value_from_config("LOGS_MAX_BYTES", 5242880),
+                backupCount=backup_count,
+                encoding="utf-8",
+            )
+
+        if bot_utils.get_value_from_config("LOGS_JSON") is True:
+            handler.setFormatter(JsonLinesFormatter(datefmt="%Y-%m-%dT%H:%M:%S"))
+        else:
+            handler.setFormatter(Formatter(self.file_format, datefmt="%H:%M:%S"))
+
+        return handler
+
+    def close(self) -> None:
+        """
+        The close function stops the QueueListener, flushing all the remaining records.
+
+        :return: None
+        """
+
+        self.listener.stop()
 
     @property
     def get_logger(self) -> Logger:
@@ -675,22 +847,7 @@ class CustomCog(Cog):
         :return: logs channel if logs are enabled
         """
 
-        response: Optional[DB_RESPONSE] = await self.bot.db.execute_fetchone(
-            "SELECT * FROM server_logs WHERE guild_id = ?",
-            (guild.id,),
-        )
-        if not response:
-            return None
-
-        channel: Optional[GuildChannel] = await self.bot.getch_channel(response[1])
-
-        if not channel:
-            await self.bot.db.execute_fetchone(
-                "DELETE FROM servers_logs WHERE guild_id = ?",
-                (guild.id,),
-            )
-
-        return channel
+        return await self.bot.log_sink.get_channel(guild)
 
     async def get_guild_invites_data(self, guild: Guild) -> Optional[DB_RESPONSE]:
         invites_response: Optional[DB_RESPONSE] = await self.bot.db.execute_fetchone(
@@ -723,7 +880,10 @@ class CustomCog(Cog):
 
 
 class Database:
-    __slots__ = ("connection",)
+    __slots__ = ("connection", "queries")
+
+    default_latency_buckets: tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+    max_statements: int = 500
 
     def __init__(self, connection: Connection) -> None:
         """
@@ -736,6 +896,9 @@ class Database:
 
         self.connection: Connection = connection
 
+        # sql expression -> latency histogram, expressions above max_statements are counted as "other"
+        self.queries: dict[str, LatencyHistogram] = {}
+
     @classmethod
     def setup(
         cls,
@@ -755,6 +918,9 @@ class Database:
 
         async def connect_db() -> Connection:
             db_connection: Connection = await connect(db_path)
+
+            # In WAL mode readers (e.g. the web API connection) don't block the bot commits and vice versa.
+            await db_connection.execute("PRAGMA journal_mode=WAL")
             bot.logger.info("The connection to the database has been established.")
 
             return db_connection
@@ -775,6 +941,7 @@ class Database:
         :return: A list of rows from the database
         """
 
+        started_at: float = perf_counter()
         cursor: Cursor = await self.connection.cursor()
 
         await cursor.execute(sql=expression, parameters=args)
@@ -783,6 +950,7 @@ class Database:
         await self.connection.commit()
         await cursor.close()
 
+        self.record_query(expression, perf_counter() - started_at)
         return response
 
     async def execute_fetchone(
@@ -798,6 +966,7 @@ class Database:
         :return: A single row from the database if exists
         """
 
+        started_at: float = perf_counter()
         cursor: Cursor = await self.connection.cursor()
 
         await cursor.execute(sql=expression, parameters=args)
@@ -806,8 +975,40 @@ class Database:
         await self.connection.commit()
         await cursor.close()
 
+        self.record_query(expression, perf_counter() - started_at)
         return response
 
+    async def execute_many(
+        self,
+        expression: str,
+        args: Iterable[tuple],
+    ) -> None:
+        """
+        The execute_many function executes a SQL expression for every tuple of arguments in a single transaction.
+
+        :param expression: Pass in the sql expression to be executed
+        :param args: Iterable of tuples with expression arguments
+        :return: None
+        """
+
+        started_at: float = perf_counter()
+
+        await self.connection.executemany(expression, args)
+        await self.connection.commit()
+
+        self.record_query(expression, perf_counter() - started_at)
+
+    def record_query(self, expression: str, elapsed: float) -> None:
+        histogram: Optional[LatencyHistogram] = self.queries.get(expression)
+
+        if histogram is None:
+            if len(self.queries) >= self.max_statements:
+                expression = "other"
+
+            histogram = self.queries.setdefault(expression, LatencyHistogram(self.default_latency_buckets))
+
+        histogram.observe(elapsed)
+
     def close(self) -> None:
         """
         The close function is used to close the connection to the database.
@@ -829,200 +1030,2563 @@ class Database:
         loop.run_until_complete(async_runner())
 
 
-class BotSession(ClientSession):
-    def __init__(self, timeout: ClientTimeout, bot: BotBase) -> None:
-        """
-        BotSession inherits the ClientSession class and adds some new features to HTTP requests.
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated_at", "lock")
 
-        :param timeout: Set the timeout for the client
-        :param bot: Store the bot object in the class
-        :return: NOne
+    def __init__(self, rate: float, capacity: int = 1) -> None:
         """
+        TokenBucket is a simple rate limiter. It allows `capacity` calls at once
+        and then refills `rate` tokens per second.
 
-        super().__init__(timeout=timeout)
-
-        self.bot: BotBase = bot
-
-    def __repr__(self) -> str:
-        connector_limit: int = self.connector.limit if self.connector else 0
+        :param rate: Amount of tokens added every second
+        :param capacity: Maximum amount of tokens stored in the bucket
+        :return: None
+        """
 
-        return f"<HTTPClient(alive={not self.closed}, limit={connector_limit})>"
+        self.rate: float = rate
+        self.capacity: int = capacity
+        self.tokens: float = float(capacity)
+        self.updated_at: float = monotonic()
+        self.lock: Lock = Lock()
 
-    @property
-    def get_default_headers(self) -> dict:
+    async def acquire(self) -> None:
         """
-        The get_default_headers function returns a dictionary of headers that are used by the requests library.
+        The acquire function waits until a token is available and takes it.
 
-        :return: A dictionary with headers
+        :return: None
         """
 
-        return {
-            "User-Agent": "Mozilla/5.0 (Windows NT 6.1; Win64; x64; rv:47.0) Gecko/20100101 Firefox/47.0",
-            "Cache-Control": "no-cache",
-        }
+        async with self.lock:
+            while True:
+                now: float = monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
 
-    async def post(self, url: str, **kwargs: Any) -> ClientResponse:
-        return await self.request("POST", url, **kwargs)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
 
-    async def get(self, url: str, **kwargs: Any) -> ClientResponse:
-        return await self.request("GET", url, **kwargs)
+                await sleep((1 - self.tokens) / self.rate)
 
-    async def patch(self, url: str, **kwargs: Any) -> ClientResponse:
-        return await self.request("PATCH", url, **kwargs)
 
-    async def delete(self, url: str, **kwargs: Any) -> ClientResponse:
-        return await self.request("DELETE", url, **kwargs)
+class GlobalBans:
+    __slots__ = ("bot", "user_ids")
 
-    async def request(  # pylint: disable=invalid-overridden-method
-        self,
-        method: str,
-        url: str,
-        default_headers: bool = True,
-        **kwargs: Any,
-    ) -> ClientResponse:
+    def __init__(self, bot: Smiffy, user_ids: set[int]) -> None:
         """
-        Overridden request function allows you to control the status of default header's
-        and additionally adds requests logs
-
+        GlobalBans keeps the IDs of globally banned users in memory.
+        The database is only used to load the bans at startup and to save changes.
 
-        :param method: Specify the http method
-        :param url: Pass the url to be requested
-        :param default_headers: Determine whether the default headers should be used or not
-        :param kwargs: Pass in any number of keyword arguments
-        :return: A clientresponse object
+        :param bot: Bot object used to access the database
+        :param user_ids: IDs of the banned users
+        :return: None
         """
 
-        provided_headers: dict = kwargs.get("headers", {})
-        headers: dict[str, Any] = provided_headers
+        self.bot: Smiffy = bot
+        self.user_ids: set[int] = user_ids
 
-        if default_headers:
-            headers = self.merge_headers(
-                self.get_default_headers,
-                provided_headers,
-            )
+    @classmethod
+    def setup(cls, bot: Smiffy) -> GlobalBans:
+        """
+        The setup classmethod loads the global bans from the database before the bot connects.
 
-        kwargs["headers"] = headers
+        :param bot: Bot object used to access the database
+        :return: A GlobalBans object
+        """
 
-        self.bot.logger.debug(f"Sending Request {method} | {url}")
+        async def load_bans() -> set[int]:
+            response: Iterable[DB_RESPONSE] = await bot.db.execute_fetchall("SELECT user_id FROM global_bans")
+            return {row[0] for row in response}
 
-        response: ClientResponse = await super().request(method, url, **kwargs)
+        user_ids: set[int] = get_event_loop().run_until_complete(load_bans())
+        bot.logger.info("Loaded %s global bans.", len(user_ids))
 
-        self.bot.logger.debug(f"Recived Response: {method} | {response.status}")
+        return cls(bot, user_ids)
 
-        return response
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self.user_ids
 
-    async def send_api_request(
-        self,
-        interaction: CustomInteraction,
-        method: str,
-        url: str,
-        default_headers: bool = True,
-        **kwargs: Any,
-    ) -> Optional[ClientResponse]:
+    async def add(self, user_id: int, reason: str) -> bool:
         """
-        The send_api_request function is a wrapper for the request function.
-        It sends an API request to the specified URL with the given method and kwargs.
-        If the request is not received correctly, the method will automatically send an error_message.
+        The add function bans the user.
 
-
-        :param interaction: Send error messages to the channel
-        :param method: Specify the type of request we want to send
-        :param url: Specify the url of the request
-        :param default_headers: Determine whether the default headers should be used
-        :param kwargs: Pass a dictionary of arguments to the function
-        :return: A clientresponse object (or none if the status is not 200 or 204)
+        :param user_id: ID of the user
+        :param reason: Reason of the ban
+        :return: False if the user was already banned
         """
 
-        try:
-            response: ClientResponse = await self.request(
-                method,
-                url,
-                default_headers,
-                **kwargs,
-            )
-        except (
-            client_exceptions.ClientConnectorError,
-            client_exceptions.ServerTimeoutError,
-            TimeoutError,
-        ) as e:
-            await interaction.send_error_message(description="Wystąpił błąd z API. Spróbuj ponownie później.")
-            interaction.bot.logger.warning(f"API: {url} returned status: {type(e)}")
-            return None
-
-        if response.status not in (200, 204):
-            await interaction.send_error_message(description="Wystąpił błąd z API. Spróbuj ponownie później.")
-            interaction.bot.logger.warning(f"API: {url} returned status: {response.status}")
+        if user_id in self.user_ids:
+            return False
 
-            return None
+        await self.bot.db.execute_fetchone(
+            "INSERT INTO global_bans(user_id, reason) VALUES(?,?)",
+            (user_id, reason),
+        )
+        self.user_ids.add(user_id)
 
-        return response
+        return True
 
-    @staticmethod
-    def merge_headers(default: dict, provided: dict) -> dict:
+    async def remove(self, user_id: int) -> bool:
         """
-        The merge_headers function takes two dictionaries as input, and returns a single dictionary.
-        The first argument is the default headers that are used for most requests to the API. The second
-        argument is any additional headers that may be required by a specific request (e.g., an authorization token).
-        The function merges these two dictionaries into one, and returns it.
+        The remove function unbans the user.
 
-        :param default: The default headers that will be used if no other headers are provided
-        :param provided: Provide a dictionary of headers to the function
-        :return: A merged headers
+        :param user_id: ID of the user
+        :return: False if the user wasn't banned
         """
 
-        res: dict = {**default, **provided}
-        return res
+        if user_id not in self.user_ids:
+            return False
 
+        await self.bot.db.execute_fetchone(
+            "DELETE FROM global_bans WHERE user_id = ?",
+            (user_id,),
+        )
+        self.user_ids.discard(user_id)
 
-class BotBase(AutoShardedBot):
-    session: BotSession
-    pool: NodePool
-    logger: Logger
+        return True
 
-    def __init__(self, **kwargs: Bot_Settings) -> None:
+
+class MusicSettingsCache:
+    __slots__ = ("bot", "settings", "hits", "misses")
+
+    default_idle_timeout: int = 150
+
+    def __init__(self, bot: Smiffy) -> None:
         """
-        BotBase is supposed to have additional features that I don't want to junk the main Smiffy class
+        MusicSettingsCache keeps the music_settings rows in memory,
+        so the player events don't have to query the database on every track or voice update.
 
-        :param kwargs: Bot settings
+        :param bot: Bot object used to access the database
         :return: None
         """
 
-        super().__init__(**kwargs)
+        self.bot: Smiffy = bot
+        self.settings: dict[int, MusicGuildSettings] = {}
 
-        self.ignore_exceptions: tuple[type[Exception], ...] = (
-            ApplicationMissingPermissions,
-            CallableOnCooldown,
-            nextcord_errors.ApplicationCheckFailure,
-            MissingMusicPermissions,
-            ApplicationCommandIsGuildOnly,
-        )
+        self.hits: int = 0
+        self.misses: int = 0
 
-    @property
-    def avatar_url(self) -> str:
+    async def get(self, guild_id: int) -> MusicGuildSettings:
         """
-        The avatar_url function is a property that returns the URL of the bot avatar.
+        The get function returns the music settings of the guild, loading them from the database on a cache miss.
 
-        :return: The avatar url of the bot
+        :param guild_id: Id of the guild
+        :return: Music settings of the guild
         """
-        return Avatars.get_user_avatar(self.user)  # pyright: ignore
 
-    def load_cog(self, path: str, name: str) -> None:
-        """
-        The load_cog function is a wrapper for the load_extension function.
-        It takes in two arguments: path and name. The path argument is the filepath to the cog,
-        and name is used to logger
+        settings: Optional[MusicGuildSettings] = self.settings.get(guild_id)
 
-        :param path: Specify the path to the cog
-        :param name: Specify the name of the file
-        :return: None
-        """
+        if settings:
+            self.hits += 1
+            return settings
 
-        self.load_extension(path)
-        self.logger.debug(f"Extenstion: {name} loaded.")
+        self.misses += 1
+        response: Optional[DB_RESPONSE] = await self.bot.db.execute_fetchone(
+            "SELECT permission_roles, notify, idle_timeout FROM music_settings WHERE guild_id = ?",
+            (guild_id,),
+        )
 
-    async def on_error(
-        self,
-        event_method: str,
+        if not response:
+            settings = MusicGuildSettings(
+                guild_id=guild_id,
+                permission_roles=[],
+                notify=True,
+                idle_timeout=self.default_idle_timeout,
+            )
+        else:
+            settings = MusicGuildSettings(
+                guild_id=guild_id,
+                permission_roles=literal_eval(response[0]) if response[0] else [],
+                notify=not response[1],
+                idle_timeout=response[2] or self.default_idle_timeout,
+            )
+
+        self.settings[guild_id] = settings
+        return settings
+
+    def invalidate(self, guild_id: int) -> None:
+        """
+        The invalidate function removes the guild settings from the cache.
+        It should be called after every change of the music_settings table.
+
+        :param guild_id: Id of the guild
+        :return: None
+        """
+
+        self.settings.pop(guild_id, None)
+
+
+class PermissionsCache:
+    __slots__ = ("bot", "tables", "hits", "misses")
+
+    def __init__(self, bot: Smiffy) -> None:
+        """
+        PermissionsCache keeps a compiled table of the permissions table per guild,
+        so guarded commands don't query the database and parse the permissions of every role on each use.
+
+        :param bot: Bot object used to access the database
+        :return: None
+        """
+
+        self.bot: Smiffy = bot
+
+        # guild_id -> {command name: role IDs allowed to use it}
+        self.tables: dict[int, dict[str, frozenset[int]]] = {}
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+    async def get(self, guild_id: int) -> dict[str, frozenset[int]]:
+        """
+        The get function returns the compiled permissions table of the guild, loading it from the database if needed.
+
+        :param guild_id: Id of the guild
+        :return: Dict with command names and role IDs allowed to use them
+        """
+
+        table: Optional[dict[str, frozenset[int]]] = self.tables.get(guild_id)
+
+        if table is not None:
+            self.hits += 1
+            return table
+
+        self.misses += 1
+        response: Iterable[DB_RESPONSE] = await self.bot.db.execute_fetchall(
+            "SELECT role_id, permissions_data FROM permissions WHERE guild_id = ?",
+            (guild_id,),
+        )
+
+        commands: dict[str, set[int]] = {}
+
+        for role_id, permissions_data in response:
+            for command_name in literal_eval(permissions_data):
+                commands.setdefault(command_name, set()).add(role_id)
+
+        table = {command_name: frozenset(role_ids) for command_name, role_ids in commands.items()}
+
+        self.tables[guild_id] = table
+        return table
+
+    async def role_has_permission(self, guild_id: int, command_name: str, role_ids: Iterable[int]) -> bool:
+        table: dict[str, frozenset[int]] = await self.get(guild_id)
+        allowed_roles: Optional[frozenset[int]] = table.get(command_name)
+
+        return bool(allowed_roles) and not allowed_roles.isdisjoint(role_ids)  # pyright: ignore
+
+    def invalidate(self, guild_id: int) -> None:
+        """
+        The invalidate function removes the guild permissions table from the cache.
+        It should be called after every change of the permissions table.
+
+        :param guild_id: Id of the guild
+        :return: None
+        """
+
+        self.tables.pop(guild_id, None)
+
+
+class InviteTracker:
+    __slots__ = (
+        "bot",
+        "snapshots",
+        "unclaimed",
+        "synced",
+        "refreshing",
+        "persist_handles",
+        "pending_syncs",
+        "sync_task",
+        "sync_limiter",
+    )
+
+    persist_delay: int = 30
+    sync_progress_step: int = 25
+
+    def __init__(self, bot: Smiffy) -> None:
+        """
+        InviteTracker keeps an in-memory snapshot of invite uses for guilds with the invites system enabled.
+        Joins are attributed by diffing the invites by code, concurrent joins share a single REST refresh
+        and the snapshot is saved to the database lazily.
+
+        :param bot: Bot object used to access the database
+        :return: None
+        """
+
+        self.bot: Smiffy = bot
+
+        # guild_id -> {invite code: (uses, inviter_id)}
+        self.snapshots: dict[int, dict[str, tuple[int, int]]] = {}
+
+        # guild_id -> {invite code: (not yet attributed uses, inviter)}
+        self.unclaimed: dict[int, dict[str, tuple[int, User]]] = {}
+
+        # Guilds resynced since the startup, the stored snapshot is missing the uses made while offline
+        self.synced: set[int] = set()
+
+        self.refreshing: dict[int, Task] = {}
+        self.persist_handles: dict[int, TimerHandle] = {}
+
+        # Guilds waiting for the startup sync
+        self.pending_syncs: set[int] = set()
+        self.sync_task: Optional[Task] = None
+        self.sync_limiter: TokenBucket = TokenBucket(
+            rate=bot_utils.get_value_from_config("INVITES_SYNC_RATE", 1.0),
+            capacity=bot_utils.get_value_from_config("INVITES_SYNC_BURST", 5),
+        )
+
+    async def get_snapshot(self, guild: Guild) -> Optional[dict[str, tuple[int, int]]]:
+        """
+        The get_snapshot function returns the invites snapshot of the guild, loading it from the database if needed.
+
+        :param guild: Guild to get the snapshot
+        :return: Invites snapshot or None if the invites system is disabled
+        """
+
+        snapshot: Optional[dict[str, tuple[int, int]]] = self.snapshots.get(guild.id)
+
+        if snapshot is not None:
+            return snapshot
+
+        response: Optional[DB_RESPONSE] = await self.bot.db.execute_fetchone(
+            "SELECT invites_data FROM server_invites WHERE guild_id = ?",
+            (guild.id,),
+        )
+
+        if not response:
+            return None
+
+        snapshot = {
+            invite["invite_id"]: (invite["invite_uses"] or 0, invite["inviter_id"])
+            for invite in literal_eval(response[0] or "[]")
+        }
+
+        self.snapshots[guild.id] = snapshot
+        return snapshot
+
+    async def add_invite(self, invite: Invite) -> None:
+        if not isinstance(invite.guild, Guild) or not invite.inviter:
+            return
+
+        snapshot: Optional[dict[str, tuple[int, int]]] = await self.get_snapshot(invite.guild)
+
+        if snapshot is None:
+            return
+
+        snapshot[invite.code] = (invite.uses or 0, invite.inviter.id)
+        self.schedule_persist(invite.guild.id)
+
+    async def remove_invite(self, invite: Invite) -> None:
+        if not isinstance(invite.guild, Guild):
+            return
+
+        snapshot: Optional[dict[str, tuple[int, int]]] = await self.get_snapshot(invite.guild)
+
+        if snapshot is None or snapshot.pop(invite.code, None) is None:
+            return
+
+        self.schedule_persist(invite.guild.id)
+
+    async def refresh(self, guild: Guild) -> bool:
+        """
+        The refresh function fetches the guild invites and diffs them with the snapshot.
+        Concurrent calls for the same guild wait for the same request.
+
+        :param guild: Guild to refresh
+        :return: Whether the invites were fetched
+        """
+
+        task: Optional[Task] = self.refreshing.get(guild.id)
+
+        if not task:
+            task = self.bot.loop.create_task(self._refresh(guild))
+            task.add_done_callback(lambda _: self.refreshing.pop(guild.id, None))
+
+            self.refreshing[guild.id] = task
+
+        return await task
+
+    async def _refresh(self, guild: Guild) -> bool:
+        snapshot: Optional[dict[str, tuple[int, int]]] = await self.get_snapshot(guild)
+
+        if snapshot is None:
+            return False
+
+        try:
+            invites: list[Invite] = await guild.invites()
+        except (nextcord_errors.Forbidden, nextcord_errors.HTTPException):
+            self.bot.logger.warning("Invites of the guild: %s could not be fetched.", guild.id)
+            return False
+
+        unclaimed: dict[str, tuple[int, User]] = self.unclaimed.setdefault(guild.id, {})
+        new_snapshot: dict[str, tuple[int, int]] = {}
+
+        for invite in invites:
+            if not invite.inviter:
+                continue
+
+            uses: int = invite.uses or 0
+            previous_uses: int = snapshot.get(invite.code, (0, 0))[0]
+
+            if uses > previous_uses:
+                count: int = unclaimed.get(invite.code, (0, invite.inviter))[0]
+                unclaimed[invite.code] = (count + uses - previous_uses, invite.inviter)
+
+            new_snapshot[invite.code] = (uses, invite.inviter.id)
+
+        self.snapshots[guild.id] = new_snapshot
+        self.schedule_persist(guild.id)
+
+        return True
+
+    def claim(self, guild_id: int) -> Optional[User]:
+        unclaimed: Optional[dict[str, tuple[int, User]]] = self.unclaimed.get(guild_id)
+
+        if not unclaimed:
+            return None
+
+        if len(unclaimed) > 1:
+            # More than one invite was used, so it's unknown which one belongs to this member.
+            del self.unclaimed[guild_id]
+            return None
+
+        code, (count, inviter) = next(iter(unclaimed.items()))
+
+        if count <= 1:
+            del unclaimed[code]
+        else:
+            unclaimed[code] = (count - 1, inviter)
+
+        return inviter
+
+    async def find_inviter(self, guild: Guild) -> Optional[User]:
+        """
+        The find_inviter function returns the inviter of the member who just joined the guild.
+        Uses found by a previous refresh are claimed first, so a join raid doesn't fetch invites for every join.
+        No inviter is guessed when more than one invite was used.
+
+        :param guild: Guild the member joined
+        :return: The inviter or None if it couldn't be found
+        """
+
+        if guild.id not in self.synced:
+            # The stored snapshot is older than the uses made while the bot was offline,
+            # they can't be told apart from this join.
+            await self.resync(guild)
+            return None
+
+        inviter: Optional[User] = self.claim(guild.id)
+
+        if inviter:
+            return inviter
+
+        await self.refresh(guild)
+
+        return self.claim(guild.id)
+
+    async def resync(self, guild: Guild) -> None:
+        """
+        The resync function refreshes the snapshot, discarding the uses that can't be attributed anymore
+        (e.g. the ones made while the bot was offline).
+
+        :param guild: Guild to resync
+        :return: None
+        """
+
+        if await self.refresh(guild):
+            self.synced.add(guild.id)
+
+        self.unclaimed.pop(guild.id, None)
+
+    def queue_sync(self, guild: Guild) -> None:
+        """
+        The queue_sync function adds the guild to the sync queue. Guilds are synced in the background
+        once the bot is ready, instead of fetching invites of every guild at the same time.
+
+        :param guild: Guild to sync
+        :return: None
+        """
+
+        self.pending_syncs.add(guild.id)
+
+        if not self.sync_task or self.sync_task.done():
+            self.sync_task = self.bot.loop.create_task(self.sync_pending())
+
+    async def get_sync_order(self, guild_ids: set[int]) -> list[int]:
+        """
+        The get_sync_order function returns the guilds with the invites system enabled,
+        the ones with the most recent joins first.
+
+        :param guild_ids: IDs of the guilds to sync
+        :return: Sorted list of guild IDs, without guilds that have the invites system disabled
+        """
+
+        response: Iterable[DB_RESPONSE] = await self.bot.db.execute_fetchall(
+            "SELECT server_invites.guild_id, MAX(invite_edges.joined_at) AS last_join FROM server_invites "
+            "LEFT JOIN invite_edges ON invite_edges.guild_id = server_invites.guild_id "
+            "GROUP BY server_invites.guild_id ORDER BY last_join DESC",
+        )
+
+        return [row[0] for row in response if row[0] in guild_ids]
+
+    async def sync_pending(self) -> None:
+        await self.bot.wait_until_ready()
+
+        while self.pending_syncs:
+            # Guilds queued while the order is loaded land in the new set and are synced by the next pass.
+            pending, self.pending_syncs = self.pending_syncs, set()
+            guild_ids: list[int] = await self.get_sync_order(pending)
+
+            if not guild_ids:
+                continue
+
+            self.bot.logger.info("Syncing invites of %s guilds.", len(guild_ids))
+            started_at: float = monotonic()
+
+            for index, guild_id in enumerate(guild_ids, start=1):
+                guild: Optional[Guild] = self.bot.get_guild(guild_id)
+
+                # Guilds resynced by a join in the meantime aren't synced again, that would drop new uses.
+                if guild and guild.id not in self.synced:
+                    await self.sync_limiter.acquire()
+                    await self.resync(guild)
+
+                if index % self.sync_progress_step == 0 and index != len(guild_ids):
+                    self.bot.logger.info("Synced invites of %s/%s guilds.", index, len(guild_ids))
+
+            self.bot.logger.info(
+                "Synced invites of %s guilds in %.1fs.",
+                len(guild_ids),
+                monotonic() - started_at,
+            )
+
+    def forget(self, guild_id: int) -> None:
+        self.snapshots.pop(guild_id, None)
+        self.unclaimed.pop(guild_id, None)
+
+        handle: Optional[TimerHandle] = self.persist_handles.pop(guild_id, None)
+        if handle:
+            handle.cancel()
+
+    def schedule_persist(self, guild_id: int) -> None:
+        if guild_id in self.persist_handles:
+            return
+
+        def persist_callback() -> None:
+            self.persist_handles.pop(guild_id, None)
+            self.bot.loop.create_task(self.persist(guild_id))
+
+        self.persist_handles[guild_id] = self.bot.loop.call_later(self.persist_delay, persist_callback)
+
+    async def persist(self, guild_id: int) -> None:
+        snapshot: Optional[dict[str, tuple[int, int]]] = self.snapshots.get(guild_id)
+
+        if snapshot is None:
+            return
+
+        invites_data: list[dict[str, str | int]] = [
+            {"invite_id": code, "invite_uses": uses, "inviter_id": inviter_id}
+            for code, (uses, inviter_id) in snapshot.items()
+        ]
+
+        await self.bot.db.execute_fetchone(
+            "UPDATE server_invites SET invites_data = ? WHERE guild_id = ?",
+            (str(invites_data), guild_id),
+        )
+
+    async def add_edge(self, guild_id: int, invitee_id: int, inviter_id: int, kind: str) -> None:
+        """
+        The add_edge function saves who invited the member. A member who rejoins replaces the previous edge.
+
+        :param guild_id: ID of the guild
+        :param invitee_id: ID of the member who joined
+        :param inviter_id: ID of the inviter
+        :param kind: normal or fake
+        :return: None
+        """
+
+        await self.bot.db.execute_fetchone(
+            "INSERT OR REPLACE INTO invite_edges(guild_id, invitee_id, inviter_id, kind, joined_at) VALUES(?,?,?,?,?)",
+            (guild_id, invitee_id, inviter_id, kind, int(time())),
+        )
+
+    async def get_inviter_id(self, guild_id: int, invitee_id: int) -> Optional[int]:
+        response: Optional[DB_RESPONSE] = await self.bot.db.execute_fetchone(
+            "SELECT inviter_id FROM invite_edges WHERE guild_id = ? AND invitee_id = ? AND kind != 'left'",
+            (guild_id, invitee_id),
+        )
+
+        return response[0] if response else None
+
+    async def mark_left(self, guild_id: int, invitee_id: int) -> Optional[int]:
+        """
+        The mark_left function marks the member's edge as left and increments the left invites of the inviter.
+
+        :param guild_id: ID of the guild
+        :param invitee_id: ID of the member who left
+        :return: ID of the inviter or None if it is unknown
+        """
+
+        inviter_id: Optional[int] = await self.get_inviter_id(guild_id, invitee_id)
+
+        if inviter_id is None:
+            return None
+
+        await self.bot.db.execute_fetchone(
+            "UPDATE invite_edges SET kind = 'left' WHERE guild_id = ? AND invitee_id = ?",
+            (guild_id, invitee_id),
+        )
+        await self.bot.db.execute_fetchone(
+            "UPDATE user_invites SET left = left + 1 WHERE guild_id = ? AND user_id = ?",
+            (guild_id, inviter_id),
+        )
+
+        return inviter_id
+
+    async def migrate_edges(self) -> None:
+        """
+        The migrate_edges function moves the invited members saved in the legacy user_invites.invited column
+        to the invite_edges table. Migrated rows are emptied, so it only does work once.
+
+        :return: None
+        """
+
+        users: Iterable[DB_RESPONSE] = await self.bot.db.execute_fetchall(
+            "SELECT guild_id, user_id, invited FROM user_invites WHERE invited IS NOT NULL AND invited != '[]'",
+        )
+
+        edges: list[tuple[int, int, int]] = []
+
+        for guild_id, inviter_id, invited in users:
+            edges.extend((guild_id, invitee_id, inviter_id) for invitee_id in literal_eval(invited))
+
+        if not edges:
+            return
+
+        await self.bot.db.execute_many(
+            "INSERT OR IGNORE INTO invite_edges(guild_id, invitee_id, inviter_id, kind, joined_at) "
+            "VALUES(?,?,?,'normal',NULL)",
+            edges,
+        )
+        await self.bot.db.execute_fetchone("UPDATE user_invites SET invited = '[]'")
+
+        self.bot.logger.info("Migrated %s invite edges from user_invites.", len(edges))
+
+
+class LogSink:
+    __slots__ = ("bot", "channels", "webhooks", "webhook_failures", "buffers", "flush_handles")
+
+    flush_delay: float = 2.0
+    webhook_retry_delay: float = 600.0
+    max_embeds: int = 10
+    max_characters: int = 6000
+    webhook_name: str = "Smiffy Logs"
+
+    def __init__(self, bot: Smiffy) -> None:
+        """
+        LogSink delivers the server logs. Logs channels are cached per guild, embeds are buffered for a short time
+        and sent in batches through a webhook owned by the bot, so the logs don't use the channel rate limits.
+
+        :param bot: Bot object used to access the database and channels
+        :return: None
+        """
+
+        self.bot: Smiffy = bot
+
+        # guild_id -> logs channel ID or None if logs are disabled
+        self.channels: dict[int, Optional[int]] = {}
+
+        # channel_id -> webhook
+        self.webhooks: dict[int, Webhook] = {}
+
+        # channel_id -> monotonic time after which getting the webhook is tried again
+        self.webhook_failures: dict[int, float] = {}
+
+        self.buffers: dict[int, list[Embed]] = {}
+        self.flush_handles: dict[int, TimerHandle] = {}
+
+    async def get_channel(self, guild: Guild) -> Optional[GuildChannel]:
+        """
+        The get_channel function returns the logs channel of the guild.
+
+        :param guild: Guild to get the logs channel
+        :return: Logs channel if logs are enabled
+        """
+
+        if guild.id not in self.channels:
+            response: Optional[DB_RESPONSE] = await self.bot.db.execute_fetchone(
+                "SELECT channel_id FROM server_logs WHERE guild_id = ?",
+                (guild.id,),
+            )
+
+            self.channels[guild.id] = response[0] if response else None
+
+        channel_id: Optional[int] = self.channels[guild.id]
+
+        if channel_id is None:
+            return None
+
+        channel = self.bot.get_channel(channel_id)
+
+        if isinstance(channel, GuildChannel):
+            return channel
+
+        try:
+            channel = await self.bot.fetch_channel(channel_id)
+        except nextcord_errors.NotFound:
+            # The logs channel was deleted, so the logs are disabled.
+            await self.bot.db.execute_fetchone(
+                "DELETE FROM server_logs WHERE guild_id = ?",
+                (guild.id,),
+            )
+            self.invalidate(guild.id)
+            self.channels[guild.id] = None
+
+            return None
+        except (nextcord_errors.Forbidden, nextcord_errors.HTTPException):
+            # Other errors only skip these logs, the logs channel stays configured.
+            return None
+
+        return channel if isinstance(channel, GuildChannel) else None
+
+    def invalidate(self, guild_id: int) -> None:
+        channel_id: Optional[int] = self.channels.pop(guild_id, None)
+
+        if channel_id:
+            self.webhooks.pop(channel_id, None)
+            self.webhook_failures.pop(channel_id, None)
+
+    async def send(self, channel: TextChannel, embed: Embed) -> None:
+        """
+        The send function adds the embed to the guild buffer. The buffer is flushed after flush_delay
+        or immediately once it has enough embeds to fill a message.
+
+        :param channel: Logs channel of the guild
+        :param embed: Embed to send
+        :return: None
+        """
+
+        buffer: list[Embed] = self.buffers.setdefault(channel.guild.id, [])
+        buffer.append(embed)
+
+        if len(buffer) >= self.max_embeds:
+            handle: Optional[TimerHandle] = self.flush_handles.pop(channel.guild.id, None)
+            if handle:
+                handle.cancel()
+
+            await self.flush(channel)
+            return
+
+        if channel.guild.id in self.flush_handles:
+            return
+
+        def flush_callback() -> None:
+            self.flush_handles.pop(channel.guild.id, None)
+            self.bot.loop.create_task(self.flush(channel))
+
+        self.flush_handles[channel.guild.id] = self.bot.loop.call_later(self.flush_delay, flush_callback)
+
+    def split_embeds(self, embeds: list[Embed]) -> Iterable[list[Embed]]:
+        chunk: list[Embed] = []
+        characters: int = 0
+
+        for embed in embeds:
+            if chunk and (len(chunk) == self.max_embeds or characters + len(embed) > self.max_characters):
+                yield chunk
+                chunk, characters = [], 0
+
+            chunk.append(embed)
+            characters += len(embed)
+
+        if chunk:
+            yield chunk
+
+    async def get_webhook(self, channel: TextChannel) -> Optional[Webhook]:
+        webhook: Optional[Webhook] = self.webhooks.get(channel.id)
+
+        if webhook:
+            return webhook
+
+        if self.webhook_failures.get(channel.id, 0.0) > monotonic():
+            return None
+
+        try:
+            for channel_webhook in await channel.webhooks():
+                if channel_webhook.user and self.bot.user and channel_webhook.user.id == self.bot.user.id:
+                    webhook = channel_webhook
+                    break
+            else:
+                webhook = await channel.create_webhook(name=self.webhook_name)
+        except (nextcord_errors.Forbidden, nextcord_errors.HTTPException):
+            # Without the Manage Webhooks permission the logs go to the channel until the retry time.
+            self.webhook_failures[channel.id] = monotonic() + self.webhook_retry_delay
+            return None
+
+        self.webhook_failures.pop(channel.id, None)
+
+        self.webhooks[channel.id] = webhook
+        return webhook
+
+    async def flush(self, channel: TextChannel) -> None:
+        """
+        The flush function sends the buffered embeds of the guild, falling back to the channel
+        if the bot can't manage webhooks.
+
+        :param channel: Logs channel of the guild
+        :return: None
+        """
+
+        embeds: list[Embed] = self.buffers.pop(channel.guild.id, [])
+
+        for chunk in self.split_embeds(embeds):
+            await self.send_chunk(channel, chunk)
+
+    async def send_chunk(self, channel: TextChannel, chunk: list[Embed]) -> None:
+        # A chunk rejected by a deleted webhook is sent once again through a new webhook.
+        for attempt in range(2):
+            webhook: Optional[Webhook] = await self.get_webhook(channel)
+
+            try:
+                if webhook:
+                    await webhook.send(
+                        embeds=chunk,
+                        username=self.bot.user.name if self.bot.user else self.webhook_name,
+                        avatar_url=self.bot.avatar_url,
+                    )
+                else:
+                    await channel.send(embeds=chunk)
+
+                return
+
+            except nextcord_errors.NotFound:
+                if not webhook or attempt:
+                    break
+
+                self.webhooks.pop(channel.id, None)
+
+            except (nextcord_errors.Forbidden, nextcord_errors.HTTPException):
+                break
+
+        self.bot.logger.debug("Logs of the guild: %s could not be sent.", channel.guild.id)
+
+
+class BulkActions:
+    __slots__ = ("bot", "jobs", "starting")
+
+    progress_step: int = 50
+    concurrency: int = 3
+
+    titles: dict[str, str] = {
+        "add_role": "`👥` Nadawanie roli",
+        "remove_role": "`👥` Zabieranie roli",
+        "reset_nick": "`📝` Resetowanie nicków",
+    }
+
+    def __init__(self, bot: Smiffy) -> None:
+        """
+        BulkActions runs actions on every member of the guild (adding or removing a role, resetting nicknames)
+        as background jobs. Progress is saved to the database after every batch, so jobs resume after a restart.
+
+        :param bot: Bot object used to access the database and guilds
+        :return: None
+        """
+
+        self.bot: Smiffy = bot
+
+        # guild_id -> running job
+        self.jobs: dict[int, Task] = {}
+
+        # Guilds with a job being started
+        self.starting: set[int] = set()
+
+    async def start(
+        self,
+        guild: Guild,
+        action: str,
+        channel: TextChannel,
+        target_id: Optional[int] = None,
+    ) -> bool:
+        """
+        The start function starts a new job in the guild. Only one job can run in a guild at the same time.
+
+        :param guild: Guild to run the job in
+        :param action: add_role, remove_role or reset_nick
+        :param channel: Channel for the progress message
+        :param target_id: ID of the role for the role actions
+        :return: False if another job is already running in the guild
+        """
+
+        if guild.id in self.jobs or guild.id in self.starting:
+            return False
+
+        # The slot is reserved before the first await, so a second call can't start another job meanwhile.
+        self.starting.add(guild.id)
+
+        try:
+            message: Message = await channel.send(embed=self.get_progress_embed(guild, action, 0, 0, None))
+
+            await self.bot.db.execute_fetchone(
+                "INSERT OR REPLACE INTO bulk_actions(guild_id, action, target_id, channel_id, message_id, "
+                "last_member_id, processed, changed) VALUES(?,?,?,?,?,?,?,?)",
+                (guild.id, action, target_id, channel.id, message.id, 0, 0, 0),
+            )
+
+            self.jobs[guild.id] = self.bot.loop.create_task(
+                self.run(guild, action, target_id, channel.id, message.id, 0, 0, 0)
+            )
+        finally:
+            self.starting.discard(guild.id)
+
+        return True
+
+    async def resume(self) -> None:
+        """
+        The resume function restarts the jobs interrupted by a restart from their last checkpoint.
+
+        :return: None
+        """
+
+        response: Iterable[DB_RESPONSE] = await self.bot.db.execute_fetchall("SELECT * FROM bulk_actions")
+
+        for row in response:
+            guild_id, action, target_id, channel_id, message_id, last_member_id, processed, changed = row
+            guild: Optional[Guild] = self.bot.get_guild(guild_id)
+
+            if not guild:
+                await self.bot.db.execute_fetchone("DELETE FROM bulk_actions WHERE guild_id = ?", (guild_id,))
+                continue
+
+            if guild.id in self.jobs or guild.id in self.starting:
+                # The checkpoint belongs to the job started in the meantime.
+                continue
+
+            self.bot.logger.info("Resuming %s job of the guild: %s.", action, guild_id)
+
+            self.jobs[guild.id] = self.bot.loop.create_task(
+                self.run(guild, action, target_id, channel_id, message_id, last_member_id, processed, changed)
+            )
+
+    async def apply(self, action: str, member: Member, role: Optional[Role]) -> bool:
+        if action == "add_role":
+            if not role or role in member.roles:
+                return False
+
+            await member.add_roles(role, reason="Smiffy - AddMassRole")
+
+        elif action == "remove_role":
+            if not role or role not in member.roles:
+                return False
+
+            await member.remove_roles(role, reason="Smiffy - RemoveMassRole")
+
+        else:
+            if not member.nick or member.id == member.guild.owner_id:
+                return False
+
+            if member.top_role >= member.guild.me.top_role:
+                return False
+
+            await member.edit(nick=None, reason="Smiffy - ResetNicknames")
+
+        return True
+
+    async def run(
+        self,
+        guild: Guild,
+        action: str,
+        target_id: Optional[int],
+        channel_id: int,
+        message_id: int,
+        last_member_id: int,
+        processed: int,
+        changed: int,
+    ) -> None:
+        """
+        The run function applies the action to the members sorted by ID, starting after the checkpoint.
+        Members are processed in batches with bounded concurrency, Discord rate limits are handled by nextcord.
+
+        :return: None
+        """
+
+        role: Optional[Role] = guild.get_role(target_id) if target_id else None
+
+        try:
+            if action != "reset_nick" and not role:
+                await self.finish(guild)
+                return
+
+            if not guild.chunked:
+                await guild.chunk()
+
+            members: list[Member] = sorted(
+                (member for member in guild.members if member.id > last_member_id and not member.bot),
+                key=lambda member: member.id,
+            )
+            total: int = processed + len(members)
+            semaphore: Semaphore = Semaphore(self.concurrency)
+
+            async def apply_action(member: Member) -> bool:
+                async with semaphore:
+                    try:
+                        return await self.apply(action, member, role)
+                    except (nextcord_errors.Forbidden, nextcord_errors.HTTPException):
+                        return False
+
+            for index in range(0, len(members), self.progress_step):
+                batch: list[Member] = members[index : index + self.progress_step]
+                results: list[bool] = await gather(*(apply_action(member) for member in batch))
+
+                processed += len(batch)
+                changed += sum(results)
+
+                await self.bot.db.execute_fetchone(
+                    "UPDATE bulk_actions SET last_member_id = ?, processed = ?, changed = ? WHERE guild_id = ?",
+                    (batch[-1].id, processed, changed, guild.id),
+                )
+                await self.update_progress(guild, action, channel_id, message_id, (processed, total), changed)
+
+            await self.update_progress(guild, action, channel_id, message_id, None, changed)
+            await self.finish(guild)
+        finally:
+            # A cancelled job (e.g. the bot is closing) keeps its checkpoint, so it can be resumed.
+            self.jobs.pop(guild.id, None)
+
+    async def finish(self, guild: Guild) -> None:
+        await self.bot.db.execute_fetchone("DELETE FROM bulk_actions WHERE guild_id = ?", (guild.id,))
+
+    def get_progress_embed(
+        self,
+        guild: Guild,
+        action: str,
+        processed: int,
+        total: int,
+        changed: Optional[int],
+    ) -> Embed:
+        if changed is None:
+            description: str = f"{Emojis.REPLY.value} Rozpoczynam pracę..."
+        elif total:
+            description: str = (
+                f"- Postęp: `{processed}/{total}` (`{processed * 100 // total}%`)\n"
+                f"- Zmieniono: `{changed}` osób"
+            )
+        else:
+            description: str = f"{Emojis.REPLY.value} Zakończono. Zmieniono: `{changed}` osób"
+
+        embed = Embed(
+            title=self.titles[action],
+            color=Color.dark_theme() if total or changed is None else Color.green(),
+            timestamp=utils.utcnow(),
+            description=description,
+        )
+        embed.set_thumbnail(url=Avatars.get_guild_icon(guild))
+
+        return embed
+
+    async def update_progress(
+        self,
+        guild: Guild,
+        action: str,
+        channel_id: int,
+        message_id: int,
+        progress: Optional[tuple[int, int]],
+        changed: int,
+    ) -> None:
+        channel: Optional[GuildChannel] = guild.get_channel(channel_id)
+
+        if not isinstance(channel, TextChannel):
+            return
+
+        processed, total = progress or (0, 0)
+        embed: Embed = self.get_progress_embed(guild, action, processed, total, changed)
+
+        try:
+            await channel.get_partial_message(message_id).edit(embed=embed)
+        except (nextcord_errors.Forbidden, nextcord_errors.HTTPException):
+            pass
+
+
+class HelpIndex:
+    __slots__ = ("bot", "index", "commands_count")
+
+    # category -> (commands folder, only these commands (None means all), skipped commands)
+    categories: dict[str, tuple[str, Optional[frozenset[str]], frozenset[str]]] = {
+        "admin": ("administration", None, frozenset()),
+        "settings": ("settings", None, frozenset({"levelowanie"})),
+        "music": ("music", None, frozenset()),
+        "economy": ("economy", None, frozenset()),
+        "additional": ("additional", None, frozenset()),
+        "leveling": ("settings", frozenset({"levelowanie"}), frozenset()),
+        "bot": ("client", None, frozenset({"globalban", "diagnostyka"})),
+        "forfun": ("forfun", None, frozenset()),
+    }
+
+    def __init__(self, bot: BotBase) -> None:
+        """
+        HelpIndex keeps the rendered /pomoc categories (description and amount of commands).
+        It is built once on the first use after the commands are registered
+        and cleared after every application commands sync, because mentions depend on command ids.
+
+        :param bot: Bot instance
+        :return: None
+        """
+
+        self.bot: BotBase = bot
+
+        # category -> (description, amount of commands)
+        self.index: Optional[dict[str, tuple[str, int]]] = None
+        self.commands_count: int = 0
+
+    def invalidate(self) -> None:
+        self.index = None
+
+    @staticmethod
+    def format_commands(commands: Iterable[SlashApplicationCommand]) -> tuple[str, int]:
+        lines: list[str] = []
+
+        def add_command(command: Any) -> None:
+            if command.children:
+                for sub_command in command.children.values():
+                    add_command(sub_command)
+                return
+
+            lines.append(f"- {command.get_mention()} - {command.description}\n")
+
+        for command in commands:
+            add_command(command)
+
+        return "".join(lines), len(lines)
+
+    def build(self) -> dict[str, tuple[str, int]]:
+        """
+        The build function groups global slash commands by their commands folder in one pass
+        and renders every category.
+
+        :return: Category -> description and amount of commands
+        """
+
+        all_commands = self.bot.get_all_application_commands()
+        folders: dict[str, dict[str, SlashApplicationCommand]] = {}
+
+        for command in all_commands:
+            if not command.is_global or not isinstance(command, SlashApplicationCommand) or not command.name:
+                continue
+
+            module: list[str] = type(command.parent_cog).__module__.split(".")
+
+            if len(module) > 2:
+                folders.setdefault(module[1], {})[command.name] = command
+
+        index: dict[str, tuple[str, int]] = {}
+
+        for category, (folder, included, skipped) in self.categories.items():
+            commands: list[SlashApplicationCommand] = [
+                command
+                for name, command in sorted(folders.get(folder, {}).items())
+                if name not in skipped and (included is None or name in included)
+            ]
+            index[category] = self.format_commands(commands)
+
+        self.index = index
+        self.commands_count = len(all_commands)
+
+        return index
+
+    def get(self, category: str) -> tuple[str, int]:
+        """
+        The get function returns the rendered category and builds the index if needed.
+
+        :param category: Name of the category
+        :return: Description and amount of commands
+        """
+
+        index: dict[str, tuple[str, int]] = self.index if self.index is not None else self.build()
+        return index[category]
+
+    def get_commands_count(self) -> int:
+        if self.index is None:
+            self.build()
+
+        return self.commands_count
+
+
+class GuildMemberNames:
+    __slots__ = ("names", "members")
+
+    def __init__(self) -> None:
+        """
+        GuildMemberNames indexes casefolded names, nicks and global names of one guild's members.
+
+        :return: None
+        """
+
+        # casefolded name -> member ids
+        self.names: dict[str, set[int]] = {}
+        # member id -> casefolded names of the member
+        self.members: dict[int, tuple[str, ...]] = {}
+
+    @staticmethod
+    def get_member_keys(member: Member) -> tuple[str, ...]:
+        names: Iterable[Optional[str]] = (member.name, member.nick, member.global_name)
+
+        return tuple({name.casefold() for name in names if name})
+
+    def add(self, member: Member) -> None:
+        member_keys: tuple[str, ...] = self.get_member_keys(member)
+
+        if self.members.get(member.id) == member_keys:
+            return
+
+        self.remove(member.id)
+        self.members[member.id] = member_keys
+
+        for key in member_keys:
+            self.names.setdefault(key, set()).add(member.id)
+
+    def build(self, members: Iterable[Member]) -> None:
+        """
+        The build function indexes all members at once.
+
+        :param members: Members of the guild
+        :return: None
+        """
+
+        for member in members:
+            member_keys: tuple[str, ...] = self.get_member_keys(member)
+            self.members[member.id] = member_keys
+
+            for key in member_keys:
+                self.names.setdefault(key, set()).add(member.id)
+
+    def remove(self, member_id: int) -> None:
+        for key in self.members.pop(member_id, ()):
+            member_ids: set[int] = self.names[key]
+            member_ids.discard(member_id)
+
+            if not member_ids:
+                del self.names[key]
+
+    def get(self, name: str) -> set[int]:
+        return self.names.get(name.casefold(), set())
+
+
+class MemberNameIndex:
+    __slots__ = ("bot", "guilds")
+
+    def __init__(self, bot: BotBase) -> None:
+        """
+        MemberNameIndex replaces linear scans of the member cache when looking up members by name.
+        A guild is indexed on its first lookup and then kept current from member events.
+
+        :param bot: Bot instance, used to register the member listeners
+        :return: None
+        """
+
+        self.bot: BotBase = bot
+
+        # guild id -> index of the guild members
+        self.guilds: dict[int, GuildMemberNames] = {}
+
+        bot.add_listener(self.on_member_join, "on_member_join")
+        bot.add_listener(self.on_member_remove, "on_member_remove")
+        bot.add_listener(self.on_member_update, "on_member_update")
+        bot.add_listener(self.on_user_update, "on_user_update")
+        bot.add_listener(self.on_guild_remove, "on_guild_remove")
+
+    def get_guild(self, guild: Guild) -> GuildMemberNames:
+        """
+        The get_guild function returns the index of the guild and (re)builds it
+        if it doesn't match the member cache, e.g. after chunking which doesn't dispatch events.
+
+        :param guild: Guild to index
+        :return: Index of the guild
+        """
+
+        index: Optional[GuildMemberNames] = self.guilds.get(guild.id)
+
+        if index is None or len(index.members) != len(guild._members):
+            index = self.guilds[guild.id] = GuildMemberNames()
+            index.build(guild._members.values())
+
+        return index
+
+    def get_member_named(self, guild: Guild, name: str) -> Optional[Member]:
+        """
+        The get_member_named function works like Guild.get_member_named (name#discriminator,
+        nick or name), additionally matching the global name, without scanning every member.
+
+        :param guild: Guild to search
+        :param name: Name of the member
+        :return: Found member or None
+        """
+
+        index: GuildMemberNames = self.get_guild(guild)
+
+        if len(name) > 5 and name[-5] == "#":
+            username, discriminator = name[:-5], name[-4:]
+
+            for member_id in index.get(username):
+                member: Optional[Member] = guild.get_member(member_id)
+
+                if member and member.name == username and member.discriminator == discriminator:
+                    return member
+
+        for member_id in sorted(index.get(name)):
+            member = guild.get_member(member_id)
+
+            if member and name in (member.nick, member.name, member.global_name):
+                return member
+
+        return None
+
+    async def on_member_join(self, member: Member) -> None:
+        index: Optional[GuildMemberNames] = self.guilds.get(member.guild.id)
+
+        # with MemberCacheFlags(joined=False) new members aren't always cached
+        if index is not None and member.id in member.guild._members:
+            index.add(member)
+
+    async def on_member_remove(self, member: Member) -> None:
+        index: Optional[GuildMemberNames] = self.guilds.get(member.guild.id)
+
+        if index is not None:
+            index.remove(member.id)
+
+    # pylint: disable-next=unused-argument
+    async def on_member_update(self, before: Member, after: Member) -> None:
+        await self.on_member_join(after)
+
+    async def on_user_update(self, before: User, after: User) -> None:  # pylint: disable=unused-argument
+        for guild in after.mutual_guilds:
+            member: Optional[Member] = guild.get_member(after.id)
+
+            if member:
+                await self.on_member_join(member)
+
+    async def on_guild_remove(self, guild: Guild) -> None:
+        self.guilds.pop(guild.id, None)
+
+
+class AutocompleteIndex:
+    __slots__ = ("loader", "keys", "entries", "loaded_at", "stale", "refresh_task")
+
+    def __init__(self, loader: Callable[[], Awaitable[Iterable[tuple[str, str]]]]) -> None:
+        """
+        AutocompleteIndex keeps (label, value) pairs of one autocomplete sorted by the casefolded label.
+
+        :param loader: Coroutine function returning the (label, value) pairs
+        :return: None
+        """
+
+        self.loader: Callable[[], Awaitable[Iterable[tuple[str, str]]]] = loader
+
+        # sorted casefolded labels and the (label, value) pairs in the same order
+        self.keys: list[str] = []
+        self.entries: list[tuple[str, str]] = []
+
+        self.loaded_at: float = 0.0
+        self.stale: bool = True
+        self.refresh_task: Optional[Task] = None
+
+    async def refresh(self) -> None:
+        # cleared before loading, so an invalidation during the refresh is not lost
+        self.stale = False
+
+        try:
+            pairs: Iterable[tuple[str, str]] = await self.loader()
+        except Exception:
+            self.stale = True
+            raise
+
+        entries: list[tuple[str, tuple[str, str]]] = sorted(
+            (label.casefold(), (label, value)) for label, value in pairs
+        )
+
+        self.keys = [key for key, _ in entries]
+        self.entries = [entry for _, entry in entries]
+        self.loaded_at = monotonic()
+
+    def search(self, query: Optional[str], limit: int) -> list[tuple[str, str]]:
+        """
+        The search function returns entries starting with the query and then entries containing it.
+
+        :param query: Text typed by the user
+        :param limit: Maximum amount of results
+        :return: Found (label, value) pairs
+        """
+
+        if not query:
+            return self.entries[:limit]
+
+        query = query.casefold()
+        indexes: list[int] = []
+
+        for index in range(bisect_left(self.keys, query), len(self.keys)):
+            if len(indexes) >= limit or not self.keys[index].startswith(query):
+                break
+
+            indexes.append(index)
+
+        for index, key in enumerate(self.keys):
+            if len(indexes) >= limit:
+                break
+
+            if query in key and not key.startswith(query):
+                indexes.append(index)
+
+        return [self.entries[index] for index in indexes]
+
+
+class AutocompleteService:
+    __slots__ = ("bot", "indexes", "hits", "misses")
+
+    max_results: int = 25
+    max_age: float = 300.0
+    max_indexes: int = 10000
+
+    def __init__(self, bot: BotBase) -> None:
+        """
+        AutocompleteService keeps in-memory indexes for autocomplete callbacks, one per (kind, owner),
+        where the owner is usually a guild id. The first search loads the index, later searches are
+        served from memory and stale or old indexes are refreshed in the background meanwhile.
+
+        :param bot: Bot instance
+        :return: None
+        """
+
+        self.bot: BotBase = bot
+
+        # (kind, owner) -> index
+        self.indexes: OrderedDict[tuple[str, Any], AutocompleteIndex] = OrderedDict()
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def schedule_refresh(self, index: AutocompleteIndex) -> None:
+        if index.refresh_task and not index.refresh_task.done():
+            return
+
+        index.refresh_task = self.bot.loop.create_task(self.refresh(index))
+
+    async def refresh(self, index: AutocompleteIndex) -> None:
+        try:
+            await index.refresh()
+        except Exception:  # pylint: disable=broad-exception-caught
+            self.bot.logger.exception("Autocomplete index refresh failed.")
+
+    async def search(
+        self,
+        kind: str,
+        owner: Any,
+        query: Optional[str],
+        loader: Callable[[], Awaitable[Iterable[tuple[str, str]]]],
+    ) -> list[tuple[str, str]]:
+        """
+        The search function returns at most 25 (label, value) pairs matching the query.
+
+        :param kind: Kind of the autocomplete, e.g. "forms"
+        :param owner: Owner of the data, e.g. guild id
+        :param query: Text typed by the user
+        :param loader: Used to load the (label, value) pairs when the index is missing or stale
+        :return: Found (label, value) pairs
+        """
+
+        key: tuple[str, Any] = (kind, owner)
+        index: Optional[AutocompleteIndex] = self.indexes.get(key)
+
+        if index is None:
+            self.misses += 1
+            index = self.indexes[key] = AutocompleteIndex(loader)
+
+            if len(self.indexes) > self.max_indexes:
+                self.indexes.popitem(last=False)
+
+            self.schedule_refresh(index)
+        else:
+            self.hits += 1
+            self.indexes.move_to_end(key)
+            index.loader = loader
+
+            if index.stale or monotonic() - index.loaded_at > self.max_age:
+                self.schedule_refresh(index)
+
+        if not index.loaded_at and index.refresh_task:
+            # Every search before the first load waits for the same refresh, a cancelled one doesn't stop it.
+            await shield(index.refresh_task)
+
+        return index.search(query, self.max_results)
+
+    async def search_labels(
+        self,
+        kind: str,
+        owner: Any,
+        query: Optional[str],
+        loader: Callable[[], Awaitable[Iterable[tuple[str, str]]]],
+    ) -> list[str]:
+        return [label for label, _ in await self.search(kind, owner, query, loader)]
+
+    def invalidate(self, kind: str, owner: Any) -> None:
+        """
+        The invalidate function marks the index as stale and refreshes it in the background.
+        Call it after creating or deleting the data shown by the autocomplete.
+
+        :param kind: Kind of the autocomplete
+        :param owner: Owner of the data
+        :return: None
+        """
+
+        index: Optional[AutocompleteIndex] = self.indexes.get((kind, owner))
+
+        if index:
+            index.stale = True
+            self.schedule_refresh(index)
+
+
+class ResponseCache:
+    __slots__ = ("max_bytes", "entries", "size", "directory", "disk_max_bytes", "disk_size", "hits", "misses")
+
+    def __init__(self, max_bytes: int, directory: Optional[str] = None, disk_max_bytes: int = 0) -> None:
+        """
+        ResponseCache stores API response bodies under the hash of their normalized url.
+        The memory tier is a LRU limited by the total size of the bodies, the optional disk tier
+        keeps responses between restarts and is pruned from the oldest files.
+
+        :param max_bytes: Memory budget in bytes
+        :param directory: Directory of the disk tier, None disables it
+        :param disk_max_bytes: Disk budget in bytes
+        :return: None
+        """
+
+        self.max_bytes: int = max_bytes
+        self.entries: OrderedDict[str, bytes] = OrderedDict()
+        self.size: int = 0
+
+        self.directory: Optional[str] = directory
+        self.disk_max_bytes: int = disk_max_bytes
+        self.disk_size: int = 0
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+        if directory:
+            makedirs(directory, exist_ok=True)
+            self.disk_size = sum(stat(path.join(directory, file)).st_size for file in listdir(directory))
+
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """
+        The normalize_url function lowercases the scheme and host, drops the fragment
+        and sorts the query, so the same request always gets the same key.
+
+        :param url: Url of the request
+        :return: Normalized url
+        """
+
+        parts = urlsplit(url.strip())
+        query: str = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+
+    def get_key(self, url: str) -> str:
+        return sha256(self.normalize_url(url).encode()).hexdigest()
+
+    def get_file_path(self, key: str) -> str:
+        assert self.directory
+
+        return path.join(self.directory, key)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """
+        The get function returns the cached body from memory and falls back to the disk tier.
+        Bodies read from the disk are moved back to memory.
+
+        :param key: Key returned by get_key
+        :return: Cached body or None
+        """
+
+        content: Optional[bytes] = self.entries.get(key)
+
+        if content is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return content
+
+        if not self.directory or not path.isfile(self.get_file_path(key)):
+            self.misses += 1
+            return None
+
+        try:
+            async with aioopen(self.get_file_path(key), "rb") as file:
+                content = await file.read()
+        except OSError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.store(key, content)
+        return content
+
+    def store(self, key: str, content: bytes) -> None:
+        if len(content) > self.max_bytes:
+            return
+
+        if key in self.entries:
+            self.size -= len(self.entries.pop(key))
+
+        self.entries[key] = content
+        self.size += len(content)
+
+        while self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    async def put(self, key: str, content: bytes) -> None:
+        """
+        The put function stores the body in memory and, if enabled, on the disk.
+
+        :param key: Key returned by get_key
+        :param content: Body of the response
+        :return: None
+        """
+
+        self.store(key, content)
+
+        if not self.directory or len(content) > self.disk_max_bytes:
+            return
+
+        file_path: str = self.get_file_path(key)
+
+        if path.isfile(file_path):
+            return
+
+        async with aioopen(file_path, "wb") as file:
+            await file.write(content)
+
+        self.disk_size += len(content)
+
+        if self.disk_size > self.disk_max_bytes:
+            self.prune_disk()
+
+    def prune_disk(self) -> None:
+        assert self.directory
+
+        files: list[tuple[float, int, str]] = []
+
+        for file in listdir(self.directory):
+            file_path: str = path.join(self.directory, file)
+            file_stat = stat(file_path)
+            files.append((file_stat.st_mtime, file_stat.st_size, file_path))
+
+        files.sort()
+        self.disk_size = sum(file[1] for file in files)
+
+        for _, size, file_path in files:
+            if self.disk_size <= self.disk_max_bytes:
+                break
+
+            try:
+                remove(file_path)
+            except OSError:
+                continue
+
+            self.disk_size -= size
+
+
+class ImagePool:
+    __slots__ = ("bot", "size", "pools", "refills", "hits", "misses")
+
+    def __init__(self, bot: BotBase) -> None:
+        """
+        ImagePool keeps a few responses of the random image endpoints ready,
+        so commands like /kot don't wait for the api. Every response is used only once
+        and the pool is refilled in the background.
+
+        :param bot: Bot instance
+        :return: None
+        """
+
+        self.bot: BotBase = bot
+        self.size: int = bot_utils.get_value_from_config("API_PREFETCH_POOL_SIZE", 5)
+
+        self.pools: dict[str, deque[dict]] = {}
+        self.refills: dict[str, Task] = {}
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def register(self, url: str) -> None:
+        self.pools.setdefault(url, deque())
+
+    async def fill(self) -> None:
+        await gather(*(self.refill(url) for url in self.pools))
+
+    async def fetch(self, url: str) -> Optional[dict]:
+        try:
+            response: ClientResponse = await self.bot.session.get(url)
+
+            if response.status != 200:
+                response.release()
+                self.bot.logger.debug("Prefetch: %s returned status: %s", url, response.status)
+                return None
+
+            return await response.json()
+        except (client_exceptions.ClientError, AsyncioTimeoutError, ValueError, HostUnavailable) as e:
+            self.bot.logger.debug("Prefetch: %s failed: %s", url, type(e))
+            return None
+
+    async def refill(self, url: str) -> None:
+        pool: deque[dict] = self.pools.setdefault(url, deque())
+
+        while len(pool) < self.size:
+            data: Optional[dict] = await self.fetch(url)
+
+            if data is None:
+                return
+
+            pool.append(data)
+
+    def schedule_refill(self, url: str) -> None:
+        task: Optional[Task] = self.refills.get(url)
+
+        if task and not task.done():
+            return
+
+        self.refills[url] = self.bot.loop.create_task(self.refill(url))
+
+    async def get(self, interaction: CustomInteraction, url: str) -> Optional[dict]:
+        """
+        The get function returns a prefetched response or requests it directly when the pool is empty.
+
+        :param interaction: Used to send an error message if the api is not responding
+        :param url: Url of the random image endpoint
+        :return: Json response of the api or None
+        """
+
+        pool: deque[dict] = self.pools.setdefault(url, deque())
+
+        if pool:
+            self.hits += 1
+            data: dict = pool.popleft()
+        else:
+            self.misses += 1
+            response: Optional[ClientResponse] = await self.bot.session.send_api_request(
+                interaction=interaction,
+                url=url,
+                method="GET",
+            )
+
+            if not response:
+                return None
+
+            data = await response.json()
+
+        self.schedule_refill(url)
+        return data
+
+
+class LatencyHistogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: Iterable[float]) -> None:
+        """
+        LatencyHistogram counts observed latencies in cumulative-friendly buckets (upper bounds in seconds).
+        The last counter holds everything above the largest bucket.
+
+        :param buckets: Upper bounds of the buckets
+        :return: None
+        """
+
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+        self.counts: list[int] = [0] * (len(self.buckets) + 1)
+        self.total: float = 0.0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, quantile: float) -> float:
+        """
+        The quantile function estimates the quantile as the upper bound of the bucket that contains it.
+
+        :param quantile: Quantile between 0 and 1
+        :return: Estimated latency in seconds
+        """
+
+        if not self.count:
+            return 0.0
+
+        rank: float = quantile * self.count
+        seen: int = 0
+
+        for index, count in enumerate(self.counts):
+            seen += count
+
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else float("inf")
+
+        return float("inf")
+
+
+class HostState:
+    __slots__ = (
+        "host",
+        "semaphore",
+        "timeout",
+        "retries",
+        "retry_backoff",
+        "failure_threshold",
+        "recovery_time",
+        "failures",
+        "opened_at",
+        "probing",
+        "latency",
+        "errors",
+    )
+
+    def __init__(self, host: str, settings: dict[str, Any], buckets: Iterable[float]) -> None:
+        """
+        HostState holds the limits, the circuit breaker and the statistics of a single upstream host.
+        After `failure_threshold` failures in a row the breaker opens and requests fail fast,
+        after `recovery_time` one request is let through to check if the host is back.
+
+        :param host: Hostname
+        :param settings: Merged default and host settings from HTTP_HOSTS
+        :param buckets: Latency histogram buckets
+        :return: None
+        """
+
+        self.host: str = host
+        self.semaphore: Semaphore = Semaphore(settings["limit"])
+        self.timeout: ClientTimeout = ClientTimeout(total=float(settings["timeout"]))
+        self.retries: int = settings["retries"]
+        self.retry_backoff: float = settings["retry_backoff"]
+        self.failure_threshold: int = settings["failure_threshold"]
+        self.recovery_time: float = settings["recovery_time"]
+
+        self.failures: int = 0
+        self.opened_at: Optional[float] = None
+        self.probing: bool = False
+
+        self.latency: LatencyHistogram = LatencyHistogram(buckets)
+        # error (exception name or status code) -> count
+        self.errors: dict[str, int] = {}
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def before_request(self) -> None:
+        """
+        The before_request function raises HostUnavailable while the breaker is open.
+
+        :return: None
+        """
+
+        if self.opened_at is None:
+            return
+
+        if self.probing or monotonic() - self.opened_at < self.recovery_time:
+            raise HostUnavailable(self.host)
+
+        self.probing = True
+
+    def record_success(self, elapsed: float) -> None:
+        self.latency.observe(elapsed)
+
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self, elapsed: float, error: str) -> None:
+        self.latency.observe(elapsed)
+        self.errors[error] = self.errors.get(error, 0) + 1
+
+        self.failures += 1
+        self.probing = False
+
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = monotonic()
+
+    def get_retry_delay(self, attempt: int) -> float:
+        # Full jitter, so retries of many commands don't hit the host at once.
+        return uniform(0, self.retry_backoff * 2**attempt)
+
+
+class BotSession(ClientSession):
+    default_host_settings: dict[str, Any] = {
+        "limit": 10,
+        "retries": 2,
+        "retry_backoff": 0.5,
+        "failure_threshold": 5,
+        "recovery_time": 30.0,
+    }
+    default_latency_buckets: tuple[float, ...] = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, timeout: ClientTimeout, bot: BotBase) -> None:
+        """
+        BotSession inherits the ClientSession class and adds some new features to HTTP requests.
+
+        :param timeout: Set the timeout for the client
+        :param bot: Store the bot object in the class
+        :return: NOne
+        """
+
+        super().__init__(timeout=timeout)
+
+        self.bot: BotBase = bot
+        self.cache: ResponseCache = ResponseCache(
+            max_bytes=bot_utils.get_value_from_config("API_CACHE_MEMORY_BYTES", 33554432),
+            directory=bot_utils.get_value_from_config("API_CACHE_DIRECTORY") or None,
+            disk_max_bytes=bot_utils.get_value_from_config("API_CACHE_DISK_BYTES", 268435456),
+        )
+
+        self.hosts_settings: dict[str, dict[str, Any]] = bot_utils.get_value_from_config("HTTP_HOSTS", {})
+        self.latency_buckets: tuple[float, ...] = tuple(
+            bot_utils.get_value_from_config("HTTP_LATENCY_BUCKETS", self.default_latency_buckets)
+        )
+        # hostname -> limits, circuit breaker and statistics of the host
+        self.hosts: dict[str, HostState] = {}
+
+    def __repr__(self) -> str:
+        connector_limit: int = self.connector.limit if self.connector else 0
+
+        return f"<HTTPClient(alive={not self.closed}, limit={connector_limit})>"
+
+    @property
+    def get_default_headers(self) -> dict:
+        """
+        The get_default_headers function returns a dictionary of headers that are used by the requests library.
+
+        :return: A dictionary with headers
+        """
+
+        return {
+            "User-Agent": "Mozilla/5.0 (Windows NT 6.1; Win64; x64; rv:47.0) Gecko/20100101 Firefox/47.0",
+            "Cache-Control": "no-cache",
+        }
+
+    async def post(self, url: str, **kwargs: Any) -> ClientResponse:
+        return await self.request("POST", url, **kwargs)
+
+    async def get(self, url: str, **kwargs: Any) -> ClientResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs: Any) -> ClientResponse:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs: Any) -> ClientResponse:
+        return await self.request("DELETE", url, **kwargs)
+
+    def get_host(self, url: str) -> HostState:
+        """
+        The get_host function returns the state of the url's host and creates it on the first request.
+        Settings of the host are the "default" entry of HTTP_HOSTS overridden by the host's own entry.
+
+        :param url: Url of the request
+        :return: HostState of the host
+        """
+
+        hostname: str = (urlsplit(str(url)).hostname or "").lower()
+        host: Optional[HostState] = self.hosts.get(hostname)
+
+        if host:
+            return host
+
+        settings: dict[str, Any] = {
+            **self.default_host_settings,
+            "timeout": self.timeout.total or 300.0,
+            **self.hosts_settings.get("default", {}),
+            **self.hosts_settings.get(hostname, {}),
+        }
+
+        host = self.hosts[hostname] = HostState(hostname, settings, self.latency_buckets)
+        return host
+
+    async def request(  # pylint: disable=invalid-overridden-method
+        self,
+        method: str,
+        url: str,
+        default_headers: bool = True,
+        **kwargs: Any,
+    ) -> ClientResponse:
+        """
+        Overridden request function allows you to control the status of default header's
+        and additionally adds requests logs. Requests are limited per host, idempotent requests
+        are retried with a jittered backoff and the request fails fast with HostUnavailable
+        while the host's circuit breaker is open.
+
+
+        :param method: Specify the http method
+        :param url: Pass the url to be requested
+        :param default_headers: Determine whether the default headers should be used or not
+        :param kwargs: Pass in any number of keyword arguments
+        :return: A clientresponse object
+        """
+
+        provided_headers: dict = kwargs.get("headers", {})
+        headers: dict[str, Any] = provided_headers
+
+        if default_headers:
+            headers = self.merge_headers(
+                self.get_default_headers,
+                provided_headers,
+            )
+
+        kwargs["headers"] = headers
+
+        host: HostState = self.get_host(url)
+        kwargs.setdefault("timeout", host.timeout)
+
+        attempts: int = host.retries + 1 if method.upper() in ("GET", "HEAD") else 1
+        attempt: int = 0
+
+        while True:
+            host.before_request()
+
+            self.bot.logger.debug("Sending Request %s | %s", method, url)
+            started_at: float = perf_counter()
+
+            try:
+                async with host.semaphore:
+                    response: ClientResponse = await super().request(method, url, **kwargs)
+            except (client_exceptions.ClientError, AsyncioTimeoutError) as e:
+                host.record_failure(perf_counter() - started_at, type(e).__name__)
+
+                attempt += 1
+                if attempt >= attempts:
+                    raise
+            except BaseException:
+                # e.g. cancelled command, don't leave the breaker waiting for the probe
+                host.probing = False
+                raise
+            else:
+                elapsed: float = perf_counter() - started_at
+
+                self.bot.logger.debug("Recived Response: %s | %s", method, response.status)
+
+                if response.status < 500:
+                    host.record_success(elapsed)
+                    return response
+
+                host.record_failure(elapsed, str(response.status))
+
+                attempt += 1
+                if attempt >= attempts:
+                    return response
+
+                response.release()
+
+            await sleep(host.get_retry_delay(attempt))
+
+    def log_host_stats(self) -> None:
+        """
+        The log_host_stats function logs the latency and errors of every host used since the start.
+
+        :return: None
+        """
+
+        for host in self.hosts.values():
+            self.bot.logger.info(
+                "HTTP %s | requests: %s | p50: %.2fs | p99: %.2fs | errors: %s | breaker: %s",
+                host.host,
+                host.latency.count,
+                host.latency.quantile(0.5),
+                host.latency.quantile(0.99),
+                host.errors or "-",
+                "open" if host.is_open else "closed",
+            )
+
+    async def send_api_request(
+        self,
+        interaction: CustomInteraction,
+        method: str,
+        url: str,
+        default_headers: bool = True,
+        **kwargs: Any,
+    ) -> Optional[ClientResponse]:
+        """
+        The send_api_request function is a wrapper for the request function.
+        It sends an API request to the specified URL with the given method and kwargs.
+        If the request is not received correctly, the method will automatically send an error_message.
+
+
+        :param interaction: Send error messages to the channel
+        :param method: Specify the type of request we want to send
+        :param url: Specify the url of the request
+        :param default_headers: Determine whether the default headers should be used
+        :param kwargs: Pass a dictionary of arguments to the function
+        :return: A clientresponse object (or none if the status is not 200 or 204)
+        """
+
+        try:
+            response: ClientResponse = await self.request(
+                method,
+                url,
+                default_headers,
+                **kwargs,
+            )
+        except (
+            client_exceptions.ClientConnectorError,
+            client_exceptions.ServerTimeoutError,
+            AsyncioTimeoutError,
+            HostUnavailable,
+        ) as e:
+            await interaction.send_error_message(description="Wystąpił błąd z API. Spróbuj ponownie później.")
+            interaction.bot.logger.warning(f"API: {url} returned status: {type(e)}")
+            return None
+
+        if response.status not in (200, 204):
+            await interaction.send_error_message(description="Wystąpił błąd z API. Spróbuj ponownie później.")
+            interaction.bot.logger.warning(f"API: {url} returned status: {response.status}")
+
+            return None
+
+        return response
+
+    async def send_cached_request(
+        self,
+        interaction: CustomInteraction,
+        url: str,
+        **kwargs: Any,
+    ) -> Optional[bytes]:
+        """
+        The send_cached_request function sends a GET request through send_api_request
+        and caches the body, so the same image (e.g. the same avatar overlay) is downloaded only once.
+
+        :param interaction: Send error messages to the channel
+        :param url: Specify the url of the request
+        :param kwargs: Pass a dictionary of arguments to the function
+        :return: Body of the response (or none if the request failed)
+        """
+
+        key: str = self.cache.get_key(url)
+        content: Optional[bytes] = await self.cache.get(key)
+
+        if content is not None:
+            return content
+
+        response: Optional[ClientResponse] = await self.send_api_request(
+            interaction=interaction,
+            method="GET",
+            url=url,
+            **kwargs,
+        )
+
+        if not response:
+            return None
+
+        content = await response.read()
+
+        if content:
+            await self.cache.put(key, content)
+
+        return content
+
+    @staticmethod
+    def merge_headers(default: dict, provided: dict) -> dict:
+        """
+        The merge_headers function takes two dictionaries as input, and returns a single dictionary.
+        The first argument is the default headers that are used for most requests to the API. The second
+        argument is any additional headers that may be required by a specific request (e.g., an authorization token).
+        The function merges these two dictionaries into one, and returns it.
+
+        :param default: The default headers that will be used if no other headers are provided
+        :param provided: Provide a dictionary of headers to the function
+        :return: A merged headers
+        """
+
+        res: dict = {**default, **provided}
+        return res
+
+
+class LoopMonitor:
+    __slots__ = ("bot", "interval", "threshold", "lag", "blocks", "heartbeat", "thread_id", "watchdog", "busy")
+
+    lag_buckets: tuple[float, ...] = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+    sample_interval: float = 0.01
+    profile_lines: int = 60
+
+    def __init__(self, bot: BotBase) -> None:
+        """
+        LoopMonitor measures the event loop lag and finds the code that blocks the loop.
+        A watchdog thread checks the heartbeat of the loop and, when the loop doesn't respond for
+        LOOP_MONITOR_THRESHOLD seconds, logs the stack of the blocking callback. Unlike the asyncio
+        debug mode, nothing wraps the callbacks, so it is cheap enough to run in production.
+
+        :param bot: Bot instance
+        :return: None
+        """
+
+        self.bot: BotBase = bot
+        self.interval: float = bot_utils.get_value_from_config("LOOP_MONITOR_INTERVAL", 0.1)
+        self.threshold: float = bot_utils.get_value_from_config("LOOP_MONITOR_THRESHOLD", 0.25)
+
+        self.lag: LatencyHistogram = LatencyHistogram(self.lag_buckets)
+        self.blocks: int = 0
+
+        self.heartbeat: float = monotonic()
+        self.thread_id: Optional[int] = None
+        self.watchdog: Optional[Thread] = None
+
+        # only one sample or profile at a time
+        self.busy: bool = False
+
+    @property
+    def running(self) -> bool:
+        return self.watchdog is not None
+
+    async def run(self) -> None:
+        """
+        The run function measures the lag every LOOP_MONITOR_INTERVAL seconds and keeps the watchdog alive.
+        It does nothing unless LOOP_MONITOR is enabled.
+
+        :return: None
+        """
+
+        if not bot_utils.get_value_from_config("LOOP_MONITOR", False):
+            return
+
+        self.thread_id = get_ident()
+        self.heartbeat = monotonic()
+
+        self.watchdog = Thread(target=self.watch, name="loop-monitor", daemon=True)
+        self.watchdog.start()
+
+        try:
+            while not self.bot.is_closed():
+                expected_at: float = monotonic() + self.interval
+                await sleep(self.interval)
+
+                self.heartbeat = monotonic()
+                self.lag.observe(max(0.0, self.heartbeat - expected_at))
+        finally:
+            self.watchdog = None
+
+    @staticmethod
+    def get_task_name(task: Optional[Task]) -> str:
+        if task is None:
+            return "callback"
+
+        coro: Any = task.get_coro()
+        return f"{task.get_name()} ({getattr(coro, '__qualname__', coro)})"
+
+    def watch(self) -> None:
+        # Runs in the watchdog thread, only reads the state of the loop thread.
+        reported: float = 0.0
+
+        while self.watchdog is not None:
+            time_sleep(self.interval)
+
+            heartbeat: float = self.heartbeat
+            blocked_for: float = monotonic() - heartbeat - self.interval
+
+            if blocked_for < self.threshold or heartbeat == reported:
+                continue
+
+            reported = heartbeat
+            self.blocks += 1
+
+            frame: Any = _current_frames().get(self.thread_id)  # pyright: ignore
+            task: Optional[Task] = current_task(self.bot.loop)
+
+            self.bot.logger.warning(
+                "Event loop blocked for over %.2fs in %s:\n%s",
+                blocked_for,
+                self.get_task_name(task),
+                "".join(format_stack(frame)) if frame else "",
+            )
+
+    def sample_stacks(self, thread_id: int, duration: float) -> str:
+        """
+        The sample_stacks function samples the stack of the loop thread for `duration` seconds.
+        It runs in an executor thread, the result is in the collapsed format used by flamegraph tools.
+
+        :param thread_id: Thread running the event loop
+        :param duration: Sampling window in seconds
+        :return: Collapsed stacks sorted by the number of samples
+        """
+
+        samples: Counter[str] = Counter()
+        ends_at: float = monotonic() + duration
+
+        while monotonic() < ends_at:
+            frame: Any = _current_frames().get(thread_id)
+            stack: list[str] = []
+
+            while frame is not None:
+                code: Any = frame.f_code
+                stack.append(f"{code.co_name} ({path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+
+            samples[";".join(reversed(stack))] += 1
+            time_sleep(self.sample_interval)
+
+        return "\n".join(f"{stack} {count}" for stack, count in samples.most_common())
+
+    async def sample(self, duration: float) -> Optional[str]:
+        """
+        The sample function returns the stack samples of the event loop taken for `duration` seconds.
+
+        :param duration: Sampling window in seconds
+        :return: Collapsed stacks or None if another sample or profile is running
+        """
+
+        if self.busy:
+            return None
+
+        self.busy = True
+
+        try:
+            return await self.bot.loop.run_in_executor(None, self.sample_stacks, get_ident(), duration)
+        finally:
+            self.busy = False
+
+    async def profile(self, duration: float) -> Optional[str]:
+        """
+        The profile function runs cProfile on the loop thread for `duration` seconds,
+        so it covers every handler, task and callback that runs in that window.
+
+        :param duration: Profiling window in seconds
+        :return: Stats sorted by the cumulative time or None if another sample or profile is running
+        """
+
+        if self.busy:
+            return None
+
+        self.busy = True
+        profiler: Profile = Profile()
+
+        try:
+            profiler.enable()
+            await sleep(duration)
+        finally:
+            profiler.disable()
+            self.busy = False
+
+        stream: StringIO = StringIO()
+        Stats(profiler, stream=stream).sort_stats(SortKey.CUMULATIVE).print_stats(self.profile_lines)
+
+        return stream.getvalue()
+
+
+class BotBase(AutoShardedBot):
+    session: BotSession
+    pool: NodePool
+    logger: Logger
+    global_bans: GlobalBans
+    help_index: HelpIndex
+
+    event_latency_buckets: tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+    def __init__(self, **kwargs: Bot_Settings) -> None:
+        """
+        BotBase is supposed to have additional features that I don't want to junk the main Smiffy class
+
+        :param kwargs: Bot settings
+        :return: None
+        """
+
+        super().__init__(**kwargs)
+
+        self.ignore_exceptions: tuple[type[Exception], ...] = (
+            ApplicationMissingPermissions,
+            CallableOnCooldown,
+            nextcord_errors.ApplicationCheckFailure,
+            MissingMusicPermissions,
+            ApplicationCommandIsGuildOnly,
+        )
+
+        # extension path -> import and setup time in seconds
+        self.cog_timings: dict[str, float] = {}
+
+        self.startup_tasks: list[Callable[[], Awaitable[Any]]] = []
+        self.startup_tasks_started: bool = False
+
+        self.timed_events: frozenset[str] = frozenset(
+            bot_utils.get_value_from_config(
+                "METRICS_EVENTS",
+                ["on_message", "on_raw_reaction_add", "on_member_join"],
+            )
+        )
+        # (event name, handler qualname) -> handler latency histogram
+        self.event_latencies: dict[tuple[str, str], LatencyHistogram] = {}
+
+    @property
+    def avatar_url(self) -> str:
+        """
+        The avatar_url function is a property that returns the URL of the bot avatar.
+
+        :return: The avatar url of the bot
+        """
+        return Avatars.get_user_avatar(self.user)  # pyright: ignore
+
+    def load_cog(self, path: str, name: str) -> None:
+        """
+        The load_cog function is a wrapper for the load_extension function.
+        It takes in two arguments: path and name. The path argument is the filepath to the cog,
+        and name is used to logger
+
+        :param path: Specify the path to the cog
+        :param name: Specify the name of the file
+        :return: None
+        """
+
+        started_at: float = perf_counter()
+
+        self.load_extension(path)
+        self.cog_timings[path] = perf_counter() - started_at
+
+        self.logger.debug("Extenstion: %s loaded.", name)
+
+    async def sync_application_commands(
+        self,
+        data: Optional[list[dict]] = None,
+        *,
+        guild_id: Optional[int] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Overridden sync_application_commands clears the /pomoc index after a global sync,
+        because synced commands can get new ids and the index holds their mentions.
+
+        :param data: Application commands data from Discord
+        :param guild_id: Guild to sync or None for global commands
+        :param kwargs: Rollout flags passed to AutoShardedBot.sync_application_commands
+        :return: None
+        """
+
+        await super().sync_application_commands(data, guild_id=guild_id, **kwargs)  # pyright: ignore
+
+        if guild_id is None:
+            self.help_index.invalidate()
+
+    async def _run_event(
+        self,
+        coro: Callable[..., Coroutine[Any, Any, Any]],
+        event_name: str,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Overridden _run_event measures how long the handlers of METRICS_EVENTS take.
+        Every listener (bot method or cog listener) gets its own histogram.
+
+        :param coro: Event handler
+        :param event_name: Name of the event, e.g. on_message
+        :param args: Event arguments
+        :param kwargs: Event keyword arguments
+        :return: None
+        """
+
+        if event_name not in self.timed_events:
+            return await super()._run_event(coro, event_name, *args, **kwargs)
+
+        started_at: float = perf_counter()
+
+        try:
+            await super()._run_event(coro, event_name, *args, **kwargs)
+        finally:
+            key: tuple[str, str] = (event_name, coro.__qualname__)
+            histogram: Optional[LatencyHistogram] = self.event_latencies.get(key)
+
+            if histogram is None:
+                histogram = self.event_latencies[key] = LatencyHistogram(self.event_latency_buckets)
+
+            histogram.observe(perf_counter() - started_at)
+
+    def add_startup_task(self, task: Callable[[], Awaitable[Any]]) -> None:
+        """
+        The add_startup_task function registers a warmup task of a cog (e.g. loading data from the database).
+        Startup tasks are run once the bot is ready, so they don't compete with the login.
+
+        :param task: Coroutine function to run
+        :return: None
+        """
+
+        if self.startup_tasks_started:
+            self.loop.create_task(task())
+            return
+
+        self.startup_tasks.append(task)
+
+    async def run_startup_tasks(self) -> None:
+        """
+        The run_startup_tasks function loads the lazy cogs and runs the startup tasks,
+        at most STARTUP_TASKS_CONCURRENCY at the same time.
+
+        :return: None
+        """
+
+        if self.startup_tasks_started:
+            return
+
+        self.startup_tasks_started = True
+
+        if bot_utils.get_value_from_config("LAZY_COG_FOLDERS"):
+            await self.load_lazy_cogs()
+
+        semaphore: Semaphore = Semaphore(bot_utils.get_value_from_config("STARTUP_TASKS_CONCURRENCY", 2))
+
+        async def run_task(task: Callable[[], Awaitable[Any]]) -> None:
+            async with semaphore:
+                started_at: float = perf_counter()
+
+                try:
+                    await task()
+                except Exception:  # pylint: disable=broad-exception-caught
+                    self.logger.exception("Startup task: %s failed.", task.__qualname__)
+                    return
+
+                self.logger.debug(
+                    "Startup task: %s finished in %.2fs.",
+                    task.__qualname__,
+                    perf_counter() - started_at,
+                )
+
+        tasks: list[Callable[[], Awaitable[Any]]] = self.startup_tasks.copy()
+        self.startup_tasks.clear()
+
+        await gather(*(run_task(task) for task in tasks))
+        self.logger.info("Finished %s startup tasks.", len(tasks))
+
+    async def log_http_stats(self) -> None:
+        """
+        The log_http_stats function logs the per-host HTTP statistics every HTTP_STATS_INTERVAL seconds.
+
+        :return: None
+        """
+
+        interval: float = bot_utils.get_value_from_config("HTTP_STATS_INTERVAL", 0)
+
+        if not interval:
+            return
+
+        await self.wait_until_ready()
+
+        while not self.is_closed():
+            await sleep(interval)
+            self.session.log_host_stats()
+
+    async def load_lazy_cogs(self) -> None:
+        """
+        The load_lazy_cogs function loads the cogs skipped at startup and registers their commands.
+
+        :return: None
+        """
+
+        bot_utils.load_cogs(bot=self, lazy=True)  # pyright: ignore
+
+        self.add_all_application_commands()
+        await self.sync_application_commands(
+            guild_id=None,
+            associate_known=self._rollout_associate_known,
+            delete_unknown=self._rollout_delete_unknown,
+            update_known=self._rollout_update_known,
+            register_new=self._rollout_register_new,
+        )
+
+    async def on_error(
+        self,
+        event_method: str,
         *args: Any,
         **kwargs: Any,
     ) -> None:
@@ -1041,6 +3605,26 @@ class BotBase(AutoShardedBot):
 
         self.dispatch("client_error", *args, **kwargs)
 
+    def is_globally_banned(self, user_id: int) -> bool:
+        return user_id in self.global_bans
+
+    async def on_interaction(self, interaction: Interaction) -> None:
+        """
+        The on_interaction function drops the commands and autocompletes of globally banned users
+        before any command code runs. Components are dispatched to their views by nextcord before this event.
+
+        :param interaction: Received interaction
+        :return: None
+        """
+
+        if interaction.user and self.is_globally_banned(interaction.user.id):
+            if interaction.type is InteractionType.application_command:
+                await self.check_global_ban(interaction)  # pyright: ignore
+
+            return
+
+        await self.process_application_commands(interaction)
+
     @staticmethod
     async def check_global_ban(
         interaction: CustomInteraction,  # pyright: ignore
@@ -1055,12 +3639,7 @@ class BotBase(AutoShardedBot):
 
         assert isinstance(interaction, CustomInteraction) and interaction.user
 
-        response: Optional[DB_RESPONSE] = await interaction.bot.db.execute_fetchone(
-            "SELECT * FROM global_bans WHERE user_id = ?",
-            (interaction.user.id,),
-        )
-
-        if not response:
+        if not interaction.bot.is_globally_banned(interaction.user.id):
             return True
 
         account_link: str = "https://discord.com/users/965069058292719666"
@@ -1113,7 +3692,7 @@ class BotBase(AutoShardedBot):
         if not fetch:
             return role
 
-        self.logger.warning(f"Role: {role_id} was not found in the cache. Sending HTTP Request.")
+        self.logger.warning("Role: %s was not found in the cache. Sending HTTP Request.", role_id)
 
         roles: list[Role] = await guild.fetch_roles(cache=True)
         result = filter(
@@ -1140,7 +3719,7 @@ class BotBase(AutoShardedBot):
         if guild:
             return guild
 
-        self.logger.warning(f"Guild: {guild_id} was not found in the cache. Sending HTTP Request.")
+        self.logger.warning("Guild: %s was not found in the cache. Sending HTTP Request.", guild_id)
 
         try:
             guild: Optional[Guild] = await self.fetch_guild(guild_id)
@@ -1168,7 +3747,7 @@ class BotBase(AutoShardedBot):
             return channel
 
         try:
-            self.logger.warning(f"Channel: {channel_id} was not found in the cache. Sending HTTP Request.")
+            self.logger.warning("Channel: %s was not found in the cache. Sending HTTP Request.", channel_id)
 
             channel = await self.fetch_channel(channel_id)
 
@@ -1198,7 +3777,7 @@ class BotBase(AutoShardedBot):
             return member
 
         try:
-            self.logger.warning(f"Member: {member_id} was not found in the cache. Sending HTTP Request.")
+            self.logger.warning("Member: %s was not found in the cache. Sending HTTP Request.", member_id)
 
             member: Optional[Member] = await guild.fetch_member(member_id)
             return member
@@ -1236,7 +3815,6 @@ class BotBase(AutoShardedBot):
         """
 
         if not getattr(self, "session", None):
-            self.add_application_command_check(self.check_global_ban)  # pyright: ignore
             self.add_application_command_check(self.check_uk_locale)  # pyright: ignore
 
     def get_interaction(self, data, *, cls=CustomInteraction) -> InterT:  # pyright: ignore
@@ -1273,6 +3851,9 @@ class DiscordSupportButton(ui.View):
         self.add_item(ui.Button(label="Discord Bota", style=ButtonStyle.link, url=guild_invite, row=2))
 
 
+VALID_PERMISSIONS: frozenset[str] = frozenset(Permissions.VALID_FLAGS)
+
+
 def PermissionHandler(**perms):
     """
     The PermissionHandler function is a decorator that can be used to wrap any command function.
@@ -1282,6 +3863,12 @@ def PermissionHandler(**perms):
     :return: A decorator that can be used to check if the user has a specific permission
     """
 
+    database_permissions: set[str] = set(perms) - VALID_PERMISSIONS
+
+    for invalid in database_permissions:
+        if invalid != "user_role_has_permission":
+            raise TypeError(f"Invalid permission: {invalid}")
+
     class Handler(CallbackWrapper):
         original_error_callback: Optional[TCallback] = None  # pyright: ignore
 
@@ -1368,25 +3955,16 @@ def PermissionHandler(**perms):
             """
 
             async def check_database_permissions() -> bool:
-                invalids: set[str] = set(perms) - set(Permissions.VALID_FLAGS)
-
-                if not invalids:
+                if not database_permissions:
                     return False
 
-                for invalid in invalids:
-                    if invalid != "user_role_has_permission":
-                        raise TypeError(f"Invalid permission(s): {', '.join(invalid)}")
+                # database_permissions = {"user_role_has_permission"}
+                command_name: Optional[str] = perms.get("user_role_has_permission")
 
-                    # invalid = user_role_has_permission
-                    command_name: Optional[str] = perms.get(invalid)
-
-                    if not command_name:
-                        return False
-
-                    if await user_role_has_permission(command_name, interaction):
-                        return True
+                if not command_name:
+                    return False
 
-                return False
+                return await user_role_has_permission(command_name, interaction)
 
             def check_basic_permissions() -> bool:
                 ch = interaction.channel
@@ -1433,21 +4011,9 @@ async def user_role_has_permission(
         return False
 
     bot: Smiffy = interaction.bot
-    response: Optional[Iterable[Row]] = await bot.db.execute_fetchall(
-        "SELECT * FROM permissions WHERE guild_id = ?",
-        (interaction.guild.id,),
-    )
-    if not response:
-        return False
-
-    roles_list: list[int] = [role.id for role in interaction.user.roles]  # pyright: ignore
+    role_ids: list[int] = [role.id for role in interaction.user.roles]  # pyright: ignore
 
-    for data in response:
-        if data[1] in roles_list:
-            if command_name in literal_eval(data[2]):
-                return True
-
-    return False
+    return await bot.command_permissions.role_has_permission(interaction.guild.id, command_name, role_ids)
 
 
 async def user_role_has_music_permissions(
@@ -1466,23 +4032,12 @@ async def user_role_has_music_permissions(
         return True
 
     bot: Smiffy = interaction.bot
+    settings: MusicGuildSettings = await bot.music_settings.get(interaction.guild.id)
 
-    response: Optional[DB_RESPONSE] = await bot.db.execute_fetchone(
-        "SELECT permission_roles FROM music_settings WHERE guild_id = ?",
-        (interaction.guild.id,),
-    )
-
-    if not response or not response[0]:
+    if not settings["permission_roles"]:
         return True
 
-    role_ids: list[int] = literal_eval(response[0])
-    user_roles: list[int] = [role.id for role in interaction.user.roles]
-
-    for role_id in role_ids:
-        if role_id in user_roles:
-            return True
-
-    return False
+    return not set(settings["permission_roles"]).isdisjoint(role.id for role in interaction.user.roles)
 
 
 async def check_giveaway_requirement(